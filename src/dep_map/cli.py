@@ -19,11 +19,23 @@ from rich.tree import Tree
 from .analyzer import DependencyAnalyzer
 from .graph import DependencyGraph, DependencyType
 from .scanner import AportsScanner
-from .visualizer import Visualizer
+from .visualizer import Visualizer, output_file_path
 
 console = Console()
 
 
+def print_generated(path: str):
+    """输出生成的文件路径及查看方式（gzip 压缩的页面须由服务器以 Content-Encoding 提供）"""
+    console.print(f"[green]✓[/green] Generated {path}")
+    if path.endswith(".gz"):
+        console.print(
+            "[dim]Serve with Content-Encoding: gzip to view in a browser "
+            "(browsers do not decompress file:// pages)[/dim]"
+        )
+    else:
+        console.print(f"[dim]Open in browser: file://{os.path.abspath(path)}[/dim]")
+
+
 def get_cache_path() -> Path:
     """获取缓存文件路径"""
     cache_dir = Path.home() / ".cache" / "dep-map"
@@ -278,6 +290,7 @@ def rdeps(package: str, aports: str | None, recursive: bool, depth: int):
     help="依赖类型 (默认: runtime)",
 )
 @click.option("--show-all-types", is_flag=True, help="显示所有依赖类型（用不同样式区分）")
+@click.option("--compress", is_flag=True, help="输出 gzip 压缩的 <output>.gz")
 def visualize(
     package: str,
     aports: str | None,
@@ -287,6 +300,7 @@ def visualize(
     include_reverse: bool,
     dep_type: str,
     show_all_types: bool,
+    compress: bool,
 ):
     """生成依赖关系可视化图
 
@@ -323,14 +337,14 @@ def visualize(
                 max_depth=depth,
                 include_reverse=include_reverse,
                 show_all_types=show_all_types,
+                compress=compress,
             )
         elif fmt == "tree":
-            viz.render_tree_html(package, output, max_depth=depth)
+            viz.render_tree_html(package, output, max_depth=depth, compress=compress)
         elif fmt == "d3":
-            viz.render_d3_html(package, output, max_depth=depth)
+            viz.render_d3_html(package, output, max_depth=depth, compress=compress)
 
-    console.print(f"[green]✓[/green] Generated {output}")
-    console.print(f"[dim]Open in browser: file://{os.path.abspath(output)}[/dim]")
+    print_generated(output_file_path(output, compress))
 
 
 @main.command()
@@ -346,8 +360,14 @@ def visualize(
     type=click.Choice(["main", "community", "testing"]),
     help="只包含指定仓库的包（在生成时过滤）",
 )
+@click.option("--compress", is_flag=True, help="输出 gzip 压缩的 <output>.gz")
 def overview(
-    aports: str | None, output: str | None, max_nodes: int, show_all: bool, repo: str | None
+    aports: str | None,
+    output: str | None,
+    max_nodes: int,
+    show_all: bool,
+    repo: str | None,
+    compress: bool,
 ):
     """生成完整依赖图概览
 
@@ -372,6 +392,7 @@ def overview(
     dep-map overview --all -o full-graph.html       # 生成完整图
     dep-map overview --all --repo main -o main.html # 只生成 main 仓库
     dep-map overview -n 500 -o top500.html          # 只取前 500 个节点
+    dep-map overview --all --compress -o full.html  # 写出 full.html.gz
     """
     graph = load_or_scan(aports)
 
@@ -400,16 +421,23 @@ def overview(
 
         with console.status("Generating graph..."):
             viz.render_full_graph_html(
-                output_path, max_nodes=total, dep_type=DependencyType.ALL, show_all_types=True
+                output_path,
+                max_nodes=total,
+                dep_type=DependencyType.ALL,
+                show_all_types=True,
+                compress=compress,
             )
     else:
         with console.status("Generating overview..."):
             viz.render_full_graph_html(
-                output_path, max_nodes=max_nodes, dep_type=DependencyType.ALL, show_all_types=True
+                output_path,
+                max_nodes=max_nodes,
+                dep_type=DependencyType.ALL,
+                show_all_types=True,
+                compress=compress,
             )
 
-    console.print(f"[green]✓[/green] Generated {output_path}")
-    console.print(f"[dim]Open in browser: file://{os.path.abspath(output_path)}[/dim]")
+    print_generated(output_file_path(output_path, compress))
 
 
 @main.command()
@@ -509,27 +537,32 @@ def path(source: str, target: str, aports: str | None):
 @click.option("--aports", "-a", type=click.Path(exists=True), help="aports 仓库路径")
 @click.option("--port", "-p", default=8080, help="服务端口")
 @click.option("--host", "-h", "host", default="127.0.0.1", help="绑定地址")
-def serve(aports: str | None, port: int, host: str):
+@click.option("--workers", "-w", default=1, help="工作进程数（大于 1 时使用 gunicorn）")
+def serve(aports: str | None, port: int, host: str, workers: int):
     """启动 Web 界面"""
     graph = load_or_scan(aports)
 
     try:
-        from .web import create_app
+        from .web import create_app, run_server
+    except ImportError:
+        console.print("[red]Error:[/red] Flask is required for web interface")
+        console.print("Install with: pip install flask")
+        sys.exit(1)
 
-        app = create_app(graph)
+    app = create_app(graph)
 
-        console.print(
-            Panel(
-                f"[bold green]Web interface started[/bold green]\n\n"
-                f"Open http://{host}:{port} in your browser",
-                border_style="green",
-            )
+    console.print(
+        Panel(
+            f"[bold green]Web interface started[/bold green]\n\n"
+            f"Open http://{host}:{port} in your browser",
+            border_style="green",
         )
+    )
 
-        app.run(host=host, port=port, debug=False)
-    except ImportError:
-        console.print("[red]Error:[/red] Flask is required for web interface")
-        console.print("Install with: pip install flask")
+    try:
+        run_server(app, host, port, workers=workers)
+    except ImportError as e:
+        console.print(f"[red]Error:[/red] {e}")
         sys.exit(1)
 
 
@@ -4,10 +4,13 @@
 使用 NetworkX 构建和操作软件包依赖关系图。
 """
 
+import heapq
 import json
-from collections import deque
+from collections import Counter, deque
 from dataclasses import dataclass
 from enum import Enum
+from operator import itemgetter
+from typing import Any
 
 try:
     import networkx as nx
@@ -51,9 +54,18 @@ class DependencyGraph:
 
         self.packages = packages or {}
         self._graph: nx.DiGraph = nx.DiGraph()
-        self._reverse_graph: nx.DiGraph = nx.DiGraph()
         self._provides_map: dict[str, str] = {}
         self._subpkg_map: dict[str, str] = {}
+        # 按依赖类型缓存的直接依赖表，首次查询时构建，图变化时清空
+        self._adj_cache: dict[DependencyType, dict[str, list[str]]] = {}
+        # 按依赖类型缓存的直接反向依赖表，与 _adj_cache 一同清空
+        self._radj_cache: dict[DependencyType, dict[str, list[str]]] = {}
+        # 递归查询结果缓存：(是否反向, 包名, 依赖类型, 最大深度) -> 排序后的结果
+        self._recursive_cache: dict[tuple[bool, str, DependencyType, int], tuple[str, ...]] = {}
+        # 以某个包为起点的广度优先遍历父节点表，用于还原最短依赖路径
+        self._parents_cache: dict[str, dict[str, str | None]] = {}
+        # 全图汇总结果缓存（叶子包、根包、统计信息），图变化时清空
+        self._summary_cache: dict[str, Any] = {}
 
         if packages:
             self._build_graph()
@@ -94,9 +106,6 @@ class DependencyGraph:
                 if resolved and resolved in self._graph:
                     self._graph.add_edge(name, resolved, type="check")
 
-        # 构建反向图
-        self._reverse_graph = self._graph.reverse(copy=True)
-
     def _resolve_dep(self, dep: str) -> str | None:
         """解析依赖名称"""
         # 直接匹配
@@ -126,6 +135,12 @@ class DependencyGraph:
         for subpkg in pkg.subpackages:
             self._subpkg_map[subpkg] = pkg.name
 
+        self._adj_cache.clear()
+        self._radj_cache.clear()
+        self._recursive_cache.clear()
+        self._parents_cache.clear()
+        self._summary_cache.clear()
+
         # 添加边
         for dep in pkg.depends:
             resolved = self._resolve_dep(dep)
@@ -166,48 +181,178 @@ class DependencyGraph:
 
     def _get_direct_deps(self, package: str, dep_type: DependencyType) -> list[str]:
         """获取直接依赖"""
-        deps = []
+        return list(self._direct_deps_map(dep_type).get(package, ()))
 
-        for _, target, data in self._graph.out_edges(package, data=True):
-            edge_type = data.get("type", "runtime")
+    def _direct_deps_map(self, dep_type: DependencyType) -> dict[str, list[str]]:
+        """
+        获取指定类型的直接依赖表（包名 -> 排序后的依赖列表）
 
-            if (
-                dep_type == DependencyType.ALL
-                or dep_type == DependencyType.RUNTIME
-                and edge_type == "runtime"
-                or dep_type == DependencyType.BUILD
-                and edge_type == "build"
-                or dep_type == DependencyType.CHECK
-                and edge_type == "check"
-            ):
-                deps.append(target)
+        首次查询某个类型时一次遍历全部边构建并缓存，之后的查询都是字典查找。
+        返回的列表由缓存持有，调用方不应修改。
+        """
+        adj = self._adj_cache.get(dep_type)
+        if adj is None:
+            type_name = None if dep_type == DependencyType.ALL else dep_type.value
+            targets: dict[str, list[str]] = {}
+            for src, dst, edge_type in self._graph.edges(data="type", default="runtime"):
+                if type_name is None or edge_type == type_name:
+                    targets.setdefault(src, []).append(dst)
+            # DiGraph 中同一对节点只有一条边，排序即可，无需去重
+            adj = {src: sorted(dsts) for src, dsts in targets.items()}
+            self._adj_cache[dep_type] = adj
+        return adj
+
+    def _reverse_deps_map(self, dep_type: DependencyType) -> dict[str, list[str]]:
+        """
+        获取指定类型的直接反向依赖表（包名 -> 排序后的反向依赖列表）
 
-        return sorted(set(deps))
+        由直接依赖表反转得到并缓存；返回的列表由缓存持有，调用方不应修改。
+        """
+        radj = self._radj_cache.get(dep_type)
+        if radj is None:
+            sources: dict[str, list[str]] = {}
+            for src, dsts in self._direct_deps_map(dep_type).items():
+                for dst in dsts:
+                    sources.setdefault(dst, []).append(src)
+            radj = {dst: sorted(srcs) for dst, srcs in sources.items()}
+            self._radj_cache[dep_type] = radj
+        return radj
 
     def _get_recursive_deps(
         self, package: str, dep_type: DependencyType, max_depth: int
     ) -> list[str]:
         """递归获取所有依赖"""
-        visited = set()
+        key = (False, package, dep_type, max_depth)
+        result = self._recursive_cache.get(key)
+        if result is None:
+            adj = self._direct_deps_map(dep_type)
+            result = self._recursive_cache[key] = self._bfs_reachable(package, adj, max_depth)
+        return list(result)
+
+    @staticmethod
+    def _bfs_reachable(package: str, adj: dict[str, list[str]], max_depth: int) -> tuple[str, ...]:
+        """
+        广度优先遍历 max_depth 层以内可达的包
+
+        入队时即标记已访问，每个包只入队一次；处于最大深度的包不再扩展。
+
+        Returns:
+            排序后的可达包（不含 package 本身）
+        """
+        visited = {package}
         queue = deque([(package, 0)])
 
         while queue:
             current, depth = queue.popleft()
 
-            if current in visited:
-                continue
-
-            if max_depth >= 0 and depth > max_depth:
+            if depth == max_depth:
                 continue
 
-            visited.add(current)
-
-            for dep in self._get_direct_deps(current, dep_type):
+            for dep in adj.get(current, ()):
                 if dep not in visited:
+                    visited.add(dep)
                     queue.append((dep, depth + 1))
 
         visited.discard(package)
-        return sorted(visited)
+        return tuple(sorted(visited))
+
+    def get_dependency_subgraph(
+        self,
+        package: str,
+        dep_type: DependencyType = DependencyType.ALL,
+        max_depth: int = -1,
+    ) -> tuple[list[str], list[tuple[str, str]]]:
+        """
+        一次广度优先遍历获取依赖子图
+
+        Args:
+            package: 软件包名称
+            dep_type: 依赖类型
+            max_depth: 最大深度，-1 表示无限制
+
+        Returns:
+            (节点列表, 边列表)：节点为 package 及其 max_depth 层以内的全部依赖（按遍历顺序），
+            边为这些节点之间指定类型的全部依赖边
+        """
+        if package not in self._graph:
+            return [], []
+
+        adj = self._direct_deps_map(dep_type)
+        depths = {package: 0}
+        queue = deque([package])
+        edges = []
+
+        while queue:
+            current = queue.popleft()
+            depth = depths[current]
+            # 处于最大深度的节点不再扩展；此时深度不超过 max_depth 的节点均已发现，
+            # 指向已发现节点的边即为子图内的边
+            expand = max_depth < 0 or depth < max_depth
+
+            for dep in adj.get(current, ()):
+                if dep in depths:
+                    edges.append((current, dep))
+                elif expand:
+                    depths[dep] = depth + 1
+                    queue.append(dep)
+                    edges.append((current, dep))
+
+        return list(depths), edges
+
+    def get_dependency_type(self, package: str, dependency: str) -> str | None:
+        """
+        获取两个包之间依赖边的类型
+
+        Returns:
+            "runtime"、"build" 或 "check"；package 不直接依赖 dependency 时返回 None
+        """
+        edge = self._graph.get_edge_data(package, dependency)
+        if edge is None:
+            return None
+        return edge.get("type", "runtime")
+
+    def get_reverse_dependency_subgraph(
+        self,
+        package: str,
+        dep_type: DependencyType = DependencyType.ALL,
+        max_depth: int = -1,
+    ) -> tuple[list[str], list[tuple[str, str]]]:
+        """
+        一次广度优先遍历获取反向依赖子图
+
+        Args:
+            package: 软件包名称
+            dep_type: 依赖类型
+            max_depth: 最大深度，-1 表示无限制
+
+        Returns:
+            (节点列表, 边列表)：节点为 package 及其 max_depth 层以内的全部反向依赖
+            （按遍历顺序），边为这些节点之间指定类型的全部依赖边（依赖方 -> 被依赖方）
+        """
+        if package not in self._graph:
+            return [], []
+
+        radj = self._reverse_deps_map(dep_type)
+        depths = {package: 0}
+        queue = deque([package])
+        edges = []
+
+        while queue:
+            current = queue.popleft()
+            depth = depths[current]
+            # 与 get_dependency_subgraph 相同：处于最大深度的节点不再扩展，
+            # 来自已发现节点的边即为子图内的边
+            expand = max_depth < 0 or depth < max_depth
+
+            for rdep in radj.get(current, ()):
+                if rdep in depths:
+                    edges.append((rdep, current))
+                elif expand:
+                    depths[rdep] = depth + 1
+                    queue.append(rdep)
+                    edges.append((rdep, current))
+
+        return list(depths), edges
 
     def get_reverse_dependencies(
         self,
@@ -228,7 +373,7 @@ class DependencyGraph:
         Returns:
             依赖此包的包列表
         """
-        if package not in self._reverse_graph:
+        if package not in self._graph:
             return []
 
         if recursive:
@@ -238,48 +383,18 @@ class DependencyGraph:
 
     def _get_direct_rdeps(self, package: str, dep_type: DependencyType) -> list[str]:
         """获取直接反向依赖"""
-        rdeps = []
-
-        for _, target, data in self._reverse_graph.out_edges(package, data=True):
-            edge_type = data.get("type", "runtime")
-
-            if (
-                dep_type == DependencyType.ALL
-                or dep_type == DependencyType.RUNTIME
-                and edge_type == "runtime"
-                or dep_type == DependencyType.BUILD
-                and edge_type == "build"
-                or dep_type == DependencyType.CHECK
-                and edge_type == "check"
-            ):
-                rdeps.append(target)
-
-        return sorted(set(rdeps))
+        return list(self._reverse_deps_map(dep_type).get(package, ()))
 
     def _get_recursive_rdeps(
         self, package: str, dep_type: DependencyType, max_depth: int
     ) -> list[str]:
         """递归获取所有反向依赖"""
-        visited = set()
-        queue = deque([(package, 0)])
-
-        while queue:
-            current, depth = queue.popleft()
-
-            if current in visited:
-                continue
-
-            if max_depth >= 0 and depth > max_depth:
-                continue
-
-            visited.add(current)
-
-            for rdep in self._get_direct_rdeps(current, dep_type):
-                if rdep not in visited:
-                    queue.append((rdep, depth + 1))
-
-        visited.discard(package)
-        return sorted(visited)
+        key = (True, package, dep_type, max_depth)
+        result = self._recursive_cache.get(key)
+        if result is None:
+            radj = self._reverse_deps_map(dep_type)
+            result = self._recursive_cache[key] = self._bfs_reachable(package, radj, max_depth)
+        return list(result)
 
     def get_dependency_tree(
         self, package: str, dep_type: DependencyType = DependencyType.ALL, max_depth: int = 3
@@ -295,21 +410,34 @@ class DependencyGraph:
         Returns:
             树形结构字典
         """
-
-        def build_tree(pkg: str, depth: int, visited: set[str]) -> dict:
-            if depth > max_depth or pkg in visited:
-                return {"name": pkg, "children": [], "truncated": True}
-
-            visited.add(pkg)
-            children = []
-
-            for dep in self._get_direct_deps(pkg, dep_type):
-                child_tree = build_tree(dep, depth + 1, visited.copy())
-                children.append(child_tree)
-
-            return {"name": pkg, "children": children, "truncated": False}
-
-        return build_tree(package, 0, set())
+        if max_depth < 0:
+            return {"name": package, "children": [], "truncated": True}
+
+        adj = self._direct_deps_map(dep_type)
+
+        # 用显式栈做深度优先构建，避免递归开销和深依赖链的递归深度限制。
+        # 栈中第 i 层对应深度 i 的包：(子节点列表, 未处理的依赖迭代器, 包名)；
+        # path 为当前路径上的祖先，依赖出现在路径上即为循环，标记为截断
+        root = {"name": package, "children": [], "truncated": False}
+        path = {package}
+        stack = [(root["children"], iter(adj.get(package, ())), package)]
+
+        while stack:
+            children, deps, pkg = stack[-1]
+            for dep in deps:
+                if len(stack) > max_depth or dep in path:
+                    children.append({"name": dep, "children": [], "truncated": True})
+                    continue
+                node = {"name": dep, "children": [], "truncated": False}
+                children.append(node)
+                path.add(dep)
+                stack.append((node["children"], iter(adj.get(dep, ())), dep))
+                break
+            else:
+                stack.pop()
+                path.discard(pkg)
+
+        return root
 
     def get_dependency_path(self, source: str, target: str) -> list[str] | None:
         """
@@ -325,12 +453,39 @@ class DependencyGraph:
         if source not in self._graph or target not in self._graph:
             return None
 
-        try:
-            path: list[str] = nx.shortest_path(self._graph, source, target)
-            return path
-        except nx.NetworkXNoPath:
+        parents = self._bfs_parents(source)
+        if target not in parents:
             return None
 
+        path = [target]
+        while (parent := parents[path[-1]]) is not None:
+            path.append(parent)
+        path.reverse()
+        return path
+
+    def _bfs_parents(self, source: str) -> dict[str, str | None]:
+        """
+        获取从 source 出发的广度优先遍历父节点表（包名 -> 父节点，source 的父节点为 None）
+
+        每个起点只遍历一次并缓存：表中的包即 source 可达的全部包，
+        沿父节点回溯即得到最短依赖路径，不必为每个目标重新搜索。
+        """
+        parents = self._parents_cache.get(source)
+        if parents is None:
+            adj = self._direct_deps_map(DependencyType.ALL)
+            parents = {source: None}
+            queue = deque([source])
+
+            while queue:
+                current = queue.popleft()
+                for dep in adj.get(current, ()):
+                    if dep not in parents:
+                        parents[dep] = current
+                        queue.append(dep)
+
+            self._parents_cache[source] = parents
+        return parents
+
     def find_cycles(self) -> list[list[str]]:
         """查找循环依赖"""
         try:
@@ -339,6 +494,39 @@ class DependencyGraph:
         except Exception:
             return []
 
+    def _topological_sort(self) -> tuple[str, ...]:
+        """
+        Kahn 算法求依赖在前的拓扑序，一次 O(V+E) 遍历，结果缓存
+
+        处于循环中或（间接）依赖循环的包无法排序，不出现在结果中。
+        """
+        order = self._summary_cache.get("topological_order")
+        if order is None:
+            # 每个包尚未排序的直接依赖数，降为 0 时即可排在其所有依赖之后
+            remaining = dict(self._graph.out_degree())
+            queue = deque(node for node, count in remaining.items() if count == 0)
+            sorted_nodes = []
+
+            while queue:
+                node = queue.popleft()
+                sorted_nodes.append(node)
+                for user in self._graph.predecessors(node):
+                    remaining[user] -= 1
+                    if remaining[user] == 0:
+                        queue.append(user)
+
+            order = self._summary_cache["topological_order"] = tuple(sorted_nodes)
+        return order
+
+    def get_topological_order(self) -> list[str]:
+        """
+        获取拓扑序（安装顺序）：每个包排在其所有依赖之后
+
+        Returns:
+            排序后的包列表；图中有循环时，循环上及依赖循环的包不包含在内
+        """
+        return list(self._topological_sort())
+
     def get_dependency_depth(self, package: str) -> int:
         """获取软件包的依赖深度（到根的最长路径）"""
         if package not in self._graph:
@@ -356,15 +544,21 @@ class DependencyGraph:
 
         return max_depth
 
+    def get_degree_counts(self) -> tuple[Counter, Counter]:
+        """
+        一次遍历所有边，统计每个包的直接依赖数和被依赖数（所有依赖类型）
+
+        Returns:
+            (依赖数计数器, 被依赖数计数器)，不在计数器中的包计数为 0
+        """
+        edges = self._graph.edges()
+        return Counter(src for src, _ in edges), Counter(dst for _, dst in edges)
+
     def get_most_depended(self, top_n: int = 20) -> list[tuple[str, int]]:
         """获取被依赖最多的包"""
-        counts = {}
-        for pkg in self.packages:
-            rdeps = self.get_reverse_dependencies(pkg)
-            counts[pkg] = len(rdeps)
-
-        sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-        return sorted_counts[:top_n]
+        # DiGraph 中入度即直接被依赖数；用堆只选出前 top_n 个，不必对全部包排序
+        # （nlargest 与稳定的降序排序结果一致，被依赖数相同时保持包的原有顺序）
+        return heapq.nlargest(top_n, self._graph.in_degree(self.packages), key=itemgetter(1))
 
     def get_most_dependencies(self, top_n: int = 20) -> list[tuple[str, int]]:
         """获取依赖最多的包"""
@@ -378,19 +572,22 @@ class DependencyGraph:
 
     def get_leaf_packages(self) -> list[str]:
         """获取叶子包（没有被其他包依赖的包）"""
-        leaves = []
-        for pkg in self.packages:
-            if not self.get_reverse_dependencies(pkg):
-                leaves.append(pkg)
-        return sorted(leaves)
+        leaves = self._summary_cache.get("leaves")
+        if leaves is None:
+            # 入度为 0 即没有被任何包依赖；一次遍历度数，不必逐个包查询反向依赖
+            leaves = self._summary_cache["leaves"] = tuple(
+                sorted(pkg for pkg, degree in self._graph.in_degree(self.packages) if degree == 0)
+            )
+        return list(leaves)
 
     def get_root_packages(self) -> list[str]:
         """获取根包（没有依赖其他包的包）"""
-        roots = []
-        for pkg in self.packages:
-            if not self.get_dependencies(pkg):
-                roots.append(pkg)
-        return sorted(roots)
+        roots = self._summary_cache.get("roots")
+        if roots is None:
+            roots = self._summary_cache["roots"] = tuple(
+                sorted(pkg for pkg, degree in self._graph.out_degree(self.packages) if degree == 0)
+            )
+        return list(roots)
 
     def get_subgraph(
         self, packages: list[str], include_deps: bool = True, max_depth: int = 2
@@ -439,21 +636,23 @@ class DependencyGraph:
 
     def get_statistics(self) -> dict:
         """获取图统计信息"""
-        return {
-            "nodes": self._graph.number_of_nodes(),
-            "edges": self._graph.number_of_edges(),
-            "density": nx.density(self._graph),
-            "is_dag": nx.is_directed_acyclic_graph(self._graph),
-            "weakly_connected_components": nx.number_weakly_connected_components(self._graph),
-            "avg_in_degree": sum(d for _, d in self._graph.in_degree())
-            / self._graph.number_of_nodes()
-            if self._graph.number_of_nodes() > 0
-            else 0,
-            "avg_out_degree": sum(d for _, d in self._graph.out_degree())
-            / self._graph.number_of_nodes()
-            if self._graph.number_of_nodes() > 0
-            else 0,
-        }
+        stats = self._summary_cache.get("statistics")
+        if stats is None:
+            nodes = self._graph.number_of_nodes()
+            edges = self._graph.number_of_edges()
+            # 入度之和与出度之和都等于边数
+            avg_degree = edges / nodes if nodes > 0 else 0
+            stats = self._summary_cache["statistics"] = {
+                "nodes": nodes,
+                "edges": edges,
+                "density": nx.density(self._graph),
+                # 拓扑序覆盖所有包当且仅当图中没有循环
+                "is_dag": len(self._topological_sort()) == nodes,
+                "weakly_connected_components": nx.number_weakly_connected_components(self._graph),
+                "avg_in_degree": avg_degree,
+                "avg_out_degree": avg_degree,
+            }
+        return dict(stats)
 
 
 def test_graph():
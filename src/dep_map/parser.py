@@ -6,14 +6,21 @@ APKBUILD 文件解析器
 """
 
 import re
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class PackageInfo:
-    """软件包信息"""
+    """
+    软件包信息
+
+    使用 __slots__ 减少每个实例的内存占用。依赖字段是可修改的列表，
+    all_depends 等依赖集合每次访问时由当前列表直接构建，不做缓存。
+    """
 
     # 基本信息
     name: str
@@ -45,29 +52,25 @@ class PackageInfo:
     filepath: str = ""
 
     @property
-    def all_depends(self) -> set[str]:
+    def all_depends(self) -> frozenset[str]:
         """获取所有依赖（包括构建依赖）"""
-        all_deps = set()
-        all_deps.update(self.depends)
-        all_deps.update(self.makedepends)
-        all_deps.update(self.makedepends_build)
-        all_deps.update(self.makedepends_host)
-        all_deps.update(self.checkdepends)
-        return all_deps
+        return frozenset().union(
+            self.depends,
+            self.makedepends,
+            self.makedepends_build,
+            self.makedepends_host,
+            self.checkdepends,
+        )
 
     @property
-    def runtime_depends(self) -> set[str]:
+    def runtime_depends(self) -> frozenset[str]:
         """获取运行时依赖"""
-        return set(self.depends)
+        return frozenset(self.depends)
 
     @property
-    def build_depends(self) -> set[str]:
+    def build_depends(self) -> frozenset[str]:
         """获取构建依赖"""
-        deps = set()
-        deps.update(self.makedepends)
-        deps.update(self.makedepends_build)
-        deps.update(self.makedepends_host)
-        return deps
+        return frozenset().union(self.makedepends, self.makedepends_build, self.makedepends_host)
 
     def to_dict(self) -> dict[str, Any]:
         """转换为字典"""
@@ -105,6 +108,16 @@ class BashVariableContext:
     - 条件赋值: [ test ] && var=val1 || var=val2
     """
 
+    # 参数展开的正则在类定义时编译一次，展开时直接使用
+    _REMOVE_LONGEST_SUFFIX_RE = re.compile(r"\$\{(\w+)%%([^}]*)\}")
+    _REMOVE_SHORTEST_SUFFIX_RE = re.compile(r"\$\{(\w+)%([^}]*)\}")
+    _REMOVE_LONGEST_PREFIX_RE = re.compile(r"\$\{(\w+)##([^}]*)\}")
+    _REMOVE_SHORTEST_PREFIX_RE = re.compile(r"\$\{(\w+)#([^}]*)\}")
+    _DEFAULT_VALUE_RE = re.compile(r"\$\{(\w+):-([^}]*)\}")
+    _ASSIGN_DEFAULT_RE = re.compile(r"\$\{(\w+):=([^}]*)\}")
+    _BRACED_VAR_RE = re.compile(r"\$\{(\w+)\}")
+    _PLAIN_VAR_RE = re.compile(r"\$([a-zA-Z_]\w*)(?![(\w])")
+
     def __init__(self):
         self.variables: dict[str, str] = {}
         # 预设一些常见的环境变量为空（表示本机构建）
@@ -136,50 +149,43 @@ class BashVariableContext:
         result = value
 
         # 展开 ${var%%pattern} - 移除最长后缀
-        result = re.sub(
-            r"\$\{(\w+)%%([^}]*)\}",
+        result = self._REMOVE_LONGEST_SUFFIX_RE.sub(
             lambda m: self._expand_remove_suffix(m.group(1), m.group(2), longest=True),
             result,
         )
 
         # 展开 ${var%pattern} - 移除最短后缀
-        result = re.sub(
-            r"\$\{(\w+)%([^}]*)\}",
+        result = self._REMOVE_SHORTEST_SUFFIX_RE.sub(
             lambda m: self._expand_remove_suffix(m.group(1), m.group(2), longest=False),
             result,
         )
 
         # 展开 ${var##pattern} - 移除最长前缀
-        result = re.sub(
-            r"\$\{(\w+)##([^}]*)\}",
+        result = self._REMOVE_LONGEST_PREFIX_RE.sub(
             lambda m: self._expand_remove_prefix(m.group(1), m.group(2), longest=True),
             result,
         )
 
         # 展开 ${var#pattern} - 移除最短前缀
-        result = re.sub(
-            r"\$\{(\w+)#([^}]*)\}",
+        result = self._REMOVE_SHORTEST_PREFIX_RE.sub(
             lambda m: self._expand_remove_prefix(m.group(1), m.group(2), longest=False),
             result,
         )
 
         # 展开 ${var:-default} - 默认值
-        result = re.sub(
-            r"\$\{(\w+):-([^}]*)\}", lambda m: self.get(m.group(1)) or m.group(2), result
-        )
+        result = self._DEFAULT_VALUE_RE.sub(lambda m: self.get(m.group(1)) or m.group(2), result)
 
         # 展开 ${var:=default} - 赋默认值
-        result = re.sub(
-            r"\$\{(\w+):=([^}]*)\}",
+        result = self._ASSIGN_DEFAULT_RE.sub(
             lambda m: self._expand_assign_default(m.group(1), m.group(2)),
             result,
         )
 
         # 展开 ${var} 格式
-        result = re.sub(r"\$\{(\w+)\}", lambda m: self.get(m.group(1)), result)
+        result = self._BRACED_VAR_RE.sub(lambda m: self.get(m.group(1)), result)
 
         # 展开 $var 格式（注意要避免匹配 $( 等）
-        result = re.sub(r"\$([a-zA-Z_]\w*)(?![(\w])", lambda m: self.get(m.group(1)), result)
+        result = self._PLAIN_VAR_RE.sub(lambda m: self.get(m.group(1)), result)
 
         return result
 
@@ -236,6 +242,18 @@ class BashVariableContext:
         return value
 
 
+@dataclass
+class _ParseState:
+    """单次解析的状态，由 APKBUILDParser.parse_content 在每次调用时创建"""
+
+    ctx: BashVariableContext = field(default_factory=BashVariableContext)
+    first_pkgname: str | None = None  # 第一次定义的 pkgname
+    # 以下由 _parse_variables 在同一遍扫描中收集
+    raw_dep_values: dict[str, str] = field(default_factory=dict)  # 依赖变量第一次定义的原始值
+    maintainer: str = ""
+    contributors: list[str] = field(default_factory=list)
+
+
 class APKBUILDParser:
     """
     APKBUILD 文件解析器
@@ -259,15 +277,35 @@ class APKBUILDParser:
         "subpackages",
     ]
 
-    def __init__(self):
-        self._ctx: BashVariableContext = BashVariableContext()
-        self._first_pkgname: str | None = None  # 保存第一次定义的 pkgname
+    # 解析用的正则在类定义时编译一次，解析每个文件时直接使用
+    _MAINTAINER_RE = re.compile(r"^#\s*Maintainer:\s*(.+)$", re.MULTILINE)
+    _CONTRIBUTOR_RE = re.compile(r"^#\s*Contributor:\s*(.+)$", re.MULTILINE)
+    _ASSIGN_RE = re.compile(r"^([a-zA-Z_]\w*)=(.*)$")
+    _COND_ASSIGN_RE = re.compile(
+        r"^\[.*\]\s*&&\s*([a-zA-Z_]\w*)=([^\s|]+)(?:\s*\|\|\s*([a-zA-Z_]\w*)=(.+))?"
+    )
+    _DEFAULT_ASSIGN_RE = re.compile(r'^:\s*"\$\{([a-zA-Z_]\w*):=([^}]*)\}"')
+    _PKGREL_RE = re.compile(r"^pkgrel=(\S+)", re.MULTILINE)
+    _ARITH_RE = re.compile(r"\$\(\(\s*(.+?)\s*\)\)")
+    _NUMERIC_VAR_RE = re.compile(r"^(_\w+)=(\d+)", re.MULTILINE)
+    _ARITH_VAR_RE = re.compile(r"_\w+")
+    _NON_ARITH_CHAR_RE = re.compile(r"[^\d+\-*/\s]")
+    _ARITH_EXPR_RE = re.compile(r"^[\d\s+\-*/]+$")
+    _DEP_VAR_SET = frozenset(DEP_VARS)
+    _VERSION_CONSTRAINT_RE = re.compile(r"[><=~]")
+    _PARENTHESIZED_RE = re.compile(r"\([^)]*\)")
+    # 不是依赖名的特殊 token
+    _SKIP_TOKENS = frozenset(["", "\\", '"', "'", "(", ")", " "])
 
     def parse_file(self, filepath: str) -> PackageInfo | None:
         """解析 APKBUILD 文件"""
         try:
-            with open(filepath, encoding="utf-8", errors="ignore") as f:
-                content = f.read()
+            # 以二进制一次读入再整体解码，比文本模式的增量解码快；
+            # 换行统一为 \n，与文本模式的通用换行一致
+            with open(filepath, "rb") as f:
+                content = f.read().decode("utf-8", errors="ignore")
+            if "\r" in content:
+                content = content.replace("\r\n", "\n").replace("\r", "\n")
             return self.parse_content(content, filepath)
         except Exception as e:
             print(f"Error parsing {filepath}: {e}")
@@ -276,16 +314,40 @@ class APKBUILDParser:
     # 为了兼容旧代码，添加别名
     parse = parse_file
 
+    def parse_many(
+        self, filepaths: Iterable[str], max_workers: int | None = None
+    ) -> dict[str, PackageInfo]:
+        """
+        用线程池并行解析多个 APKBUILD 文件
+
+        Args:
+            filepaths: APKBUILD 文件路径
+            max_workers: 工作线程数，默认由 ThreadPoolExecutor 决定
+
+        Returns:
+            包名 -> 软件包信息，按输入顺序合并，同名时后者覆盖前者
+        """
+        packages: dict[str, PackageInfo] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for pkg in executor.map(self.parse_file, filepaths):
+                if pkg:
+                    packages[pkg.name] = pkg
+        return packages
+
     def parse_content(self, content: str, filepath: str = "") -> PackageInfo | None:
-        """解析 APKBUILD 内容"""
-        self._ctx = BashVariableContext()
-        self._first_pkgname = None
+        """
+        解析 APKBUILD 内容
+
+        解析过程中的状态保存在本次调用创建的 _ParseState 中，解析器本身不保存状态，
+        同一个解析器可在多个线程间共享。
+        """
+        state = _ParseState()
 
-        # 第一遍：解析所有变量赋值
-        self._parse_variables(content)
+        # 一遍扫描：解析所有变量赋值，同时收集维护者信息和依赖变量的原始值
+        self._parse_variables(state, content)
 
         # 获取包名（优先使用第一次定义的 pkgname）
-        pkgname = self._first_pkgname or self._ctx.get("pkgname")
+        pkgname = state.first_pkgname or state.ctx.get("pkgname")
         if not pkgname:
             return None
 
@@ -311,39 +373,34 @@ class APKBUILDParser:
                     break
 
         # 提取基本信息
-        pkg.version = self._ctx.expand(self._ctx.get("pkgver")) or ""
-        pkg.release = self._parse_pkgrel(content)
-        pkg.description = self._ctx.get("pkgdesc", "").strip('"')
-        pkg.url = self._ctx.get("url", "").strip('"')
-        pkg.license = self._ctx.get("license", "").strip('"')
-        pkg.arch = self._ctx.get("arch", "all").strip('"')
-
-        # 提取维护者信息
-        maintainer_match = re.search(r"^#\s*Maintainer:\s*(.+)$", content, re.MULTILINE)
-        if maintainer_match:
-            pkg.maintainer = maintainer_match.group(1).strip()
-
-        # 提取贡献者
-        for match in re.finditer(r"^#\s*Contributor:\s*(.+)$", content, re.MULTILINE):
-            pkg.contributors.append(match.group(1).strip())
+        pkg.version = state.ctx.expand(state.ctx.get("pkgver")) or ""
+        pkg.release = self._parse_pkgrel(state, content)
+        pkg.description = state.ctx.get("pkgdesc", "").strip('"')
+        pkg.url = state.ctx.get("url", "").strip('"')
+        pkg.license = state.ctx.get("license", "").strip('"')
+        pkg.arch = state.ctx.get("arch", "all").strip('"')
+
+        # 维护者和贡献者信息
+        pkg.maintainer = state.maintainer
+        pkg.contributors = state.contributors
 
         # 提取依赖关系
-        pkg.depends = self._extract_dep_list(content, "depends", pkgname)
-        pkg.makedepends = self._extract_dep_list(content, "makedepends", pkgname)
-        pkg.makedepends_build = self._extract_dep_list(content, "makedepends_build", pkgname)
-        pkg.makedepends_host = self._extract_dep_list(content, "makedepends_host", pkgname)
-        pkg.checkdepends = self._extract_dep_list(content, "checkdepends", pkgname)
+        pkg.depends = self._extract_dep_list(state, "depends", pkgname)
+        pkg.makedepends = self._extract_dep_list(state, "makedepends", pkgname)
+        pkg.makedepends_build = self._extract_dep_list(state, "makedepends_build", pkgname)
+        pkg.makedepends_host = self._extract_dep_list(state, "makedepends_host", pkgname)
+        pkg.checkdepends = self._extract_dep_list(state, "checkdepends", pkgname)
 
         # 提取提供和替换
-        pkg.provides = self._extract_dep_list(content, "provides", pkgname)
-        pkg.replaces = self._extract_dep_list(content, "replaces", pkgname)
+        pkg.provides = self._extract_dep_list(state, "provides", pkgname)
+        pkg.replaces = self._extract_dep_list(state, "replaces", pkgname)
 
         # 提取子包
-        pkg.subpackages = self._extract_subpackages(content, pkgname)
+        pkg.subpackages = self._extract_subpackages(state, pkgname)
 
         return pkg
 
-    def _parse_variables(self, content: str):
+    def _parse_variables(self, state: _ParseState, content: str):
         """
         解析内容中的变量赋值
 
@@ -351,18 +408,25 @@ class APKBUILDParser:
         - 简单赋值: var=value
         - 带引号赋值: var="value"
         - 条件赋值: [ test ] && var=val
+
+        同一遍扫描中还按原始行收集：
+        - 行首注释中的维护者和贡献者
+        - 依赖变量第一次定义的原始值（带引号时可跨多行，直到结束引号）
         """
-        lines = content.split("\n")
+        # 正在跨行收集的依赖变量：变量名 -> (已收集的片段, 引号字符)
+        pending: dict[str, tuple[list[str], str]] = {}
 
-        for line in lines:
-            line = line.strip()
+        for raw_line in content.split("\n"):
+            self._collect_raw_line(state, raw_line, pending)
+
+            line = raw_line.strip()
 
             # 跳过注释和空行
             if not line or line.startswith("#"):
                 continue
 
             # 处理简单变量赋值: var=value 或 var="value"
-            assign_match = re.match(r"^([a-zA-Z_]\w*)=(.*)$", line)
+            assign_match = self._ASSIGN_RE.match(line)
             if assign_match:
                 varname = assign_match.group(1)
                 value = assign_match.group(2).strip()
@@ -377,51 +441,98 @@ class APKBUILDParser:
                     value = value[1:-1]
 
                 # 展开变量引用
-                expanded_value = self._ctx.expand(value)
+                expanded_value = state.ctx.expand(value)
 
                 # 保存第一次定义的 pkgname
-                if varname == "pkgname" and self._first_pkgname is None:
+                if varname == "pkgname" and state.first_pkgname is None:
                     # 如果值不包含变量引用，直接使用
                     if "$" not in value:
-                        self._first_pkgname = expanded_value
+                        state.first_pkgname = expanded_value
                     else:
                         # 包含变量引用，先存储原始值
-                        self._first_pkgname = (
+                        state.first_pkgname = (
                             expanded_value if expanded_value and "$" not in expanded_value else None
                         )
 
-                self._ctx.set(varname, expanded_value)
+                state.ctx.set(varname, expanded_value)
                 continue
 
             # 处理条件赋值: [ test ] && var=val1 || var=val2
             # 简化处理：假设测试条件为 false（本机构建场景）
-            cond_match = re.match(
-                r"^\[.*\]\s*&&\s*([a-zA-Z_]\w*)=([^\s|]+)(?:\s*\|\|\s*([a-zA-Z_]\w*)=(.+))?", line
-            )
+            cond_match = self._COND_ASSIGN_RE.match(line)
             if cond_match:
                 # 使用 || 后的值（条件为 false 时的值）
                 if cond_match.group(3) and cond_match.group(4):
                     varname = cond_match.group(3)
                     value = cond_match.group(4).strip().strip("\"'")
-                    self._ctx.set(varname, self._ctx.expand(value))
+                    state.ctx.set(varname, state.ctx.expand(value))
                 continue
 
             # 处理 : "${VAR:=default}" 格式的默认值设置
-            default_match = re.match(r'^:\s*"\$\{([a-zA-Z_]\w*):=([^}]*)\}"', line)
+            default_match = self._DEFAULT_ASSIGN_RE.match(line)
             if default_match:
                 varname = default_match.group(1)
                 default = default_match.group(2)
-                if not self._ctx.get(varname):
-                    self._ctx.set(varname, default)
+                if not state.ctx.get(varname):
+                    state.ctx.set(varname, default)
+
+        # 到文件末尾仍未找到结束引号的变量，使用已收集的部分
+        for varname, (parts, _) in pending.items():
+            state.raw_dep_values[varname] = " ".join(parts)
+
+    def _collect_raw_line(
+        self, state: _ParseState, line: str, pending: dict[str, tuple[list[str], str]]
+    ):
+        """按原始行收集维护者信息和依赖变量的原始值（供 _parse_variables 逐行调用）"""
+        if line.startswith("#"):
+            if not state.maintainer:
+                maintainer_match = self._MAINTAINER_RE.match(line)
+                if maintainer_match:
+                    state.maintainer = maintainer_match.group(1).strip()
+            contributor_match = self._CONTRIBUTOR_RE.match(line)
+            if contributor_match:
+                state.contributors.append(contributor_match.group(1).strip())
+
+        # 继续收集跨行的变量值，遇到结束引号为止
+        for varname, (parts, quote_char) in list(pending.items()):
+            end_pos = line.find(quote_char)
+            if end_pos >= 0:
+                parts.append(line[:end_pos])
+                state.raw_dep_values[varname] = " ".join(parts)
+                del pending[varname]
+            else:
+                parts.append(line)
+
+        # 依赖变量的定义须从行首开始，只取第一次定义
+        varname, sep, value = line.partition("=")
+        if (
+            not sep
+            or varname not in self._DEP_VAR_SET
+            or varname in state.raw_dep_values
+            or varname in pending
+        ):
+            return
+
+        quote_char = value[:1]
+        if quote_char in ('"', "'"):
+            if value.endswith(quote_char) and len(value) > 1:
+                # 单行完整定义
+                state.raw_dep_values[varname] = value[1:-1]
+            else:
+                # 多行开始
+                pending[varname] = ([value[1:]], quote_char)
+        else:
+            # 不带引号的单行
+            state.raw_dep_values[varname] = value
 
-    def _parse_pkgrel(self, content: str) -> int:
+    def _parse_pkgrel(self, state: _ParseState, content: str) -> int:
         """
         解析 pkgrel 值，支持 shell 算术表达式
         """
-        pkgrel_str = self._ctx.get("pkgrel")
+        pkgrel_str = state.ctx.get("pkgrel")
         if not pkgrel_str:
             # 尝试直接从内容提取
-            match = re.search(r"^pkgrel=(\S+)", content, re.MULTILINE)
+            match = self._PKGREL_RE.search(content)
             if match:
                 pkgrel_str = match.group(1)
 
@@ -433,7 +544,7 @@ class APKBUILDParser:
             return int(pkgrel_str)
 
         # 处理 shell 算术表达式 $(( ... ))
-        arith_match = re.match(r"\$\(\(\s*(.+?)\s*\)\)", pkgrel_str)
+        arith_match = self._ARITH_RE.match(pkgrel_str)
         if arith_match:
             expr = arith_match.group(1)
             return self._eval_shell_arithmetic(content, expr)
@@ -446,8 +557,7 @@ class APKBUILDParser:
         var_values = {}
 
         # 匹配 _varname=value 格式的变量定义
-        var_pattern = r"^(_\w+)=(\d+)"
-        for match in re.finditer(var_pattern, content, re.MULTILINE):
+        for match in self._NUMERIC_VAR_RE.finditer(content):
             var_name = match.group(1)
             var_value = match.group(2)
             var_values[var_name] = int(var_value)
@@ -457,107 +567,50 @@ class APKBUILDParser:
             var_name = m.group(0)
             return str(var_values.get(var_name, 0))
 
-        expr = re.sub(r"_\w+", replace_var, expr)
-        expr = re.sub(r"[^\d+\-*/\s]", "", expr)
+        expr = self._ARITH_VAR_RE.sub(replace_var, expr)
+        expr = self._NON_ARITH_CHAR_RE.sub("", expr)
 
         try:
-            if re.match(r"^[\d\s+\-*/]+$", expr):
+            if self._ARITH_EXPR_RE.match(expr):
                 return int(eval(expr))
         except (ValueError, SyntaxError):
             pass
 
         return 0
 
-    def _extract_dep_list(self, content: str, varname: str, pkgname: str = "") -> list[str]:
+    def _extract_dep_list(self, state: _ParseState, varname: str, pkgname: str = "") -> list[str]:
         """提取依赖列表（支持多行和变量展开）"""
         deps = []
 
         # 首先尝试从变量上下文获取
-        value = self._ctx.get(varname)
+        value = state.ctx.get(varname)
         if value and value.strip() and value.strip() != " ":
-            deps = self._parse_deps_string(value, pkgname)
+            deps = self._parse_deps_string(state, value, pkgname)
             if deps:
                 return deps
 
-        # 否则尝试直接从内容解析多行定义
-        deps_str = self._extract_multiline_var(content, varname)
+        # 否则使用扫描时收集的原始定义（可能跨多行）
+        deps_str = state.raw_dep_values.get(varname, "")
         if deps_str:
-            deps = self._parse_deps_string(deps_str, pkgname)
+            deps = self._parse_deps_string(state, deps_str, pkgname)
 
         return deps
 
-    def _extract_multiline_var(self, content: str, varname: str) -> str:
-        """提取可能跨多行的变量值"""
-        lines = content.split("\n")
-        in_var = False
-        result = []
-        quote_char = None
-
-        for line in lines:
-            if not in_var:
-                # 查找变量定义开始
-                match = re.match(rf"^{varname}=(.*)$", line)
-                if match:
-                    value = match.group(1)
-
-                    # 检查是否是带引号的多行
-                    if value.startswith('"'):
-                        if value.endswith('"') and len(value) > 1:
-                            # 单行完整定义
-                            return value[1:-1]
-                        else:
-                            # 多行开始
-                            in_var = True
-                            quote_char = '"'
-                            result.append(value[1:])
-                    elif value.startswith("'"):
-                        if value.endswith("'") and len(value) > 1:
-                            return value[1:-1]
-                        else:
-                            in_var = True
-                            quote_char = "'"
-                            result.append(value[1:])
-                    else:
-                        # 不带引号的单行
-                        return value
-            else:
-                # 在多行变量中
-                if quote_char and quote_char in line:
-                    # 找到结束引号
-                    end_pos = line.find(quote_char)
-                    result.append(line[:end_pos])
-                    break
-                else:
-                    result.append(line)
-
-        return " ".join(result)
-
-    def _parse_deps_string(self, deps_str: str, pkgname: str = "") -> list[str]:
+    def _parse_deps_string(self, state: _ParseState, deps_str: str, pkgname: str = "") -> list[str]:
         """解析依赖字符串"""
         deps = []
 
-        # 移除注释
-        lines = deps_str.split("\n")
-        cleaned_lines = []
-        for line in lines:
-            comment_pos = line.find("#")
-            if comment_pos >= 0:
-                line = line[:comment_pos]
-            cleaned_lines.append(line)
-
-        deps_str = " ".join(cleaned_lines)
+        # 移除注释并合并为一行；没有注释时直接替换换行
+        if "#" in deps_str:
+            deps_str = " ".join(line.partition("#")[0] for line in deps_str.split("\n"))
+        else:
+            deps_str = deps_str.replace("\n", " ")
 
         # 展开变量
-        deps_str = self._ctx.expand(deps_str)
-
-        # 分割依赖项
-        tokens = deps_str.split()
-
-        for token in tokens:
-            token = token.strip()
-            if not token:
-                continue
+        deps_str = state.ctx.expand(deps_str)
 
+        # 按空白分割依赖项（split 已去除空白，不会产生空 token）
+        for token in deps_str.split():
             # 跳过仍然包含变量引用的 token
             if "$" in token:
                 # 尝试替换 $pkgname
@@ -579,7 +632,7 @@ class APKBUILDParser:
             return None
 
         # 跳过空字符串和特殊字符
-        if dep in ["", "\\", '"', "'", "(", ")", " "]:
+        if dep in self._SKIP_TOKENS:
             return None
 
         # 移除前导的 ! (表示 NOT/冲突)
@@ -587,28 +640,29 @@ class APKBUILDParser:
             return None
 
         # 移除版本约束 (>=, <=, =, >, <, ~)
-        dep = re.split(r"[><=~]", dep)[0]
+        dep = self._VERSION_CONSTRAINT_RE.split(dep, maxsplit=1)[0]
 
         # 处理 :: 分隔符（表示子包）
         if "::" in dep:
             dep = dep.split("::")[0]
 
         # 移除括号内容
-        dep = re.sub(r"\([^)]*\)", "", dep)
+        if "(" in dep:
+            dep = self._PARENTHESIZED_RE.sub("", dep)
 
         dep = dep.strip()
 
-        # 验证包名格式
-        if not dep or not re.match(r"^[a-zA-Z0-9]", dep):
+        # 验证包名格式：须以 ASCII 字母或数字开头
+        if not dep or not (dep[0].isascii() and dep[0].isalnum()):
             return None
 
         return dep
 
-    def _extract_subpackages(self, content: str, pkgname: str) -> list[str]:
+    def _extract_subpackages(self, state: _ParseState, pkgname: str) -> list[str]:
         """提取子包列表"""
         subpkgs = []
 
-        raw_subpkgs = self._extract_dep_list(content, "subpackages", pkgname)
+        raw_subpkgs = self._extract_dep_list(state, "subpackages", pkgname)
 
         for subpkg in raw_subpkgs:
             # 处理 $pkgname-xxx 格式
@@ -5,1005 +5,863 @@
 支持按依赖类型过滤和不同样式显示。
 """
 
+import functools
+import gzip
 import json
-from typing import Any
+import os
+import re
+from collections import Counter, deque
+from collections.abc import Callable
+from operator import attrgetter, itemgetter
+from string import Template
+from typing import Any, BinaryIO
+from urllib.parse import quote
 
 from .graph import DependencyGraph, DependencyType
+from .parser import PackageInfo
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class Visualizer:
-    """依赖关系可视化器"""
 
-    # 节点颜色配置（按仓库）
-    REPO_COLORS = {
-        "main": "#4CAF50",  # 绿色
-        "community": "#2196F3",  # 蓝色
-        "testing": "#FF9800",  # 橙色
-        "unmaintained": "#9E9E9E",  # 灰色
-        "unknown": "#E0E0E0",  # 浅灰
-    }
+def _json_dumps(obj: Any) -> str:
+    """
+    序列化为紧凑的 JSON 字符串（已安装 orjson 时使用 orjson 加速）
 
-    # 边颜色配置（按依赖类型）
-    EDGE_STYLES = {
-        "runtime": {
-            "color": "#4CAF50",  # 绿色 - 运行时依赖
-            "dashes": False,  # 实线
-            "width": 2,
-        },
-        "build": {
-            "color": "#2196F3",  # 蓝色 - 构建依赖
-            "dashes": [5, 5],  # 虚线
-            "width": 1.5,
-        },
-        "check": {
-            "color": "#FF9800",  # 橙色 - 检查依赖
-            "dashes": [2, 2],  # 点线
-            "width": 1,
-        },
-    }
+    载荷都是新构建的纯数据（列表/字典树），不存在循环引用，因此关闭循环检查。
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), check_circular=False)
 
-    def __init__(self, graph: DependencyGraph):
-        """
-        初始化可视化器
 
-        Args:
-            graph: 依赖图
-        """
-        self.graph = graph
+def _json_bytes(obj: Any) -> bytes:
+    """序列化为 UTF-8 编码的 JSON 字节串"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _json_dumps(obj).encode("utf-8")
 
-    def render_html(
-        self,
-        package: str,
-        output_path: str,
-        dep_type: DependencyType = DependencyType.RUNTIME,  # 默认只显示运行时依赖
-        max_depth: int = 3,
-        include_reverse: bool = False,
-        show_all_types: bool = False,  # 是否显示所有类型（用不同样式区分）
-        title: str | None = None,
-    ):
-        """
-        渲染为交互式 HTML 文件
 
-        Args:
-            package: 中心软件包
-            output_path: 输出文件路径
-            dep_type: 依赖类型（默认只显示运行时依赖）
-            max_depth: 最大深度
-            include_reverse: 是否包含反向依赖
-            show_all_types: 是否显示所有依赖类型（用不同样式区分）
-            title: 页面标题
-        """
-        if show_all_types:
-            # 收集所有类型的依赖，用不同样式显示
-            nodes_to_show, edges_data = self._collect_all_dep_types(
-                package, max_depth, include_reverse
-            )
-        else:
-            # 只收集指定类型的依赖
-            nodes_to_show, edges_data = self._collect_single_dep_type(
-                package, dep_type, max_depth, include_reverse
-            )
+@functools.cache
+def _load_igraph() -> Any:
+    """按需导入 igraph（导入较慢，只在计算布局或社区时加载）；未安装时返回 None"""
+    try:
+        import igraph
+    except ImportError:
+        return None
+    return igraph
 
-        # 构建节点数据
-        nodes_data = []
-        for node in nodes_to_show:
-            pkg_info = self.graph.packages.get(node)
-            repo = pkg_info.repo if pkg_info else "unknown"
 
-            node_data = {
-                "id": node,
-                "label": node,
-                "color": self.REPO_COLORS.get(repo, self.REPO_COLORS["unknown"]),
-                "size": 30 if node == package else 20,
-                "font": {"size": 14 if node == package else 12},
-            }
+def output_file_path(path: str, compress: bool = False) -> str:
+    """实际写出的文件路径：compress 为 True 且 path 不以 .gz 结尾时追加 .gz"""
+    if compress and not path.endswith(".gz"):
+        return path + ".gz"
+    return path
 
-            if pkg_info:
-                node_data["title"] = self._make_tooltip(pkg_info)
 
-            nodes_data.append(node_data)
+def _open_output(path: str, compress: bool = False) -> BinaryIO:
+    """
+    以二进制模式打开输出文件
 
-        # 生成 HTML（带过滤器控制）
-        html_content = self._generate_filterable_html(
-            nodes_data,
-            edges_data,
-            package=package,
-            title=title or f"Dependency Graph: {package}",
-            show_all_types=show_all_types,
-        )
+    写出到 output_file_path(path, compress)；路径以 .gz 结尾（compress 为 True，
+    或 path 本身如 graph.html.gz）时按 gzip 压缩写出。
+    """
+    path = output_file_path(path, compress)
+    if path.endswith(".gz"):
+        return gzip.open(path, "wb", compresslevel=6)
+    return open(path, "wb")
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
 
-    def _collect_single_dep_type(
-        self, package: str, dep_type: DependencyType, max_depth: int, include_reverse: bool
-    ) -> tuple:
-        """收集单一类型的依赖"""
-        nodes_to_show = {package}
-        edges_data = []
+def _data_script_path(path: str) -> str:
+    """页面外部数据脚本的路径：graph.html（或 graph.html.gz）-> graph.data.js"""
+    return path.removesuffix(".gz").removesuffix(".html") + ".data.js"
 
-        # 添加依赖
-        deps = self.graph.get_dependencies(
-            package, dep_type=dep_type, recursive=True, max_depth=max_depth
-        )
-        nodes_to_show.update(deps)
 
-        # 添加反向依赖
-        if include_reverse:
-            rdeps = self.graph.get_reverse_dependencies(
-                package, dep_type=dep_type, recursive=True, max_depth=max_depth
-            )
-            nodes_to_show.update(rdeps)
+class _StreamTemplate:
+    """
+    可流式写出的 HTML 模板
 
-        # 确定边的样式
-        if dep_type == DependencyType.RUNTIME:
-            edge_style = self.EDGE_STYLES["runtime"]
-            edge_type = "runtime"
-        elif dep_type == DependencyType.BUILD:
-            edge_style = self.EDGE_STYLES["build"]
-            edge_type = "build"
-        else:
-            edge_style = self.EDGE_STYLES["runtime"]
-            edge_type = "runtime"
+    模板文本（string.Template 语法）按 JSON 载荷占位符切分为若干片段：
+    不含占位符的片段在模块加载时预先编码为 UTF-8，其余片段在写出时替换；
+    载荷直接序列化为字节写入文件，不再拼接成一个巨大的字符串。
+    """
 
-        # 添加边
-        for node in nodes_to_show:
-            for dep in self.graph.get_dependencies(node, dep_type=dep_type):
-                if dep in nodes_to_show:
-                    edges_data.append(
-                        {
-                            "from": node,
-                            "to": dep,
-                            "arrows": "to",
-                            "color": {"color": edge_style["color"], "opacity": 0.8},
-                            "dashes": edge_style["dashes"],
-                            "width": edge_style["width"],
-                            "depType": edge_type,
-                        }
-                    )
-
-        return nodes_to_show, edges_data
+    def __init__(self, text: str, payloads: tuple[str, ...]):
+        pattern = r"\$\{(" + "|".join(payloads) + r")\}"
+        parts = re.split(pattern, text)
+        self._chunks = [Template(chunk) for chunk in parts[0::2]]
+        self._payloads = parts[1::2]
+        self._encoded = [self._encode_static(chunk) for chunk in self._chunks]
 
-    def _collect_all_dep_types(self, package: str, max_depth: int, include_reverse: bool) -> tuple:
-        """收集所有类型的依赖，用不同样式区分"""
-        nodes_to_show = {package}
-        edges_data: list[dict] = []
-        edge_set = set()  # 避免重复边
+    @staticmethod
+    def _encode_static(chunk: Template) -> bytes | None:
+        """预先编码不含占位符的片段"""
+        try:
+            return chunk.substitute().encode("utf-8")
+        except KeyError:
+            return None
 
-        pkg_info = self.graph.packages.get(package)
-        if not pkg_info:
-            return nodes_to_show, edges_data
+    def write(self, f: BinaryIO, payloads: dict[str, Any], **fields: Any):
+        """
+        写出模板
 
-        # 递归收集依赖
-        def collect_deps_recursive(pkg_name: str, current_depth: int, visited: set[str]):
-            if current_depth > max_depth or pkg_name in visited:
-                return
-            visited.add(pkg_name)
+        Args:
+            f: 以二进制模式打开的文件
+            payloads: JSON 载荷（占位符名 -> 待序列化对象；bytes 视为已序列化，原样写出）
+            fields: 普通占位符的替换值
+        """
+        for i, chunk in enumerate(self._chunks):
+            encoded = self._encoded[i]
+            if encoded is None:
+                encoded = chunk.substitute(fields).encode("utf-8")
+            f.write(encoded)
 
-            pkg = self.graph.packages.get(pkg_name)
-            if not pkg:
-                return
+            if i < len(self._payloads):
+                payload = payloads[self._payloads[i]]
+                f.write(payload if isinstance(payload, bytes) else _json_bytes(payload))
 
-            # 运行时依赖
-            for dep in pkg.depends:
-                if dep in self.graph.packages:
-                    nodes_to_show.add(dep)
-                    edge_key = (pkg_name, dep, "runtime")
-                    if edge_key not in edge_set:
-                        edge_set.add(edge_key)
-                        style = self.EDGE_STYLES["runtime"]
-                        edges_data.append(
-                            {
-                                "from": pkg_name,
-                                "to": dep,
-                                "arrows": "to",
-                                "color": {"color": style["color"], "opacity": 0.8},
-                                "dashes": style["dashes"],
-                                "width": style["width"],
-                                "depType": "runtime",
-                            }
-                        )
-                    collect_deps_recursive(dep, current_depth + 1, visited.copy())
-
-            # 构建依赖
-            for dep in pkg.build_depends:
-                if dep in self.graph.packages:
-                    nodes_to_show.add(dep)
-                    edge_key = (pkg_name, dep, "build")
-                    if edge_key not in edge_set:
-                        edge_set.add(edge_key)
-                        style = self.EDGE_STYLES["build"]
-                        edges_data.append(
-                            {
-                                "from": pkg_name,
-                                "to": dep,
-                                "arrows": "to",
-                                "color": {"color": style["color"], "opacity": 0.6},
-                                "dashes": style["dashes"],
-                                "width": style["width"],
-                                "depType": "build",
-                            }
-                        )
-                    collect_deps_recursive(dep, current_depth + 1, visited.copy())
-
-            # 检查依赖
-            for dep in pkg.checkdepends:
-                if dep in self.graph.packages:
-                    nodes_to_show.add(dep)
-                    edge_key = (pkg_name, dep, "check")
-                    if edge_key not in edge_set:
-                        edge_set.add(edge_key)
-                        style = self.EDGE_STYLES["check"]
-                        edges_data.append(
-                            {
-                                "from": pkg_name,
-                                "to": dep,
-                                "arrows": "to",
-                                "color": {"color": style["color"], "opacity": 0.5},
-                                "dashes": style["dashes"],
-                                "width": style["width"],
-                                "depType": "check",
-                            }
-                        )
-                    collect_deps_recursive(dep, current_depth + 1, visited.copy())
-
-        collect_deps_recursive(package, 0, set())
-
-        return nodes_to_show, edges_data
-
-    def _generate_filterable_html(
-        self,
-        nodes: list[dict],
-        edges: list[dict],
-        package: str,
-        title: str,
-        show_all_types: bool = False,
-    ) -> str:
-        """生成带依赖类型过滤器的 HTML"""
-        return f'''<!DOCTYPE html>
+
+# 全局概览页模板（string.Template：JS 模板字符串中的 `$` 需写作 `$$`）
+_OVERVIEW_TEMPLATE = _StreamTemplate(
+    r"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
-    <title>{title}</title>
+    <title>${title}</title>
     <script src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
     <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
             background: #1a1a2e;
             color: #eee;
-        }}
-        #header {{
+        }
+        #header {
             background: #16213e;
-            padding: 12px 20px;
+            padding: 8px 15px;
             border-bottom: 1px solid #0f3460;
             display: flex;
             justify-content: space-between;
             align-items: center;
-        }}
-        #header h1 {{
-            font-size: 1.3rem;
-            font-weight: 500;
-        }}
-        #filter-controls {{
+            flex-wrap: wrap;
+            gap: 8px;
+        }
+        #header h1 { font-size: 1.1rem; font-weight: 500; }
+        #filter-controls {
             display: flex;
-            gap: 15px;
+            gap: 12px;
             align-items: center;
-        }}
-        .filter-group {{
+            flex-wrap: wrap;
+        }
+        .filter-group {
             display: flex;
             align-items: center;
-            gap: 8px;
-        }}
-        .filter-group label {{
+            gap: 6px;
+        }
+        .filter-group label {
             display: flex;
             align-items: center;
-            gap: 5px;
+            gap: 4px;
             cursor: pointer;
-            padding: 5px 10px;
+            padding: 4px 8px;
             border-radius: 4px;
-            transition: background 0.2s;
-        }}
-        .filter-group label:hover {{
-            background: rgba(255,255,255,0.1);
-        }}
-        .filter-group input[type="checkbox"] {{
-            width: 16px;
-            height: 16px;
-            cursor: pointer;
-        }}
-        .dep-indicator {{
-            display: inline-block;
-            width: 20px;
-            height: 3px;
-            margin-right: 5px;
-        }}
-        .dep-runtime {{ background: #4CAF50; }}
-        .dep-build {{ background: #2196F3; background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 5px, transparent 5px, transparent 10px); }}
-        .dep-check {{ background: #FF9800; background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px); }}
-        #container {{
-            display: flex;
-            height: calc(100vh - 55px);
-        }}
-        #network {{
-            flex: 1;
-            background: #1a1a2e;
-        }}
-        #sidebar {{
-            width: 280px;
+            font-size: 0.8rem;
+        }
+        .filter-group label:hover { background: rgba(255,255,255,0.1); }
+        .dep-indicator { display: inline-block; width: 18px; height: 3px; }
+        .dep-runtime { background: #4CAF50; }
+        .dep-build { background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 4px, transparent 4px, transparent 8px); }
+        .dep-check { background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px); }
+        #container { display: flex; height: calc(100vh - 48px); }
+        #network { flex: 1; background: #1a1a2e; }
+        #sidebar {
+            width: 300px;
             background: #16213e;
-            padding: 15px;
+            padding: 12px;
             overflow-y: auto;
             border-left: 1px solid #0f3460;
-        }}
-        #sidebar h3 {{
-            margin-bottom: 10px;
-            color: #e94560;
-            font-size: 1rem;
-        }}
-        #search-box {{
+        }
+        #sidebar h3 { margin: 10px 0 8px; color: #e94560; font-size: 0.9rem; }
+        #sidebar h3:first-child { margin-top: 0; }
+        .input-row {
+            display: flex;
+            gap: 8px;
+            margin-bottom: 8px;
+        }
+        .input-group {
+            flex: 1;
+        }
+        .input-group label {
+            display: block;
+            font-size: 0.75rem;
+            color: #888;
+            margin-bottom: 3px;
+        }
+        .input-group input, .input-group select {
             width: 100%;
-            padding: 8px;
-            margin-bottom: 15px;
+            padding: 6px 8px;
             background: #1a1a2e;
             border: 1px solid #0f3460;
             color: #eee;
             border-radius: 4px;
-        }}
-        #search-box:focus {{
-            outline: none;
-            border-color: #e94560;
-        }}
-        #info {{
-            font-size: 0.85rem;
-            line-height: 1.5;
-        }}
-        #info p {{
-            margin: 6px 0;
-        }}
-        #info .label {{
-            color: #888;
-        }}
-        #legend {{
-            margin-top: 15px;
-            padding-top: 15px;
-            border-top: 1px solid #0f3460;
-        }}
-        .legend-item {{
-            display: flex;
-            align-items: center;
-            margin: 8px 0;
-            font-size: 0.85rem;
-        }}
-        .legend-color {{
-            width: 14px;
-            height: 14px;
-            border-radius: 50%;
-            margin-right: 8px;
-        }}
-        .legend-line {{
-            width: 30px;
-            height: 3px;
-            margin-right: 8px;
-        }}
-        #stats {{
-            margin-top: 15px;
-            padding-top: 15px;
-            border-top: 1px solid #0f3460;
-            font-size: 0.85rem;
-        }}
-        #stats p {{
-            margin: 5px 0;
-            color: #888;
-        }}
-        #stats span {{
+            font-size: 0.8rem;
+        }
+        .input-group input:focus, .input-group select:focus { outline: none; border-color: #e94560; }
+        .input-group input[type="number"] { width: 100%; }
+        #search-box {
+            width: 100%;
+            padding: 8px;
+            margin-bottom: 8px;
+            background: #1a1a2e;
+            border: 1px solid #0f3460;
             color: #eee;
-        }}
-        button {{
+            border-radius: 4px;
+        }
+        #search-box:focus { outline: none; border-color: #e94560; }
+        #info { font-size: 0.78rem; line-height: 1.4; max-height: 200px; overflow-y: auto; }
+        #stats { margin-top: 12px; padding-top: 12px; border-top: 1px solid #0f3460; font-size: 0.78rem; }
+        #stats p { margin: 3px 0; color: #888; }
+        #stats span { color: #eee; }
+        .legend { margin-top: 10px; padding-top: 10px; border-top: 1px solid #0f3460; }
+        .legend-item { display: flex; align-items: center; margin: 4px 0; font-size: 0.75rem; }
+        .legend-color { width: 10px; height: 10px; border-radius: 50%; margin-right: 6px; }
+        button {
             background: #e94560;
             color: white;
             border: none;
-            padding: 8px 14px;
+            padding: 5px 10px;
             cursor: pointer;
             border-radius: 4px;
-            font-size: 0.85rem;
-            margin: 4px 4px 4px 0;
-        }}
-        button:hover {{
-            background: #ff6b6b;
-        }}
+            font-size: 0.75rem;
+            margin: 2px;
+        }
+        button:hover { background: #ff6b6b; }
+        button.secondary { background: #0f3460; }
+        button.secondary:hover { background: #1a1a2e; }
+        #loading {
+            position: fixed;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            background: rgba(22, 33, 62, 0.95);
+            padding: 25px 40px;
+            border-radius: 8px;
+            text-align: center;
+            z-index: 1000;
+        }
+        #loading.hidden { display: none; }
+        .spinner {
+            border: 3px solid #0f3460;
+            border-top: 3px solid #e94560;
+            border-radius: 50%;
+            width: 35px;
+            height: 35px;
+            animation: spin 1s linear infinite;
+            margin: 0 auto 12px;
+        }
+        @keyframes spin { 0% { transform: rotate(0deg); } 100% { transform: rotate(360deg); } }
+        .checkbox-row {
+            display: flex;
+            align-items: center;
+            gap: 15px;
+            margin: 8px 0;
+            font-size: 0.8rem;
+        }
+        .checkbox-row label {
+            display: flex;
+            align-items: center;
+            gap: 5px;
+            cursor: pointer;
+        }
+        #filter-status {
+            font-size: 0.75rem;
+            color: #4CAF50;
+            margin-top: 8px;
+            padding: 6px;
+            background: rgba(76, 175, 80, 0.1);
+            border-radius: 4px;
+            display: none;
+        }
+        #filter-status.active { display: block; }
     </style>
 </head>
 <body>
     <div id="header">
-        <h1>{title}</h1>
+        <h1>${title}</h1>
         <div id="filter-controls">
-            <span style="color: #888;">Filter:</span>
+            <span style="color: #888; font-size: 0.8rem;">Edges:</span>
             <div class="filter-group">
-                <label>
-                    <input type="checkbox" id="filter-runtime" checked>
-                    <span class="dep-indicator dep-runtime"></span>
-                    Runtime
-                </label>
-                <label>
-                    <input type="checkbox" id="filter-build">
-                    <span class="dep-indicator dep-build"></span>
-                    Build
-                </label>
-                <label>
-                    <input type="checkbox" id="filter-check">
-                    <span class="dep-indicator dep-check"></span>
-                    Check
-                </label>
+                <label><input type="checkbox" id="filter-runtime" checked><span class="dep-indicator dep-runtime"></span>Runtime</label>
+                <label><input type="checkbox" id="filter-build"><span class="dep-indicator dep-build"></span>Build</label>
+                <label><input type="checkbox" id="filter-check"><span class="dep-indicator dep-check"></span>Check</label>
             </div>
         </div>
     </div>
     <div id="container">
         <div id="network"></div>
         <div id="sidebar">
-            <h3>🔍 Search</h3>
-            <input type="text" id="search-box" placeholder="Type package name...">
-
-            <h3>📦 Package Info</h3>
-            <div id="info">
-                <p><em>Click on a node to see details</em></p>
-            </div>
+            <h3>🔍 Search & Focus</h3>
+            <input type="text" id="search-box" placeholder="Search package... (Enter to focus)">
 
-            <div id="legend">
-                <h3>📊 Legend</h3>
-                <p style="font-size: 0.8rem; color: #888; margin-bottom: 8px;">Node (by repo):</p>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #4CAF50;"></div>
-                    <span>main</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #2196F3;"></div>
-                    <span>community</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #FF9800;"></div>
-                    <span>testing</span>
+            <h3>🎯 Node Filters</h3>
+            <div class="input-row">
+                <div class="input-group">
+                    <label>Root Package (subtree)</label>
+                    <input type="text" id="filter-root" placeholder="e.g. gcc">
                 </div>
-                <p style="font-size: 0.8rem; color: #888; margin: 12px 0 8px;">Edge (by dep type):</p>
-                <div class="legend-item">
-                    <div class="legend-line" style="background: #4CAF50;"></div>
-                    <span>Runtime (solid)</span>
+            </div>
+            <div class="input-row">
+                <div class="input-group">
+                    <label>Min Reverse Deps</label>
+                    <input type="number" id="filter-min-rdeps" value="0" min="0">
                 </div>
-                <div class="legend-item">
-                    <div class="legend-line" style="background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 5px, transparent 5px, transparent 10px);"></div>
-                    <span>Build (dashed)</span>
+                <div class="input-group">
+                    <label>Min Dependencies</label>
+                    <input type="number" id="filter-min-deps" value="0" min="0">
                 </div>
-                <div class="legend-item">
-                    <div class="legend-line" style="background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px);"></div>
-                    <span>Check (dotted)</span>
+            </div>
+            <div class="input-row">
+                <div class="input-group">
+                    <label>Repository</label>
+                    <select id="filter-repo">
+                        <option value="">All</option>
+                        <option value="main" selected>main</option>
+                        <option value="community">community</option>
+                        <option value="testing">testing</option>
+                    </select>
                 </div>
             </div>
+            <div class="checkbox-row">
+                <label><input type="checkbox" id="filter-no-orphans"> Hide orphans (no deps & no rdeps)</label>
+            </div>
+            <div style="margin-top: 10px;">
+                <button onclick="applyNodeFilters()">Apply Filters</button>
+                <button onclick="resetFilters()" class="secondary">Reset</button>
+            </div>
+            <div id="filter-status"></div>
+
+            <h3>📦 Package Info</h3>
+            <div id="info"><p><em>Click a node to see details</em></p></div>
 
             <div id="stats">
                 <h3>📈 Statistics</h3>
-                <p>Nodes: <span id="node-count">0</span></p>
-                <p>Edges: <span id="edge-count">0</span></p>
-                <p>Runtime: <span id="runtime-count">0</span></p>
+                <p>Total nodes: <span id="total-nodes">${total}</span></p>
+                <p>Visible nodes: <span id="visible-nodes">${total}</span></p>
+                <p>Visible edges: <span id="edge-count">0</span></p>
+                <p style="margin-top: 6px;">Runtime: <span id="runtime-count">0</span></p>
                 <p>Build: <span id="build-count">0</span></p>
                 <p>Check: <span id="check-count">0</span></p>
             </div>
 
-            <div style="margin-top: 15px; padding-top: 15px; border-top: 1px solid #0f3460;">
+            <div class="legend">
+                <p style="font-size: 0.7rem; color: #666; margin-bottom: 4px;">Nodes by repo:</p>
+                <div class="legend-item"><div class="legend-color" style="background: #4CAF50;"></div>main</div>
+                <div class="legend-item"><div class="legend-color" style="background: #2196F3;"></div>community</div>
+                <div class="legend-item"><div class="legend-color" style="background: #FF9800;"></div>testing</div>
+            </div>
+
+            <div style="margin-top: 12px;">
                 <button onclick="network.fit()">Fit View</button>
-                <button onclick="focusCenter()">Center</button>
+                <button onclick="togglePhysics()" class="secondary">Toggle Physics</button>
             </div>
         </div>
     </div>
-
+    <div id="loading">
+        <div class="spinner"></div>
+        <div>Loading ${total} packages...</div>
+    </div>
     <script>
-        // 原始数据
-        const allNodes = {json.dumps(nodes, ensure_ascii=False)};
-        const allEdges = {json.dumps(edges, ensure_ascii=False)};
-        const centerPackage = "{package}";
+        // 节点按列传输（每个字段一个数组，按节点下标对齐），加载时还原为 vis.js 节点
+        const nodeColumns = ${nodes_json};
+        const allNodes = nodeColumns.id.map((id, i) => ({
+            id, label: id, size: nodeColumns.size[i], font: { size: nodeColumns.fontSize[i] }
+        }));
+        // 边以 [fromIdx, toIdx, typeCode] 紧凑形式传输，端点为 allNodes 中的下标
+        const edgeStyles = ${edge_styles_json};
+        const allEdges = ${edges_json};
+        // 节点统计按节点下标排列，每项为 [repoCode, deps, rdeps]；
+        // 仓库名和颜色只各传一份，节点颜色在加载时按 repoCode 查表
+        const repoNames = ${repo_names_json};
+        const repoColors = ${repo_colors_json};
+        const nodeStats = ${stats_json};
+        // 提示信息以 t = [版本, 仓库, 描述摘要, 依赖数] 传输时，加载时还原为 HTML
+        function makeTooltip(id, version, repo, description, depCount) {
+            const lines = [`<b>$${id}</b>`, `Version: $${version}`, `Repo: $${repo}`];
+            if (description) lines.push(`<br>$${description}...`);
+            if (depCount) lines.push(`<br>Dependencies: $${depCount}`);
+            return lines.join('<br>');
+        }
+        for (let i = 0; i < allNodes.length; i++) {
+            const node = allNodes[i];
+            node.color = repoColors[nodeStats[i][0]];
+            const title = nodeColumns.title?.[i];
+            const fields = nodeColumns.t?.[i];
+            if (title) node.title = title;
+            else if (fields) node.title = makeTooltip(node.id, ...fields);
+            if (nodeColumns.x) {
+                node.x = nodeColumns.x[i];
+                node.y = nodeColumns.y[i];
+            }
+        }
 
-        // 当前显示的数据
+        // 依赖关系索引（服务端预先构建）
+        const depsIndex = ${deps_index_json};  // 节点下标 -> [依赖节点下标]
+        const nodeIndex = new Map(allNodes.map((n, i) => [n.id, i]));
+
+        // 可见性掩码：visibleMask[i] === 1 表示 allNodes[i] 可见
+        const visibleMask = new Uint8Array(allNodes.length).fill(1);
+        let visibleCount = allNodes.length;
         const nodes = new vis.DataSet(allNodes);
         const edges = new vis.DataSet([]);
 
         const container = document.getElementById('network');
-        const data = {{ nodes: nodes, edges: edges }};
+        const data = { nodes: nodes, edges: edges };
 
-        const options = {{
-            nodes: {{
-                shape: 'dot',
-                font: {{
-                    color: '#ffffff'
-                }}
-            }},
-            edges: {{
-                smooth: {{
-                    type: 'continuous'
-                }}
-            }},
-            physics: {{
-                barnesHut: {{
-                    gravitationalConstant: -3000,
-                    centralGravity: 0.3,
-                    springLength: 120,
-                    springConstant: 0.04,
+        // 大图的布局已在服务端预先计算（节点带 x/y 坐标），此时关闭物理模拟
+        const precomputedLayout = ${precomputed_layout};
+
+        const options = {
+            nodes: { shape: 'dot', font: { size: 8, color: '#fff' } },
+            edges: { smooth: false },
+            physics: {
+                enabled: !precomputedLayout,
+                barnesHut: {
+                    gravitationalConstant: -2000,
+                    centralGravity: 0.1,
+                    springLength: 150,
+                    springConstant: 0.01,
                     damping: 0.5
-                }},
-                stabilization: {{
-                    iterations: 150
-                }}
-            }},
-            interaction: {{
+                },
+                stabilization: { iterations: 150, updateInterval: 25 }
+            },
+            interaction: {
                 hover: true,
-                tooltipDelay: 200
-            }}
-        }};
+                hideEdgesOnDrag: true,
+                hideEdgesOnZoom: true
+            },
+            layout: { improvedLayout: false }
+        };
 
         const network = new vis.Network(container, data, options);
+        let physicsEnabled = !precomputedLayout;
 
-        // 过滤器状态
-        let filters = {{
-            runtime: true,
-            build: false,
-            check: false
-        }};
+        if (precomputedLayout) {
+            document.getElementById('loading').classList.add('hidden');
+        } else {
+            network.on('stabilizationIterationsDone', () => {
+                document.getElementById('loading').classList.add('hidden');
+                network.setOptions({ physics: { stabilization: false } });
+            });
+        }
 
-        // 更新显示的边
-        function updateEdges() {{
-            const filteredEdges = allEdges.filter(edge => {{
-                if (edge.depType === 'runtime' && filters.runtime) return true;
-                if (edge.depType === 'build' && filters.build) return true;
-                if (edge.depType === 'check' && filters.check) return true;
-                return false;
-            }});
+        let edgeFilters = { runtime: true, build: false, check: false };
 
-            // 找出需要显示的节点
-            const connectedNodes = new Set([centerPackage]);
-            filteredEdges.forEach(edge => {{
-                connectedNodes.add(edge.from);
-                connectedNodes.add(edge.to);
-            }});
-
-            // 更新节点可见性
-            allNodes.forEach(node => {{
-                const isVisible = connectedNodes.has(node.id);
-                nodes.update({{
-                    id: node.id,
-                    hidden: !isVisible
-                }});
-            }});
+        // 页面加载时自动应用默认过滤器（main 仓库）
+        setTimeout(() => applyNodeFilters(), 100);
 
-            // 更新边
-            edges.clear();
-            edges.add(filteredEdges);
+        function getSubtree(rootIdx) {
+            // BFS 获取所有依赖子树（用下标代替 queue.shift()，避免 O(n²)），返回节点掩码
+            const visited = new Uint8Array(allNodes.length);
+            const queue = [rootIdx];
+            visited[rootIdx] = 1;
+            let head = 0;
+            while (head < queue.length) {
+                const deps = depsIndex[queue[head++]];
+                for (let i = 0; i < deps.length; i++) {
+                    const dep = deps[i];
+                    if (!visited[dep]) {
+                        visited[dep] = 1;
+                        queue.push(dep);
+                    }
+                }
+            }
+            return visited;
+        }
 
-            // 更新统计
-            updateStats(filteredEdges);
-        }}
+        function applyNodeFilters() {
+            const rootPkg = document.getElementById('filter-root').value.trim();
+            const minRdeps = parseInt(document.getElementById('filter-min-rdeps').value) || 0;
+            const minDeps = parseInt(document.getElementById('filter-min-deps').value) || 0;
+            const repoFilter = document.getElementById('filter-repo').value;
+            const repoCode = repoNames.indexOf(repoFilter);
+            const noOrphans = document.getElementById('filter-no-orphans').checked;
 
-        function updateStats(filteredEdges) {{
-            const visibleNodes = allNodes.filter(n => !nodes.get(n.id)?.hidden).length;
-            document.getElementById('node-count').textContent = visibleNodes;
-            document.getElementById('edge-count').textContent = filteredEdges.length;
-            document.getElementById('runtime-count').textContent =
-                filteredEdges.filter(e => e.depType === 'runtime').length;
-            document.getElementById('build-count').textContent =
-                filteredEdges.filter(e => e.depType === 'build').length;
-            document.getElementById('check-count').textContent =
-                filteredEdges.filter(e => e.depType === 'check').length;
-        }}
+            // 应用 root 包过滤 (子树)
+            const rootIdx = rootPkg ? nodeIndex.get(rootPkg) : undefined;
+            if (rootPkg && rootIdx === undefined) {
+                alert('Package "' + rootPkg + '" not found');
+                return;
+            }
+            if (rootIdx !== undefined) {
+                visibleMask.set(getSubtree(rootIdx));
+            } else {
+                visibleMask.fill(1);
+            }
 
-        // 过滤器事件
-        document.getElementById('filter-runtime').addEventListener('change', function() {{
-            filters.runtime = this.checked;
-            updateEdges();
-        }});
-        document.getElementById('filter-build').addEventListener('change', function() {{
-            filters.build = this.checked;
-            updateEdges();
-        }});
-        document.getElementById('filter-check').addEventListener('change', function() {{
-            filters.check = this.checked;
-            updateEdges();
-        }});
+            // 在掩码上一次性应用仓库、最小被依赖数、最小依赖数和孤立节点过滤，
+            // 同时生成节点显示更新（一次批量更新，只触发一次 DataSet 事件）
+            const updates = new Array(allNodes.length);
+            visibleCount = 0;
+            for (let i = 0; i < allNodes.length; i++) {
+                const id = allNodes[i].id;
+                if (visibleMask[i]) {
+                    const [repo, deps, rdeps] = nodeStats[i];
+                    if ((repoFilter && repo !== repoCode) ||
+                        rdeps < minRdeps ||
+                        deps < minDeps ||
+                        (noOrphans && deps === 0 && rdeps === 0)) {
+                        visibleMask[i] = 0;
+                    } else {
+                        visibleCount++;
+                    }
+                }
+                updates[i] = { id, hidden: !visibleMask[i] };
+            }
+            nodes.update(updates);
 
-        // 初始化显示
-        updateEdges();
+            updateEdges();
 
-        // 点击节点显示信息
-        network.on('click', function(params) {{
-            if (params.nodes.length > 0) {{
-                const nodeId = params.nodes[0];
-                const node = nodes.get(nodeId);
-                if (node && node.title) {{
-                    document.getElementById('info').innerHTML = node.title;
-                }} else {{
-                    document.getElementById('info').innerHTML = `<p><strong>${{nodeId}}</strong></p>`;
-                }}
-            }}
-        }});
+            // 显示过滤状态
+            const status = document.getElementById('filter-status');
+            const filterInfo = [];
+            if (rootPkg) filterInfo.push(`Root: $${rootPkg}`);
+            if (minRdeps > 0) filterInfo.push(`Min rdeps: $${minRdeps}`);
+            if (minDeps > 0) filterInfo.push(`Min deps: $${minDeps}`);
+            if (repoFilter) filterInfo.push(`Repo: $${repoFilter}`);
+            if (noOrphans) filterInfo.push('No orphans');
 
-        // 搜索功能
-        const searchBox = document.getElementById('search-box');
-        searchBox.addEventListener('input', function(e) {{
-            const query = e.target.value.toLowerCase();
-            if (query.length >= 2) {{
-                const matchingNodes = allNodes.filter(n =>
-                    n.id.toLowerCase().includes(query) && !nodes.get(n.id)?.hidden
-                );
-                if (matchingNodes.length > 0 && matchingNodes.length <= 10) {{
-                    network.selectNodes(matchingNodes.map(n => n.id));
-                    if (matchingNodes.length === 1) {{
-                        network.focus(matchingNodes[0].id, {{
-                            scale: 1.5,
-                            animation: true
-                        }});
-                    }}
-                }}
-            }}
-        }});
-
-        searchBox.addEventListener('keydown', function(e) {{
-            if (e.key === 'Enter') {{
-                const query = e.target.value.toLowerCase();
-                const exactMatch = allNodes.find(n => n.id.toLowerCase() === query);
-                if (exactMatch && !nodes.get(exactMatch.id)?.hidden) {{
-                    network.selectNodes([exactMatch.id]);
-                    network.focus(exactMatch.id, {{
-                        scale: 2,
-                        animation: true
-                    }});
-                }}
-            }}
-        }});
+            if (filterInfo.length > 0) {
+                status.textContent = `✓ $${visibleCount} nodes | $${filterInfo.join(', ')}`;
+                status.classList.add('active');
+            } else {
+                status.classList.remove('active');
+            }
 
-        function focusCenter() {{
-            network.focus(centerPackage, {{
-                scale: 1.2,
-                animation: true
-            }});
-        }}
-    </script>
-</body>
-</html>'''
+            document.getElementById('visible-nodes').textContent = visibleCount;
 
-    def render_filtered_graph_html(
-        self,
-        output_path: str,
-        title: str = "Filtered Dependency Graph",
-        dep_type: DependencyType = DependencyType.RUNTIME,
-        show_all_types: bool = False,
-        filters: dict[str, Any] | None = None,
-    ):
-        """
-        渲染带过滤器的依赖图
+            // 如果指定了 root，自动聚焦
+            if (rootIdx !== undefined) {
+                setTimeout(() => {
+                    network.focus(rootPkg, { scale: 1.2, animation: true });
+                    network.selectNodes([rootPkg]);
+                }, 100);
+            } else {
+                setTimeout(() => network.fit(), 100);
+            }
+        }
 
-        Args:
-            output_path: 输出文件路径
-            title: 页面标题
-            dep_type: 依赖类型
-            show_all_types: 是否显示所有类型
-            filters: 过滤器配置
-                - root_pkg: 只显示该包的依赖子树
-                - min_rdeps: 最小被依赖数
-                - min_deps: 最小依赖数
-                - no_orphans: 排除孤立包
-                - repo: 只显示指定仓库
-        """
-        filters = filters or {}
+        function resetFilters() {
+            document.getElementById('filter-root').value = '';
+            document.getElementById('filter-min-rdeps').value = '0';
+            document.getElementById('filter-min-deps').value = '0';
+            document.getElementById('filter-repo').value = '';
+            document.getElementById('filter-no-orphans').checked = false;
 
-        # 应用过滤器，获取要显示的节点
-        nodes_to_show = self._apply_filters(filters, dep_type)
+            visibleMask.fill(1);
+            visibleCount = allNodes.length;
+            nodes.update(allNodes.map(n => ({ id: n.id, hidden: false })));
 
-        if not nodes_to_show:
-            # 如果没有节点，返回空图
-            nodes_to_show = set()
+            document.getElementById('filter-status').classList.remove('active');
+            document.getElementById('visible-nodes').textContent = allNodes.length;
 
-        # 构建节点数据
-        nodes_data = []
-        rdep_counts = {}
+            updateEdges();
+            network.fit();
+        }
+
+        function updateEdges() {
+            // 可见性判断只需查掩码，命中的边再按样式表展开为 vis.js 边；
+            // 各类型边数在同一趟循环中按 typeCode 计数
+            const filteredEdges = [];
+            const typeCounts = [0, 0, 0];
+            for (let i = 0; i < allEdges.length; i++) {
+                const e = allEdges[i];
+                const style = edgeStyles[e[2]];
+                if (edgeFilters[style.depType] && visibleMask[e[0]] && visibleMask[e[1]]) {
+                    filteredEdges.push({ from: allNodes[e[0]].id, to: allNodes[e[1]].id, ...style });
+                    typeCounts[e[2]]++;
+                }
+            }
+            edges.clear();
+            edges.add(filteredEdges);
 
-        # 预计算被依赖数
-        for pkg in nodes_to_show:
-            rdep_counts[pkg] = len(
-                [p for p in self.graph.get_reverse_dependencies(pkg) if p in nodes_to_show]
-            )
+            document.getElementById('edge-count').textContent = filteredEdges.length;
+            document.getElementById('runtime-count').textContent = typeCounts[0];
+            document.getElementById('build-count').textContent = typeCounts[1];
+            document.getElementById('check-count').textContent = typeCounts[2];
+        }
 
-        # 找出 root_pkg 用于高亮
-        root_pkg = filters.get("root_pkg")
+        document.getElementById('filter-runtime').addEventListener('change', function() { edgeFilters.runtime = this.checked; updateEdges(); });
+        document.getElementById('filter-build').addEventListener('change', function() { edgeFilters.build = this.checked; updateEdges(); });
+        document.getElementById('filter-check').addEventListener('change', function() { edgeFilters.check = this.checked; updateEdges(); });
 
-        for node in nodes_to_show:
-            pkg_info = self.graph.packages.get(node)
-            repo = pkg_info.repo if pkg_info else "unknown"
-            rdep_count = rdep_counts.get(node, 0)
+        updateEdges();
 
-            # 根据节点重要性调整大小
-            if node == root_pkg:
-                size = 35
-                font_size = 14
-            elif rdep_count > 100:
-                size = 30
-                font_size = 12
-            elif rdep_count > 20:
-                size = 25
-                font_size = 11
-            else:
-                size = int(max(8, min(5 + rdep_count / 5, 20)))
-                font_size = 9
+        network.on('click', params => {
+            if (params.nodes.length > 0) {
+                const nodeId = params.nodes[0];
+                const node = nodes.get(nodeId);
+                const stats = nodeStats[nodeIndex.get(nodeId)];
+                let html = node?.title || `<p><strong>$${nodeId}</strong></p>`;
+                if (stats) {
+                    html += `<p style="margin-top:8px;color:#888;">Dependencies: $${stats[1]}<br>Reverse deps: $${stats[2]}</p>`;
+                }
+                document.getElementById('info').innerHTML = html;
+            }
+        });
 
-            node_data = {
-                "id": node,
-                "label": node,
-                "color": self.REPO_COLORS.get(repo, self.REPO_COLORS["unknown"]),
-                "size": size,
-                "font": {"size": font_size},
-            }
-
-            if pkg_info:
-                node_data["title"] = self._make_tooltip(pkg_info)
-
-            nodes_data.append(node_data)
-
-        # 构建边数据
-        if show_all_types:
-            edges_data = self._collect_all_type_edges(nodes_to_show)
-        else:
-            edges_data = self._collect_single_type_edges(nodes_to_show, dep_type)
-
-        # 生成 HTML
-        html_content = self._generate_filtered_graph_html(
-            nodes_data,
-            edges_data,
-            title,
-            root_pkg=root_pkg,
-            show_all_types=show_all_types,
-            filters=filters,
-        )
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-    def _apply_filters(self, filters: dict[str, Any], dep_type: DependencyType) -> set:
-        """应用过滤器，返回要显示的节点集合"""
-        root_pkg = filters.get("root_pkg")
-        min_rdeps = filters.get("min_rdeps", 0)
-        min_deps = filters.get("min_deps", 0)
-        no_orphans = filters.get("no_orphans", False)
-        repo_filter = filters.get("repo")
-
-        # 如果指定了 root_pkg，只获取其依赖子树
-        if root_pkg:
-            nodes = self._get_subtree(root_pkg, dep_type)
-        else:
-            nodes = set(self.graph.packages.keys())
-
-        # 应用仓库过滤
-        if repo_filter:
-            nodes = {
-                pkg
-                for pkg in nodes
-                if self.graph.packages.get(pkg) and self.graph.packages[pkg].repo == repo_filter
-            }
-
-        # 应用被依赖数过滤
-        if min_rdeps > 0:
-            nodes = {
-                pkg for pkg in nodes if len(self.graph.get_reverse_dependencies(pkg)) >= min_rdeps
-            }
-
-        # 应用依赖数过滤
-        if min_deps > 0:
-            nodes = {
-                pkg
-                for pkg in nodes
-                if len(self.graph.get_dependencies(pkg, dep_type=dep_type)) >= min_deps
-            }
+        const searchBox = document.getElementById('search-box');
+        // 节点 ID 预先转为小写，按键时不再逐个转换
+        const lowerIds = allNodes.map(n => n.id.toLowerCase());
+        let searchTimer = null;
+        searchBox.addEventListener('input', e => {
+            // 防抖：停止输入 150ms 后才扫描一次，找到 10 个匹配即停止
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                const q = e.target.value.toLowerCase();
+                if (q.length < 2) return;
+                const matches = [];
+                for (let i = 0; i < lowerIds.length && matches.length < 10; i++) {
+                    if (visibleMask[i] && lowerIds[i].includes(q)) matches.push(allNodes[i].id);
+                }
+                if (matches.length > 0) {
+                    network.selectNodes(matches);
+                }
+            }, 150);
+        });
 
-        # 过滤孤立包
-        if no_orphans:
-            nodes = {
-                pkg
-                for pkg in nodes
-                if (
-                    len(self.graph.get_dependencies(pkg, dep_type=dep_type)) > 0
-                    or len(self.graph.get_reverse_dependencies(pkg, dep_type=dep_type)) > 0
-                )
+        searchBox.addEventListener('keydown', e => {
+            if (e.key === 'Enter') {
+                const q = e.target.value.toLowerCase();
+                const idx = lowerIds.indexOf(q);
+                if (idx >= 0) {
+                    const match = allNodes[idx];
+                    if (!visibleMask[idx]) {
+                        // 自动显示该节点
+                        nodes.update({ id: match.id, hidden: false });
+                        visibleMask[idx] = 1;
+                    }
+                    network.selectNodes([match.id]);
+                    network.focus(match.id, { scale: 2, animation: true });
+                    const stats = nodeStats[idx];
+                    let html = match.title || `<p><strong>$${match.id}</strong></p>`;
+                    if (stats) {
+                        html += `<p style="margin-top:8px;color:#888;">Dependencies: $${stats[1]}<br>Reverse deps: $${stats[2]}</p>`;
+                    }
+                    document.getElementById('info').innerHTML = html;
+                }
             }
+        });
 
-        return nodes
-
-    def _get_subtree(self, root_pkg: str, dep_type: DependencyType, max_depth: int = 100) -> set:
-        """获取指定包的依赖子树（包含所有向下的依赖）"""
-        nodes = {root_pkg}
-
-        def collect_deps(pkg: str, depth: int, visited: set):
-            if depth > max_depth or pkg in visited:
-                return
-            visited.add(pkg)
-
-            pkg_info = self.graph.packages.get(pkg)
-            if not pkg_info:
-                return
-
-            # 根据类型获取依赖
-            if dep_type == DependencyType.RUNTIME:
-                deps = pkg_info.depends
-            elif dep_type == DependencyType.BUILD:
-                deps = list(pkg_info.build_depends)
-            else:
-                deps = list(pkg_info.all_depends)
-
-            for dep in deps:
-                if dep in self.graph.packages:
-                    nodes.add(dep)
-                    collect_deps(dep, depth + 1, visited.copy())
-
-        collect_deps(root_pkg, 0, set())
-        return nodes
-
-    def _generate_filtered_graph_html(
-        self,
-        nodes: list[dict],
-        edges: list[dict],
-        title: str,
-        root_pkg: str | None = None,
-        show_all_types: bool = False,
-        filters: dict[str, Any] | None = None,
-    ) -> str:
-        """生成带高级过滤器的 HTML"""
-        filters = filters or {}
-        filter_info = []
-        if filters.get("root_pkg"):
-            filter_info.append(f"Root: {filters['root_pkg']}")
-        if filters.get("min_rdeps"):
-            filter_info.append(f"Min rdeps: {filters['min_rdeps']}")
-        if filters.get("min_deps"):
-            filter_info.append(f"Min deps: {filters['min_deps']}")
-        if filters.get("no_orphans"):
-            filter_info.append("No orphans")
-        if filters.get("repo"):
-            filter_info.append(f"Repo: {filters['repo']}")
-
-        filter_text = " | ".join(filter_info) if filter_info else "None"
+        // 支持输入框回车应用过滤器
+        ['filter-root', 'filter-min-rdeps', 'filter-min-deps'].forEach(id => {
+            document.getElementById(id).addEventListener('keydown', e => {
+                if (e.key === 'Enter') applyNodeFilters();
+            });
+        });
+        document.getElementById('filter-repo').addEventListener('change', applyNodeFilters);
+        document.getElementById('filter-no-orphans').addEventListener('change', applyNodeFilters);
 
-        return f"""<!DOCTYPE html>
+        function togglePhysics() {
+            physicsEnabled = !physicsEnabled;
+            network.setOptions({ physics: { enabled: physicsEnabled } });
+        }
+    </script>
+</body>
+</html>""",
+    payloads=(
+        "nodes_json",
+        "edge_styles_json",
+        "edges_json",
+        "repo_names_json",
+        "repo_colors_json",
+        "stats_json",
+        "deps_index_json",
+    ),
+)
+
+
+# 单包依赖图模板（带依赖类型过滤器，string.Template 语法）
+_FILTERABLE_TEMPLATE = _StreamTemplate(
+    r"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
-    <title>{title}</title>
+    <title>${title}</title>
     <script src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
             background: #1a1a2e;
             color: #eee;
-        }}
-        #header {{
+        }
+        #header {
             background: #16213e;
-            padding: 10px 20px;
+            padding: 12px 20px;
             border-bottom: 1px solid #0f3460;
             display: flex;
             justify-content: space-between;
             align-items: center;
-            flex-wrap: wrap;
-            gap: 10px;
-        }}
-        #header h1 {{ font-size: 1.2rem; font-weight: 500; }}
-        #filter-info {{ font-size: 0.8rem; color: #888; }}
-        #filter-controls {{
+        }
+        #header h1 {
+            font-size: 1.3rem;
+            font-weight: 500;
+        }
+        #filter-controls {
             display: flex;
-            gap: 12px;
+            gap: 15px;
             align-items: center;
-        }}
-        .filter-group {{
+        }
+        .filter-group {
             display: flex;
             align-items: center;
-            gap: 6px;
-        }}
-        .filter-group label {{
+            gap: 8px;
+        }
+        .filter-group label {
             display: flex;
             align-items: center;
-            gap: 4px;
+            gap: 5px;
             cursor: pointer;
-            padding: 4px 8px;
+            padding: 5px 10px;
             border-radius: 4px;
-            font-size: 0.85rem;
-        }}
-        .filter-group label:hover {{ background: rgba(255,255,255,0.1); }}
-        .dep-indicator {{ display: inline-block; width: 18px; height: 3px; }}
-        .dep-runtime {{ background: #4CAF50; }}
-        .dep-build {{ background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 4px, transparent 4px, transparent 8px); }}
-        .dep-check {{ background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px); }}
-        #container {{ display: flex; height: calc(100vh - 55px); }}
-        #network {{ flex: 1; background: #1a1a2e; }}
-        #sidebar {{
+            transition: background 0.2s;
+        }
+        .filter-group label:hover {
+            background: rgba(255,255,255,0.1);
+        }
+        .filter-group input[type="checkbox"] {
+            width: 16px;
+            height: 16px;
+            cursor: pointer;
+        }
+        .dep-indicator {
+            display: inline-block;
+            width: 20px;
+            height: 3px;
+            margin-right: 5px;
+        }
+        .dep-runtime { background: #4CAF50; }
+        .dep-build { background: #2196F3; background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 5px, transparent 5px, transparent 10px); }
+        .dep-check { background: #FF9800; background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px); }
+        #container {
+            display: flex;
+            height: calc(100vh - 55px);
+        }
+        #network {
+            flex: 1;
+            background: #1a1a2e;
+        }
+        #sidebar {
             width: 280px;
             background: #16213e;
             padding: 15px;
             overflow-y: auto;
             border-left: 1px solid #0f3460;
-        }}
-        #sidebar h3 {{ margin-bottom: 8px; color: #e94560; font-size: 0.95rem; }}
-        #search-box {{
+        }
+        #sidebar h3 {
+            margin-bottom: 10px;
+            color: #e94560;
+            font-size: 1rem;
+        }
+        #search-box {
             width: 100%;
             padding: 8px;
-            margin-bottom: 12px;
+            margin-bottom: 15px;
             background: #1a1a2e;
             border: 1px solid #0f3460;
             color: #eee;
             border-radius: 4px;
-        }}
-        #search-box:focus {{ outline: none; border-color: #e94560; }}
-        #info {{ font-size: 0.82rem; line-height: 1.4; }}
-        .legend {{ margin-top: 12px; padding-top: 12px; border-top: 1px solid #0f3460; }}
-        .legend-item {{ display: flex; align-items: center; margin: 5px 0; font-size: 0.8rem; }}
-        .legend-color {{ width: 12px; height: 12px; border-radius: 50%; margin-right: 6px; }}
-        .legend-line {{ width: 25px; height: 3px; margin-right: 6px; }}
-        #stats {{ margin-top: 12px; padding-top: 12px; border-top: 1px solid #0f3460; font-size: 0.8rem; }}
-        #stats p {{ margin: 4px 0; color: #888; }}
-        #stats span {{ color: #eee; }}
-        .btn-group {{ margin-top: 12px; }}
-        button {{
+        }
+        #search-box:focus {
+            outline: none;
+            border-color: #e94560;
+        }
+        #info {
+            font-size: 0.85rem;
+            line-height: 1.5;
+        }
+        #info p {
+            margin: 6px 0;
+        }
+        #info .label {
+            color: #888;
+        }
+        #legend {
+            margin-top: 15px;
+            padding-top: 15px;
+            border-top: 1px solid #0f3460;
+        }
+        .legend-item {
+            display: flex;
+            align-items: center;
+            margin: 8px 0;
+            font-size: 0.85rem;
+        }
+        .legend-color {
+            width: 14px;
+            height: 14px;
+            border-radius: 50%;
+            margin-right: 8px;
+        }
+        .legend-line {
+            width: 30px;
+            height: 3px;
+            margin-right: 8px;
+        }
+        #stats {
+            margin-top: 15px;
+            padding-top: 15px;
+            border-top: 1px solid #0f3460;
+            font-size: 0.85rem;
+        }
+        #stats p {
+            margin: 5px 0;
+            color: #888;
+        }
+        #stats span {
+            color: #eee;
+        }
+        button {
             background: #e94560;
             color: white;
             border: none;
-            padding: 6px 10px;
+            padding: 8px 14px;
             cursor: pointer;
             border-radius: 4px;
-            font-size: 0.8rem;
-            margin: 3px;
-        }}
-        button:hover {{ background: #ff6b6b; }}
-        button.secondary {{ background: #0f3460; }}
-        button.secondary:hover {{ background: #16213e; }}
-        #loading {{
-            position: fixed;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            background: rgba(22, 33, 62, 0.95);
-            padding: 25px 40px;
-            border-radius: 8px;
-            text-align: center;
-            z-index: 1000;
-        }}
-        #loading.hidden {{ display: none; }}
-        .spinner {{
-            border: 3px solid #0f3460;
-            border-top: 3px solid #e94560;
-            border-radius: 50%;
-            width: 35px;
-            height: 35px;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 12px;
-        }}
-        @keyframes spin {{ 0% {{ transform: rotate(0deg); }} 100% {{ transform: rotate(360deg); }} }}
+            font-size: 0.85rem;
+            margin: 4px 4px 4px 0;
+        }
+        button:hover {
+            background: #ff6b6b;
+        }
     </style>
 </head>
 <body>
     <div id="header">
-        <div>
-            <h1>{title}</h1>
-            <div id="filter-info">Filters: {filter_text}</div>
-        </div>
+        <h1>${title}</h1>
         <div id="filter-controls">
-            <span style="color: #888; font-size: 0.85rem;">Show:</span>
+            <span style="color: #888;">Filter:</span>
             <div class="filter-group">
                 <label>
                     <input type="checkbox" id="filter-runtime" checked>
-                    <span class="dep-indicator dep-runtime"></span>Runtime
+                    <span class="dep-indicator dep-runtime"></span>
+                    Runtime
                 </label>
                 <label>
                     <input type="checkbox" id="filter-build">
-                    <span class="dep-indicator dep-build"></span>Build
+                    <span class="dep-indicator dep-build"></span>
+                    Build
                 </label>
                 <label>
                     <input type="checkbox" id="filter-check">
-                    <span class="dep-indicator dep-check"></span>Check
+                    <span class="dep-indicator dep-check"></span>
+                    Check
                 </label>
             </div>
         </div>
@@ -1015,457 +873,608 @@ class Visualizer:
             <input type="text" id="search-box" placeholder="Type package name...">
 
             <h3>📦 Package Info</h3>
-            <div id="info"><p><em>Click a node to see details</em></p></div>
-
-            <div class="legend">
-                <h3>Legend</h3>
-                <p style="font-size: 0.75rem; color: #666; margin-bottom: 6px;">Nodes (repo):</p>
-                <div class="legend-item"><div class="legend-color" style="background: #4CAF50;"></div>main</div>
-                <div class="legend-item"><div class="legend-color" style="background: #2196F3;"></div>community</div>
-                <div class="legend-item"><div class="legend-color" style="background: #FF9800;"></div>testing</div>
-                <p style="font-size: 0.75rem; color: #666; margin: 8px 0 6px;">Edges (type):</p>
-                <div class="legend-item"><div class="legend-line" style="background: #4CAF50;"></div>Runtime</div>
-                <div class="legend-item"><div class="legend-line" style="background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 4px, transparent 4px, transparent 8px);"></div>Build</div>
-                <div class="legend-item"><div class="legend-line" style="background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px);"></div>Check</div>
-            </div>
-
-            <div id="stats">
-                <h3>📈 Statistics</h3>
-                <p>Nodes: <span id="node-count">{len(nodes)}</span></p>
-                <p>Visible edges: <span id="edge-count">0</span></p>
-                <p>Runtime: <span id="runtime-count">0</span></p>
-                <p>Build: <span id="build-count">0</span></p>
-                <p>Check: <span id="check-count">0</span></p>
+            <div id="info">
+                <p><em>Click on a node to see details</em></p>
             </div>
 
-            <div class="btn-group">
-                <button onclick="network.fit()">Fit View</button>
-                {"<button onclick='focusRoot()'>Go to Root</button>" if root_pkg else ""}
-                <button onclick="togglePhysics()" class="secondary">Toggle Physics</button>
+            <div id="legend">
+                <h3>📊 Legend</h3>
+                <p style="font-size: 0.8rem; color: #888; margin-bottom: 8px;">Node (by repo):</p>
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #4CAF50;"></div>
+                    <span>main</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #2196F3;"></div>
+                    <span>community</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #FF9800;"></div>
+                    <span>testing</span>
+                </div>
+                <p style="font-size: 0.8rem; color: #888; margin: 12px 0 8px;">Edge (by dep type):</p>
+                <div class="legend-item">
+                    <div class="legend-line" style="background: #4CAF50;"></div>
+                    <span>Runtime (solid)</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-line" style="background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 5px, transparent 5px, transparent 10px);"></div>
+                    <span>Build (dashed)</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-line" style="background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px);"></div>
+                    <span>Check (dotted)</span>
+                </div>
+            </div>
+
+            <div id="stats">
+                <h3>📈 Statistics</h3>
+                <p>Nodes: <span id="node-count">0</span></p>
+                <p>Edges: <span id="edge-count">0</span></p>
+                <p>Runtime: <span id="runtime-count">0</span></p>
+                <p>Build: <span id="build-count">0</span></p>
+                <p>Check: <span id="check-count">0</span></p>
+            </div>
+
+            <div style="margin-top: 15px; padding-top: 15px; border-top: 1px solid #0f3460;">
+                <button onclick="network.fit()">Fit View</button>
+                <button onclick="focusCenter()">Center</button>
             </div>
         </div>
     </div>
-    <div id="loading">
-        <div class="spinner"></div>
-        <div>Loading {len(nodes)} nodes...</div>
-    </div>
+
     <script>
-        const allNodes = {json.dumps(nodes, ensure_ascii=False)};
-        const allEdges = {json.dumps(edges, ensure_ascii=False)};
-        const rootPkg = {"'" + root_pkg + "'" if root_pkg else "null"};
+        // 原始数据（节点颜色以调色板下标 c 传输；提示信息以
+        // t = [版本, 仓库, 描述摘要, 依赖数] 传输，加载时还原为 HTML）
+        const palette = ${palette_json};
+        const allNodes = ${nodes_json};
+        function makeTooltip(id, version, repo, description, depCount) {
+            const lines = [`<b>$${id}</b>`, `Version: $${version}`, `Repo: $${repo}`];
+            if (description) lines.push(`<br>$${description}...`);
+            if (depCount) lines.push(`<br>Dependencies: $${depCount}`);
+            return lines.join('<br>');
+        }
+        allNodes.forEach(node => {
+            node.color = palette[node.c];
+            if (node.t) node.title = makeTooltip(node.id, ...node.t);
+        });
+        // 边以 [fromIdx, toIdx, styleCode] 传输，每种样式只传一份，加载时展开为 vis.js 边
+        const edgeStyles = ${edge_styles_json};
+        const allEdges = ${edges_json}.map(([f, t, s]) => ({
+            from: allNodes[f].id, to: allNodes[t].id, ...edgeStyles[s]
+        }));
+        const centerPackage = "${package}";
 
+        // 当前显示的数据
         const nodes = new vis.DataSet(allNodes);
         const edges = new vis.DataSet([]);
 
         const container = document.getElementById('network');
-        const data = {{ nodes: nodes, edges: edges }};
+        const data = { nodes: nodes, edges: edges };
 
-        const options = {{
-            nodes: {{
+        const options = {
+            nodes: {
                 shape: 'dot',
-                font: {{ color: '#fff' }}
-            }},
-            edges: {{
-                smooth: {{ type: 'continuous', roundness: 0.2 }}
-            }},
-            physics: {{
-                barnesHut: {{
+                font: {
+                    color: '#ffffff'
+                }
+            },
+            edges: {
+                smooth: {
+                    type: 'continuous'
+                }
+            },
+            physics: {
+                barnesHut: {
                     gravitationalConstant: -3000,
-                    centralGravity: 0.2,
+                    centralGravity: 0.3,
                     springLength: 120,
                     springConstant: 0.04,
-                    damping: 0.4
-                }},
-                stabilization: {{
-                    iterations: Math.min(200, allNodes.length),
-                    updateInterval: 25
-                }}
-            }},
-            interaction: {{
+                    damping: 0.5
+                },
+                stabilization: {
+                    iterations: 150
+                }
+            },
+            interaction: {
                 hover: true,
-                tooltipDelay: 200,
-                hideEdgesOnDrag: allNodes.length > 500,
-                hideEdgesOnZoom: allNodes.length > 500
-            }}
-        }};
+                tooltipDelay: 200
+            }
+        };
 
         const network = new vis.Network(container, data, options);
-        let physicsEnabled = true;
 
-        network.on('stabilizationIterationsDone', () => {{
-            document.getElementById('loading').classList.add('hidden');
-            network.setOptions({{ physics: {{ stabilization: false }} }});
-            if (rootPkg) {{
-                network.focus(rootPkg, {{ scale: 1.2, animation: {{ duration: 500 }} }});
-                network.selectNodes([rootPkg]);
-            }}
-        }});
+        // 过滤器状态
+        let filters = {
+            runtime: true,
+            build: false,
+            check: false
+        };
+
+        // 按依赖类型预先划分边及其端点（只在加载时遍历一次 allEdges），
+        // 切换过滤器时直接拼接已启用类型的边，不再逐条过滤
+        const edgeTypes = ['runtime', 'build', 'check'];
+        const edgesByType = {};
+        const nodesByType = {};
+        edgeTypes.forEach(type => {
+            edgesByType[type] = [];
+            nodesByType[type] = new Set();
+        });
+        allEdges.forEach(edge => {
+            const type = edge.depType;
+            if (!edgesByType[type]) return;
+            edgesByType[type].push(edge);
+            nodesByType[type].add(edge.from);
+            nodesByType[type].add(edge.to);
+        });
+
+        // 当前隐藏的节点，只有可见性发生变化的节点才需要更新
+        const hiddenNodes = new Set();
 
-        let filters = {{ runtime: true, build: false, check: false }};
+        // 更新显示的边
+        function updateEdges() {
+            const enabledTypes = edgeTypes.filter(type => filters[type]);
+            const filteredEdges = enabledTypes.flatMap(type => edgesByType[type]);
+
+            // 找出需要显示的节点
+            const connectedNodes = new Set([centerPackage]);
+            enabledTypes.forEach(type => {
+                nodesByType[type].forEach(id => connectedNodes.add(id));
+            });
+
+            // 更新节点可见性（收集后一次批量更新）
+            const updates = [];
+            allNodes.forEach(node => {
+                const hidden = !connectedNodes.has(node.id);
+                if (hidden !== hiddenNodes.has(node.id)) {
+                    if (hidden) hiddenNodes.add(node.id);
+                    else hiddenNodes.delete(node.id);
+                    updates.push({ id: node.id, hidden });
+                }
+            });
+            if (updates.length > 0) nodes.update(updates);
 
-        function updateEdges() {{
-            const filtered = allEdges.filter(e => filters[e.depType]);
+            // 更新边
             edges.clear();
-            edges.add(filtered);
+            edges.add(filteredEdges);
 
-            document.getElementById('edge-count').textContent = filtered.length;
-            document.getElementById('runtime-count').textContent = filtered.filter(e => e.depType === 'runtime').length;
-            document.getElementById('build-count').textContent = filtered.filter(e => e.depType === 'build').length;
-            document.getElementById('check-count').textContent = filtered.filter(e => e.depType === 'check').length;
-        }}
+            // 更新统计
+            updateStats(filteredEdges);
+        }
+
+        function updateStats(filteredEdges) {
+            document.getElementById('node-count').textContent = allNodes.length - hiddenNodes.size;
+            document.getElementById('edge-count').textContent = filteredEdges.length;
+            document.getElementById('runtime-count').textContent =
+                filters.runtime ? edgesByType.runtime.length : 0;
+            document.getElementById('build-count').textContent =
+                filters.build ? edgesByType.build.length : 0;
+            document.getElementById('check-count').textContent =
+                filters.check ? edgesByType.check.length : 0;
+        }
 
-        document.getElementById('filter-runtime').addEventListener('change', function() {{ filters.runtime = this.checked; updateEdges(); }});
-        document.getElementById('filter-build').addEventListener('change', function() {{ filters.build = this.checked; updateEdges(); }});
-        document.getElementById('filter-check').addEventListener('change', function() {{ filters.check = this.checked; updateEdges(); }});
+        // 过滤器事件
+        document.getElementById('filter-runtime').addEventListener('change', function() {
+            filters.runtime = this.checked;
+            updateEdges();
+        });
+        document.getElementById('filter-build').addEventListener('change', function() {
+            filters.build = this.checked;
+            updateEdges();
+        });
+        document.getElementById('filter-check').addEventListener('change', function() {
+            filters.check = this.checked;
+            updateEdges();
+        });
 
+        // 初始化显示
         updateEdges();
 
-        network.on('click', params => {{
-            if (params.nodes.length > 0) {{
-                const node = nodes.get(params.nodes[0]);
-                document.getElementById('info').innerHTML = node?.title || `<p><strong>${{params.nodes[0]}}</strong></p>`;
-            }}
-        }});
+        // 点击节点显示信息
+        network.on('click', function(params) {
+            if (params.nodes.length > 0) {
+                const nodeId = params.nodes[0];
+                const node = nodes.get(nodeId);
+                if (node && node.title) {
+                    document.getElementById('info').innerHTML = node.title;
+                } else {
+                    document.getElementById('info').innerHTML = `<p><strong>$${nodeId}</strong></p>`;
+                }
+            }
+        });
 
+        // 搜索功能：节点 ID 预先转为小写，按键时不再逐个转换
         const searchBox = document.getElementById('search-box');
-        searchBox.addEventListener('input', e => {{
-            const q = e.target.value.toLowerCase();
-            if (q.length >= 2) {{
-                const matches = allNodes.filter(n => n.id.toLowerCase().includes(q)).slice(0, 10);
-                if (matches.length > 0) {{
-                    network.selectNodes(matches.map(n => n.id));
-                    if (matches.length === 1) network.focus(matches[0].id, {{ scale: 1.5, animation: true }});
-                }}
-            }}
-        }});
-
-        searchBox.addEventListener('keydown', e => {{
-            if (e.key === 'Enter') {{
-                const match = allNodes.find(n => n.id.toLowerCase() === e.target.value.toLowerCase());
-                if (match) {{
-                    network.selectNodes([match.id]);
-                    network.focus(match.id, {{ scale: 2, animation: true }});
-                    document.getElementById('info').innerHTML = match.title || `<p><strong>${{match.id}}</strong></p>`;
-                }}
-            }}
-        }});
-
-        function focusRoot() {{
-            if (rootPkg) {{
-                network.focus(rootPkg, {{ scale: 1.5, animation: true }});
-                network.selectNodes([rootPkg]);
-            }}
-        }}
-
-        function togglePhysics() {{
-            physicsEnabled = !physicsEnabled;
-            network.setOptions({{ physics: {{ enabled: physicsEnabled }} }});
-        }}
-    </script>
-</body>
-</html>"""
-
-    def render_d3_html(
-        self,
-        package: str,
-        output_path: str,
-        dep_type: DependencyType = DependencyType.ALL,
-        max_depth: int = 3,
-        title: str | None = None,
-    ):
-        """
-        使用 D3.js 渲染为交互式 HTML 文件（力导向图）
-        """
-        # 收集节点
-        nodes_to_show = {package}
-        deps = self.graph.get_dependencies(
-            package, dep_type=dep_type, recursive=True, max_depth=max_depth
-        )
-        nodes_to_show.update(deps)
-
-        # 构建数据
-        nodes = []
-        links = []
-
-        for _i, node in enumerate(nodes_to_show):
-            pkg_info = self.graph.packages.get(node)
-            repo = pkg_info.repo if pkg_info else "unknown"
-
-            nodes.append(
-                {
-                    "id": node,
-                    "group": repo,
-                    "isCenter": node == package,
+        const lowerIds = allNodes.map(n => n.id.toLowerCase());
+        let searchTimer = null;
+        searchBox.addEventListener('input', function(e) {
+            // 防抖：停止输入 150ms 后才扫描一次
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                const query = e.target.value.toLowerCase();
+                if (query.length < 2) return;
+                const matchingNodes = allNodes.filter((n, i) =>
+                    lowerIds[i].includes(query) && !nodes.get(n.id)?.hidden
+                );
+                if (matchingNodes.length > 0 && matchingNodes.length <= 10) {
+                    network.selectNodes(matchingNodes.map(n => n.id));
+                    if (matchingNodes.length === 1) {
+                        network.focus(matchingNodes[0].id, {
+                            scale: 1.5,
+                            animation: true
+                        });
+                    }
                 }
-            )
-
-        for node in nodes_to_show:
-            for dep in self.graph.get_dependencies(node, dep_type=dep_type):
-                if dep in nodes_to_show:
-                    links.append(
-                        {
-                            "source": node,
-                            "target": dep,
-                        }
-                    )
-
-        # 生成 HTML
-        html_content = self._generate_d3_html(
-            nodes, links, title=title or f"Dependency Graph: {package}"
-        )
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-    def render_tree_html(
-        self,
-        package: str,
-        output_path: str,
-        dep_type: DependencyType = DependencyType.ALL,
-        max_depth: int = 4,
-        title: str | None = None,
-    ):
-        """
-        渲染为树形结构 HTML
-        """
-        tree_data = self.graph.get_dependency_tree(package, dep_type, max_depth)
-
-        html_content = self._generate_tree_html(
-            tree_data, title=title or f"Dependency Tree: {package}"
-        )
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-    def _make_tooltip(self, pkg: Any) -> str:
-        """生成节点提示信息"""
-        lines = [
-            f"<b>{pkg.name}</b>",
-            f"Version: {pkg.version}-r{pkg.release}",
-            f"Repo: {pkg.repo}",
-        ]
+            }, 150);
+        });
 
-        if pkg.description:
-            lines.append(f"<br>{pkg.description[:100]}...")
+        searchBox.addEventListener('keydown', function(e) {
+            if (e.key === 'Enter') {
+                const query = e.target.value.toLowerCase();
+                const exactMatch = allNodes[lowerIds.indexOf(query)];
+                if (exactMatch && !nodes.get(exactMatch.id)?.hidden) {
+                    network.selectNodes([exactMatch.id]);
+                    network.focus(exactMatch.id, {
+                        scale: 2,
+                        animation: true
+                    });
+                }
+            }
+        });
 
-        if pkg.depends:
-            lines.append(f"<br>Dependencies: {len(pkg.depends)}")
+        function focusCenter() {
+            network.focus(centerPackage, {
+                scale: 1.2,
+                animation: true
+            });
+        }
+    </script>
+</body>
+</html>""",
+    payloads=("palette_json", "nodes_json", "edge_styles_json", "edges_json"),
+)
 
-        return "<br>".join(lines)
 
-    def _generate_visjs_html(self, nodes: list[dict], edges: list[dict], title: str) -> str:
-        """生成 vis.js HTML 内容"""
-        return f"""<!DOCTYPE html>
+# 按条件过滤的依赖图模板（string.Template 语法）
+_FILTERED_GRAPH_TEMPLATE = _StreamTemplate(
+    r"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
-    <title>{title}</title>
+    <title>${title}</title>
     <script src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
     <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
             background: #1a1a2e;
             color: #eee;
-        }}
-        #header {{
+        }
+        #header {
             background: #16213e;
-            padding: 15px 20px;
+            padding: 10px 20px;
             border-bottom: 1px solid #0f3460;
-        }}
-        #header h1 {{
-            font-size: 1.5rem;
-            font-weight: 500;
-        }}
-        #container {{
             display: flex;
-            height: calc(100vh - 60px);
-        }}
-        #network {{
-            flex: 1;
-            background: #1a1a2e;
-        }}
-        #sidebar {{
-            width: 300px;
+            justify-content: space-between;
+            align-items: center;
+            flex-wrap: wrap;
+            gap: 10px;
+        }
+        #header h1 { font-size: 1.2rem; font-weight: 500; }
+        #filter-info { font-size: 0.8rem; color: #888; }
+        #filter-controls {
+            display: flex;
+            gap: 12px;
+            align-items: center;
+        }
+        .filter-group {
+            display: flex;
+            align-items: center;
+            gap: 6px;
+        }
+        .filter-group label {
+            display: flex;
+            align-items: center;
+            gap: 4px;
+            cursor: pointer;
+            padding: 4px 8px;
+            border-radius: 4px;
+            font-size: 0.85rem;
+        }
+        .filter-group label:hover { background: rgba(255,255,255,0.1); }
+        .dep-indicator { display: inline-block; width: 18px; height: 3px; }
+        .dep-runtime { background: #4CAF50; }
+        .dep-build { background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 4px, transparent 4px, transparent 8px); }
+        .dep-check { background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px); }
+        #container { display: flex; height: calc(100vh - 55px); }
+        #network { flex: 1; background: #1a1a2e; }
+        #sidebar {
+            width: 280px;
             background: #16213e;
-            padding: 20px;
+            padding: 15px;
             overflow-y: auto;
             border-left: 1px solid #0f3460;
-        }}
-        #sidebar h3 {{
-            margin-bottom: 15px;
-            color: #e94560;
-        }}
-        #info {{
-            font-size: 0.9rem;
-            line-height: 1.6;
-        }}
-        #info p {{
-            margin: 8px 0;
-        }}
-        #info .label {{
-            color: #888;
-        }}
-        #legend {{
-            margin-top: 20px;
-            padding-top: 20px;
-            border-top: 1px solid #0f3460;
-        }}
-        .legend-item {{
-            display: flex;
-            align-items: center;
-            margin: 8px 0;
-        }}
-        .legend-color {{
-            width: 16px;
-            height: 16px;
-            border-radius: 50%;
-            margin-right: 10px;
-        }}
-        #controls {{
-            margin-top: 20px;
-            padding-top: 20px;
-            border-top: 1px solid #0f3460;
-        }}
-        button {{
+        }
+        #sidebar h3 { margin-bottom: 8px; color: #e94560; font-size: 0.95rem; }
+        #search-box {
+            width: 100%;
+            padding: 8px;
+            margin-bottom: 12px;
+            background: #1a1a2e;
+            border: 1px solid #0f3460;
+            color: #eee;
+            border-radius: 4px;
+        }
+        #search-box:focus { outline: none; border-color: #e94560; }
+        #info { font-size: 0.82rem; line-height: 1.4; }
+        .legend { margin-top: 12px; padding-top: 12px; border-top: 1px solid #0f3460; }
+        .legend-item { display: flex; align-items: center; margin: 5px 0; font-size: 0.8rem; }
+        .legend-color { width: 12px; height: 12px; border-radius: 50%; margin-right: 6px; }
+        .legend-line { width: 25px; height: 3px; margin-right: 6px; }
+        #stats { margin-top: 12px; padding-top: 12px; border-top: 1px solid #0f3460; font-size: 0.8rem; }
+        #stats p { margin: 4px 0; color: #888; }
+        #stats span { color: #eee; }
+        .btn-group { margin-top: 12px; }
+        button {
             background: #e94560;
             color: white;
             border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
+            padding: 6px 10px;
             cursor: pointer;
-            margin: 5px 5px 5px 0;
-        }}
-        button:hover {{
-            background: #ff6b6b;
-        }}
-    </style>
-</head>
-<body>
+            border-radius: 4px;
+            font-size: 0.8rem;
+            margin: 3px;
+        }
+        button:hover { background: #ff6b6b; }
+        button.secondary { background: #0f3460; }
+        button.secondary:hover { background: #16213e; }
+        #loading {
+            position: fixed;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            background: rgba(22, 33, 62, 0.95);
+            padding: 25px 40px;
+            border-radius: 8px;
+            text-align: center;
+            z-index: 1000;
+        }
+        #loading.hidden { display: none; }
+        .spinner {
+            border: 3px solid #0f3460;
+            border-top: 3px solid #e94560;
+            border-radius: 50%;
+            width: 35px;
+            height: 35px;
+            animation: spin 1s linear infinite;
+            margin: 0 auto 12px;
+        }
+        @keyframes spin { 0% { transform: rotate(0deg); } 100% { transform: rotate(360deg); } }
+    </style>
+</head>
+<body>
     <div id="header">
-        <h1>{title}</h1>
+        <div>
+            <h1>${title}</h1>
+            <div id="filter-info">Filters: ${filter_text}</div>
+        </div>
+        <div id="filter-controls">
+            <span style="color: #888; font-size: 0.85rem;">Show:</span>
+            <div class="filter-group">
+                <label>
+                    <input type="checkbox" id="filter-runtime" checked>
+                    <span class="dep-indicator dep-runtime"></span>Runtime
+                </label>
+                <label>
+                    <input type="checkbox" id="filter-build">
+                    <span class="dep-indicator dep-build"></span>Build
+                </label>
+                <label>
+                    <input type="checkbox" id="filter-check">
+                    <span class="dep-indicator dep-check"></span>Check
+                </label>
+            </div>
+        </div>
     </div>
     <div id="container">
         <div id="network"></div>
         <div id="sidebar">
-            <h3>Package Info</h3>
-            <div id="info">
-                <p>Click a node to see details</p>
-            </div>
-            <div id="legend">
+            <h3>🔍 Search</h3>
+            <input type="text" id="search-box" placeholder="Type package name...">
+
+            <h3>📦 Package Info</h3>
+            <div id="info"><p><em>Click a node to see details</em></p></div>
+
+            <div class="legend">
                 <h3>Legend</h3>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #4CAF50"></div>
-                    <span>main</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #2196F3"></div>
-                    <span>community</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #FF9800"></div>
-                    <span>testing</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #9E9E9E"></div>
-                    <span>unmaintained</span>
-                </div>
+                <p style="font-size: 0.75rem; color: #666; margin-bottom: 6px;">Nodes (repo):</p>
+                <div class="legend-item"><div class="legend-color" style="background: #4CAF50;"></div>main</div>
+                <div class="legend-item"><div class="legend-color" style="background: #2196F3;"></div>community</div>
+                <div class="legend-item"><div class="legend-color" style="background: #FF9800;"></div>testing</div>
+                <p style="font-size: 0.75rem; color: #666; margin: 8px 0 6px;">Edges (type):</p>
+                <div class="legend-item"><div class="legend-line" style="background: #4CAF50;"></div>Runtime</div>
+                <div class="legend-item"><div class="legend-line" style="background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 4px, transparent 4px, transparent 8px);"></div>Build</div>
+                <div class="legend-item"><div class="legend-line" style="background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px);"></div>Check</div>
             </div>
-            <div id="controls">
-                <h3>Controls</h3>
+
+            <div id="stats">
+                <h3>📈 Statistics</h3>
+                <p>Nodes: <span id="node-count">${node_count}</span></p>
+                <p>Visible edges: <span id="edge-count">0</span></p>
+                <p>Runtime: <span id="runtime-count">0</span></p>
+                <p>Build: <span id="build-count">0</span></p>
+                <p>Check: <span id="check-count">0</span></p>
+            </div>
+
+            <div class="btn-group">
                 <button onclick="network.fit()">Fit View</button>
-                <button onclick="togglePhysics()">Toggle Physics</button>
+                ${root_button}
+                <button onclick="togglePhysics()" class="secondary">Toggle Physics</button>
             </div>
         </div>
     </div>
-
+    <div id="loading">
+        <div class="spinner"></div>
+        <div>Loading ${node_count} nodes...</div>
+    </div>
     <script>
-        const nodes = new vis.DataSet({json.dumps(nodes)});
-        const edges = new vis.DataSet({json.dumps(edges)});
+        const allNodes = ${nodes_json};
+        const allEdges = ${edges_json};
+        const rootPkg = ${root_pkg_js};
+
+        const nodes = new vis.DataSet(allNodes);
+        const edges = new vis.DataSet([]);
 
         const container = document.getElementById('network');
-        const data = {{ nodes: nodes, edges: edges }};
+        const data = { nodes: nodes, edges: edges };
 
-        const options = {{
-            nodes: {{
+        const options = {
+            nodes: {
                 shape: 'dot',
-                borderWidth: 2,
-                shadow: true,
-                font: {{
-                    color: '#ffffff'
-                }}
-            }},
-            edges: {{
-                width: 1,
-                smooth: {{
-                    type: 'continuous'
-                }}
-            }},
-            physics: {{
-                enabled: true,
-                barnesHut: {{
-                    gravitationalConstant: -8000,
-                    centralGravity: 0.3,
-                    springLength: 95,
+                font: { color: '#fff' }
+            },
+            edges: {
+                smooth: { type: 'continuous', roundness: 0.2 }
+            },
+            physics: {
+                barnesHut: {
+                    gravitationalConstant: -3000,
+                    centralGravity: 0.2,
+                    springLength: 120,
                     springConstant: 0.04,
-                    damping: 0.09
-                }}
-            }},
-            interaction: {{
+                    damping: 0.4
+                },
+                stabilization: {
+                    iterations: Math.min(200, allNodes.length),
+                    updateInterval: 25
+                }
+            },
+            interaction: {
                 hover: true,
-                tooltipDelay: 200
-            }}
-        }};
+                tooltipDelay: 200,
+                hideEdgesOnDrag: allNodes.length > 500,
+                hideEdgesOnZoom: allNodes.length > 500
+            }
+        };
 
         const network = new vis.Network(container, data, options);
         let physicsEnabled = true;
 
-        function togglePhysics() {{
-            physicsEnabled = !physicsEnabled;
-            network.setOptions({{ physics: {{ enabled: physicsEnabled }} }});
-        }}
+        network.on('stabilizationIterationsDone', () => {
+            document.getElementById('loading').classList.add('hidden');
+            network.setOptions({ physics: { stabilization: false } });
+            if (rootPkg) {
+                network.focus(rootPkg, { scale: 1.2, animation: { duration: 500 } });
+                network.selectNodes([rootPkg]);
+            }
+        });
+
+        let filters = { runtime: true, build: false, check: false };
+
+        function updateEdges() {
+            // 过滤与各类型计数在同一趟循环中完成
+            const filtered = [];
+            const counts = { runtime: 0, build: 0, check: 0 };
+            for (let i = 0; i < allEdges.length; i++) {
+                const e = allEdges[i];
+                if (filters[e.depType]) {
+                    filtered.push(e);
+                    counts[e.depType]++;
+                }
+            }
+            edges.clear();
+            edges.add(filtered);
 
-        network.on('click', function(params) {{
-            if (params.nodes.length > 0) {{
-                const nodeId = params.nodes[0];
-                const node = nodes.get(nodeId);
+            document.getElementById('edge-count').textContent = filtered.length;
+            document.getElementById('runtime-count').textContent = counts.runtime;
+            document.getElementById('build-count').textContent = counts.build;
+            document.getElementById('check-count').textContent = counts.check;
+        }
 
-                let html = '<p><span class="label">Name:</span> ' + nodeId + '</p>';
-                if (node.title) {{
-                    html += '<p>' + node.title + '</p>';
-                }}
+        document.getElementById('filter-runtime').addEventListener('change', function() { filters.runtime = this.checked; updateEdges(); });
+        document.getElementById('filter-build').addEventListener('change', function() { filters.build = this.checked; updateEdges(); });
+        document.getElementById('filter-check').addEventListener('change', function() { filters.check = this.checked; updateEdges(); });
 
-                document.getElementById('info').innerHTML = html;
-            }}
-        }});
+        updateEdges();
+
+        network.on('click', params => {
+            if (params.nodes.length > 0) {
+                const node = nodes.get(params.nodes[0]);
+                document.getElementById('info').innerHTML = node?.title || `<p><strong>$${params.nodes[0]}</strong></p>`;
+            }
+        });
+
+        const searchBox = document.getElementById('search-box');
+        // 节点 ID 预先转为小写，按键时不再逐个转换
+        const lowerIds = allNodes.map(n => n.id.toLowerCase());
+        let searchTimer = null;
+        searchBox.addEventListener('input', e => {
+            // 防抖：停止输入 150ms 后才扫描一次，找到 10 个匹配即停止
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                const q = e.target.value.toLowerCase();
+                if (q.length < 2) return;
+                const matches = [];
+                for (let i = 0; i < lowerIds.length && matches.length < 10; i++) {
+                    if (lowerIds[i].includes(q)) matches.push(allNodes[i]);
+                }
+                if (matches.length > 0) {
+                    network.selectNodes(matches.map(n => n.id));
+                    if (matches.length === 1) network.focus(matches[0].id, { scale: 1.5, animation: true });
+                }
+            }, 150);
+        });
+
+        searchBox.addEventListener('keydown', e => {
+            if (e.key === 'Enter') {
+                const match = allNodes[lowerIds.indexOf(e.target.value.toLowerCase())];
+                if (match) {
+                    network.selectNodes([match.id]);
+                    network.focus(match.id, { scale: 2, animation: true });
+                    document.getElementById('info').innerHTML = match.title || `<p><strong>$${match.id}</strong></p>`;
+                }
+            }
+        });
+
+        function focusRoot() {
+            if (rootPkg) {
+                network.focus(rootPkg, { scale: 1.5, animation: true });
+                network.selectNodes([rootPkg]);
+            }
+        }
+
+        function togglePhysics() {
+            physicsEnabled = !physicsEnabled;
+            network.setOptions({ physics: { enabled: physicsEnabled } });
+        }
     </script>
 </body>
-</html>"""
+</html>""",
+    payloads=("nodes_json", "edges_json"),
+)
+
 
-    def _generate_d3_html(self, nodes: list[dict], links: list[dict], title: str) -> str:
-        """生成 D3.js HTML 内容"""
-        return f"""<!DOCTYPE html>
+# D3.js 力导向图模板（string.Template：JS 模板字符串中的 `$` 需写作 `$$`）
+_D3_TEMPLATE = _StreamTemplate(
+    r"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
-    <title>{title}</title>
+    <title>${title}</title>
     <script src="https://d3js.org/d3.v7.min.js"></script>
+    <script src="https://unpkg.com/d3-force-sampled"></script>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
-        body {{
+        }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
             background: #1a1a2e;
             overflow: hidden;
-        }}
-        #header {{
+        }
+        #header {
             position: fixed;
             top: 0;
             left: 0;
@@ -1474,34 +1483,18 @@ class Visualizer:
             padding: 15px 20px;
             z-index: 100;
             border-bottom: 1px solid #0f3460;
-        }}
-        #header h1 {{
+        }
+        #header h1 {
             color: #fff;
             font-size: 1.5rem;
             font-weight: 500;
-        }}
-        svg {{
+        }
+        canvas {
+            display: block;
             width: 100vw;
             height: 100vh;
-        }}
-        .node {{
-            cursor: pointer;
-        }}
-        .node circle {{
-            stroke: #fff;
-            stroke-width: 2px;
-        }}
-        .node text {{
-            fill: #fff;
-            font-size: 10px;
-            pointer-events: none;
-        }}
-        .link {{
-            stroke: #555;
-            stroke-opacity: 0.6;
-            fill: none;
-        }}
-        .tooltip {{
+        }
+        .tooltip {
             position: absolute;
             background: rgba(0, 0, 0, 0.8);
             color: #fff;
@@ -1510,187 +1503,361 @@ class Visualizer:
             font-size: 12px;
             pointer-events: none;
             z-index: 1000;
-        }}
+        }
     </style>
 </head>
 <body>
     <div id="header">
-        <h1>{title}</h1>
+        <h1>${title}</h1>
     </div>
     <div id="tooltip" class="tooltip" style="display: none;"></div>
 
     <script>
-        const data = {{
-            nodes: {json.dumps(nodes)},
-            links: {json.dumps(links)}
-        }};
+        const data = {
+            nodes: ${nodes_json},
+            links: ${links_json}
+        };
 
-        const colors = {{
+        const colors = {
             'main': '#4CAF50',
             'community': '#2196F3',
             'testing': '#FF9800',
             'unmaintained': '#9E9E9E',
             'unknown': '#E0E0E0'
-        }};
+        };
 
         const width = window.innerWidth;
         const height = window.innerHeight;
 
-        const svg = d3.select('body')
-            .append('svg')
-            .attr('viewBox', [0, 0, width, height]);
-
-        // 添加箭头标记
-        svg.append('defs').append('marker')
-            .attr('id', 'arrowhead')
-            .attr('viewBox', '-0 -5 10 10')
-            .attr('refX', 20)
-            .attr('refY', 0)
-            .attr('orient', 'auto')
-            .attr('markerWidth', 6)
-            .attr('markerHeight', 6)
-            .append('path')
-            .attr('d', 'M 0,-5 L 10,0 L 0,5')
-            .attr('fill', '#555');
-
-        const simulation = d3.forceSimulation(data.nodes)
-            .force('link', d3.forceLink(data.links).id(d => d.id).distance(80))
-            .force('charge', d3.forceManyBody().strength(-300))
-            .force('center', d3.forceCenter(width / 2, height / 2))
-            .force('collision', d3.forceCollide().radius(30));
-
-        const link = svg.append('g')
-            .selectAll('line')
-            .data(data.links)
-            .join('line')
-            .attr('class', 'link')
-            .attr('marker-end', 'url(#arrowhead)');
+        // 所有节点和边绘制在同一个 canvas 上，不为每个节点创建 DOM 元素
+        const dpr = window.devicePixelRatio || 1;
+        const canvas = d3.select('body')
+            .append('canvas')
+            .attr('width', width * dpr)
+            .attr('height', height * dpr)
+            .node();
+        const ctx = canvas.getContext('2d');
+        let transform = d3.zoomIdentity;
+
+        // 力导向参数只定义一次，主线程和布局 Worker 共用（Worker 中以源码注入）。
+        // 斥力优先用 d3-force-sampled 的随机顶点采样（每轮 O(n)，不必重建四叉树），
+        // 插件未能加载时退回 Barnes-Hut 的 forceManyBody
+        function applyForces(simulation, links, width, height) {
+            const manyBody = d3.forceManyBodySampled || d3.forceManyBody;
+            return simulation
+                .force('link', d3.forceLink(links).id(d => d.id).distance(80))
+                .force('charge', manyBody().strength(-300))
+                .force('center', d3.forceCenter(width / 2, height / 2))
+                .force('collision', d3.forceCollide().radius(30));
+        }
+
+        // 发给 Worker 的输入须在 forceLink 把 source/target 替换为节点对象之前取出
+        const layoutInput = {
+            nodes: data.nodes.map(d => ({ id: d.id })),
+            links: data.links.map(l => ({ source: l.source, target: l.target })),
+            width,
+            height
+        };
+        const simulation = applyForces(d3.forceSimulation(data.nodes), data.links, width, height);
+
+        const radius = d => d.isCenter ? 15 : 10;
+        // 节点按颜色分组，每种颜色只需一次 fill
+        const nodesByColor = d3.group(data.nodes, d => colors[d.group] || colors.unknown);
+        const labelFont = '10px -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif';
+
+        // 命中检测用的四叉树，坐标变化后在下次查询时重建
+        let quadtree = null;
+
+        function render() {
+            ctx.save();
+            ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+            ctx.clearRect(0, 0, width, height);
+            ctx.translate(transform.x, transform.y);
+            ctx.scale(transform.k, transform.k);
+
+            // 所有边合为一条路径，一次描边
+            ctx.beginPath();
+            for (const l of data.links) {
+                ctx.moveTo(l.source.x, l.source.y);
+                ctx.lineTo(l.target.x, l.target.y);
+            }
+            ctx.globalAlpha = 0.6;
+            ctx.strokeStyle = '#555';
+            ctx.lineWidth = 1;
+            ctx.stroke();
+            ctx.globalAlpha = 1;
+
+            // 箭头：尖端距目标节点中心 6px，底边 12px、宽 6px
+            ctx.beginPath();
+            for (const l of data.links) {
+                const dx = l.target.x - l.source.x;
+                const dy = l.target.y - l.source.y;
+                const len = Math.hypot(dx, dy) || 1;
+                const ux = dx / len;
+                const uy = dy / len;
+                const bx = l.target.x - ux * 12;
+                const by = l.target.y - uy * 12;
+                ctx.moveTo(l.target.x - ux * 6, l.target.y - uy * 6);
+                ctx.lineTo(bx - uy * 3, by + ux * 3);
+                ctx.lineTo(bx + uy * 3, by - ux * 3);
+                ctx.closePath();
+            }
+            ctx.fillStyle = '#555';
+            ctx.fill();
+
+            ctx.strokeStyle = '#fff';
+            ctx.lineWidth = 2;
+            for (const [color, group] of nodesByColor) {
+                ctx.beginPath();
+                for (const d of group) {
+                    const r = radius(d);
+                    ctx.moveTo(d.x + r, d.y);
+                    ctx.arc(d.x, d.y, r, 0, 2 * Math.PI);
+                }
+                ctx.fillStyle = color;
+                ctx.fill();
+                ctx.stroke();
+            }
 
-        const node = svg.append('g')
-            .selectAll('g')
-            .data(data.nodes)
-            .join('g')
-            .attr('class', 'node')
-            .call(d3.drag()
-                .on('start', dragstarted)
-                .on('drag', dragged)
-                .on('end', dragended));
+            ctx.fillStyle = '#fff';
+            ctx.font = labelFont;
+            for (const d of data.nodes) {
+                ctx.fillText(d.id, d.x + 15, d.y + 4);
+            }
+            ctx.restore();
+            quadtree = null;
+        }
+
+        // 模拟迭代和缩放事件只标记需要重绘，同一帧内的多次变化合并为一次绘制
+        let renderQueued = false;
+        function scheduleRender() {
+            if (renderQueued) return;
+            renderQueued = true;
+            requestAnimationFrame(() => {
+                renderQueued = false;
+                render();
+            });
+        }
+
+        // 返回鼠标事件位置下的节点（先按缩放变换换算为图坐标）
+        function findNode(event) {
+            if (!quadtree) quadtree = d3.quadtree(data.nodes, d => d.x, d => d.y);
+            const [x, y] = transform.invert(d3.pointer(event, canvas));
+            const d = quadtree.find(x, y, 15);
+            return d && Math.hypot(d.x - x, d.y - y) <= radius(d) ? d : undefined;
+        }
 
-        node.append('circle')
-            .attr('r', d => d.isCenter ? 15 : 10)
-            .attr('fill', d => colors[d.group] || colors.unknown);
+        const tooltip = d3.select('#tooltip');
 
-        node.append('text')
-            .attr('dx', 15)
-            .attr('dy', 4)
-            .text(d => d.id);
+        d3.select(canvas)
+            .on('mousemove', (event) => {
+                const d = findNode(event);
+                canvas.style.cursor = d ? 'pointer' : '';
+                if (d) {
+                    tooltip.style('display', 'block')
+                        .html(d.id + '<br>Repo: ' + d.group)
+                        .style('left', (event.pageX + 10) + 'px')
+                        .style('top', (event.pageY - 10) + 'px');
+                } else {
+                    tooltip.style('display', 'none');
+                }
+            })
+            .on('mouseleave', () => {
+                tooltip.style('display', 'none');
+            });
+
+        // 初始布局不逐帧绘制：模拟先停下，一次迭代到收敛后只绘制最终坐标；
+        // 之后拖拽重新启动的模拟才逐帧绘制
+        simulation.stop().on('tick', () => {
+            quadtree = null;
+            scheduleRender();
+            // 拖拽结束后所有节点静止即停止，不必等 alpha 衰减到 alphaMin
+            if (simulation.alphaTarget() === 0 && isSettled(data.nodes)) simulation.stop();
+        });
+
+        // 所有节点每次迭代的位移都小于 0.1px（与 vis-network 默认的 minVelocity 相同）时视为静止
+        function isSettled(nodes) {
+            return nodes.every(d => d.vx * d.vx + d.vy * d.vy < 0.01);
+        }
+
+        // 冷却到 alphaMin 所需的迭代次数（默认参数下约 300 次）
+        function settleTicks(sim) {
+            return Math.ceil(Math.log(sim.alphaMin()) / Math.log(1 - sim.alphaDecay()));
+        }
+
+        // 逐次迭代，直到 alpha 冷却或所有节点提前静止
+        function settle(sim) {
+            const nodes = sim.nodes();
+            for (let i = settleTicks(sim); i > 0; i--) {
+                sim.tick();
+                if (isSettled(nodes)) break;
+            }
+        }
+
+        function settleLayout() {
+            settle(simulation);
+            render();
+        }
+
+        // 初始布局在 Web Worker 中计算，算完只发回一次最终坐标；
+        // Worker 不可用（如无法加载 d3）或在其算完前开始拖拽时改在主线程计算
+        const layoutWorkerSource = `
+            importScripts('https://d3js.org/d3.v7.min.js');
+            try {
+                importScripts('https://unpkg.com/d3-force-sampled');
+            } catch (e) {
+                // 采样斥力插件可选，加载失败时 applyForces 使用 forceManyBody
+            }
+            $${applyForces}
+            $${isSettled}
+            $${settleTicks}
+            $${settle}
+            onmessage = (event) => {
+                const { nodes, links, width, height } = event.data;
+                const simulation = applyForces(d3.forceSimulation(nodes), links, width, height);
+                simulation.stop();
+                settle(simulation);
+                postMessage({ alpha: simulation.alpha(), positions: nodes.map(d => [d.x, d.y]) });
+            };
+        `;
+
+        function startLayoutWorker() {
+            if (typeof Worker === 'undefined') return null;
+            try {
+                const blob = new Blob([layoutWorkerSource], { type: 'text/javascript' });
+                return new Worker(URL.createObjectURL(blob));
+            } catch (e) {
+                return null;
+            }
+        }
 
-        const tooltip = d3.select('#tooltip');
+        let layoutWorker = startLayoutWorker();
 
-        node.on('mouseover', (event, d) => {{
-            tooltip.style('display', 'block')
-                .html(d.id + '<br>Repo: ' + d.group)
-                .style('left', (event.pageX + 10) + 'px')
-                .style('top', (event.pageY - 10) + 'px');
-        }})
-        .on('mouseout', () => {{
-            tooltip.style('display', 'none');
-        }});
-
-        simulation.on('tick', () => {{
-            link
-                .attr('x1', d => d.source.x)
-                .attr('y1', d => d.source.y)
-                .attr('x2', d => d.target.x)
-                .attr('y2', d => d.target.y);
-
-            node.attr('transform', d => `translate(${{d.x}},${{d.y}})`);
-        }});
-
-        function dragstarted(event) {{
+        function stopLayoutWorker() {
+            if (layoutWorker) {
+                layoutWorker.terminate();
+                layoutWorker = null;
+            }
+        }
+
+        if (layoutWorker) {
+            layoutWorker.onmessage = (event) => {
+                stopLayoutWorker();
+                event.data.positions.forEach(([x, y], i) => {
+                    data.nodes[i].x = x;
+                    data.nodes[i].y = y;
+                });
+                simulation.alpha(event.data.alpha);
+                render();
+            };
+            layoutWorker.onerror = () => {
+                stopLayoutWorker();
+                settleLayout();
+            };
+            layoutWorker.postMessage(layoutInput);
+        } else {
+            settleLayout();
+        }
+
+        function dragstarted(event) {
+            if (layoutWorker) {
+                stopLayoutWorker();
+                settleLayout();
+            }
             if (!event.active) simulation.alphaTarget(0.3).restart();
             event.subject.fx = event.subject.x;
             event.subject.fy = event.subject.y;
-        }}
+        }
 
-        function dragged(event) {{
-            event.subject.fx = event.x;
-            event.subject.fy = event.y;
-        }}
+        function dragged(event) {
+            const [x, y] = transform.invert(d3.pointer(event, canvas));
+            event.subject.fx = x;
+            event.subject.fy = y;
+        }
 
-        function dragended(event) {{
+        function dragended(event) {
             if (!event.active) simulation.alphaTarget(0);
             event.subject.fx = null;
             event.subject.fy = null;
-        }}
+        }
 
-        // 缩放
+        // 拖拽只在按下节点时开始，否则交给缩放平移
         const zoom = d3.zoom()
             .scaleExtent([0.1, 10])
-            .on('zoom', (event) => {{
-                svg.selectAll('g').attr('transform', event.transform);
-            }});
+            .on('zoom', (event) => {
+                transform = event.transform;
+                scheduleRender();
+            });
 
-        svg.call(zoom);
+        d3.select(canvas)
+            .call(d3.drag()
+                .subject(findNode)
+                .on('start', dragstarted)
+                .on('drag', dragged)
+                .on('end', dragended))
+            .call(zoom);
     </script>
 </body>
-</html>"""
+</html>""",
+    payloads=("nodes_json", "links_json"),
+)
+
 
-    def _generate_tree_html(self, tree_data: dict, title: str) -> str:
-        """生成树形结构 HTML 内容"""
-        return f"""<!DOCTYPE html>
+# 树形结构模板（string.Template：JS 模板字符串中的 `$` 需写作 `$$`）
+_TREE_TEMPLATE = _StreamTemplate(
+    r"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
-    <title>{title}</title>
+    <title>${title}</title>
     <script src="https://d3js.org/d3.v7.min.js"></script>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
-        body {{
+        }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
             background: #1a1a2e;
             color: #fff;
             padding: 20px;
-        }}
-        h1 {{
+        }
+        h1 {
             margin-bottom: 20px;
             font-weight: 500;
-        }}
-        #tree {{
+        }
+        #tree {
             overflow: auto;
-        }}
-        .node circle {{
+        }
+        .node circle {
             fill: #4CAF50;
             stroke: #fff;
             stroke-width: 2px;
-        }}
-        .node.truncated circle {{
+        }
+        .node.truncated circle {
             fill: #FF9800;
-        }}
-        .node text {{
+        }
+        .node text {
             font-size: 12px;
             fill: #fff;
-        }}
-        .link {{
+        }
+        .link {
             fill: none;
             stroke: #555;
             stroke-width: 1.5px;
-        }}
+        }
     </style>
 </head>
 <body>
-    <h1>{title}</h1>
+    <h1>${title}</h1>
     <div id="tree"></div>
 
     <script>
-        const treeData = {json.dumps(tree_data)};
+        const treeData = ${tree_json};
 
         const width = window.innerWidth - 40;
-        const margin = {{ top: 20, right: 120, bottom: 20, left: 120 }};
+        const margin = { top: 20, right: 120, bottom: 20, left: 120 };
 
         const root = d3.hierarchy(treeData);
         const treeHeight = Math.max(500, root.descendants().length * 25);
@@ -1706,7 +1873,7 @@ class Visualizer:
             .attr('height', treeHeight + margin.top + margin.bottom);
 
         const g = svg.append('g')
-            .attr('transform', `translate(${{margin.left}},${{margin.top}})`);
+            .attr('transform', `translate($${margin.left},$${margin.top})`);
 
         // 连接线
         g.selectAll('.link')
@@ -1722,7 +1889,7 @@ class Visualizer:
             .data(root.descendants())
             .join('g')
             .attr('class', d => 'node' + (d.data.truncated ? ' truncated' : ''))
-            .attr('transform', d => `translate(${{d.y}},${{d.x}})`);
+            .attr('transform', d => `translate($${d.y},$${d.x})`);
 
         node.append('circle')
             .attr('r', 6);
@@ -1734,801 +1901,756 @@ class Visualizer:
             .text(d => d.data.name);
     </script>
 </body>
-</html>"""
-
-    def render_full_graph_html(
-        self,
-        output_path: str,
-        max_nodes: int = 500,
-        title: str = "Full Dependency Graph",
-        dep_type: DependencyType = DependencyType.RUNTIME,
-        show_all_types: bool = False,
-    ):
-        """
-        渲染完整的依赖图（带性能优化）
-        """
-        # 选择最重要的节点（被依赖最多的）
-        most_depended = self.graph.get_most_depended(max_nodes)
-        nodes_to_show = {pkg for pkg, _ in most_depended}
-
-        nodes_data = []
-        edges_data = []
-
-        for node in nodes_to_show:
-            pkg_info = self.graph.packages.get(node)
-            repo = pkg_info.repo if pkg_info else "unknown"
-
-            # 计算被依赖数作为节点大小
-            rdep_count = len(self.graph.get_reverse_dependencies(node))
-
-            node_data = {
-                "id": node,
-                "label": node,
-                "color": self.REPO_COLORS.get(repo, self.REPO_COLORS["unknown"]),
-                "size": min(10 + rdep_count / 5, 50),
-                "font": {"size": 10},
-            }
-
-            if pkg_info:
-                node_data["title"] = self._make_tooltip(pkg_info)
-
-            nodes_data.append(node_data)
-
-        # 添加边（根据依赖类型）
-        if show_all_types:
-            edges_data = self._collect_all_type_edges(nodes_to_show)
-        else:
-            edges_data = self._collect_single_type_edges(nodes_to_show, dep_type)
-
-        if show_all_types:
-            html_content = self._generate_filterable_overview_html(nodes_data, edges_data, title)
-        else:
-            html_content = self._generate_visjs_html(nodes_data, edges_data, title)
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-    def render_complete_graph_html(
-        self,
-        output_path: str,
-        title: str = "Complete Dependency Graph",
-        dep_type: DependencyType = DependencyType.RUNTIME,
-        show_all_types: bool = False,
-    ):
-        """
-        渲染包含所有节点的完整依赖图
-
-        使用优化的渲染方式以支持大规模图谱显示。
-        """
-        all_packages = list(self.graph.packages.keys())
-        nodes_to_show = set(all_packages)
-
-        # 收集节点数据
-        nodes_data = []
-
-        # 为了性能，预计算每个包的反向依赖数量
-        rdep_counts = {}
-        for pkg in all_packages:
-            rdep_counts[pkg] = len(self.graph.get_reverse_dependencies(pkg))
-
-        # 添加所有节点
-        for node in all_packages:
-            pkg_info = self.graph.packages.get(node)
-            repo = pkg_info.repo if pkg_info else "unknown"
-            rdep_count = rdep_counts.get(node, 0)
+</html>""",
+    payloads=("tree_json",),
+)
 
-            node_data = {
-                "id": node,
-                "label": node,
-                "color": self.REPO_COLORS.get(repo, self.REPO_COLORS["unknown"]),
-                "size": min(5 + rdep_count / 10, 40),
-                "font": {"size": 8},
-            }
 
-            if pkg_info:
-                node_data["title"] = self._make_tooltip(pkg_info)
-
-            nodes_data.append(node_data)
-
-        # 添加边（根据依赖类型）
-        if show_all_types:
-            edges_data = self._collect_all_type_edges(nodes_to_show)
-        else:
-            edges_data = self._collect_single_type_edges(nodes_to_show, dep_type)
-
-        # 使用优化的 HTML 模板
-        if show_all_types:
-            html_content = self._generate_filterable_overview_html(nodes_data, edges_data, title)
-        else:
-            html_content = self._generate_large_graph_html(nodes_data, edges_data, title)
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+# 完整依赖图（按重要性截取部分节点）的 vis.js 模板（string.Template 语法）
+_VISJS_TEMPLATE = _StreamTemplate(
+    r"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>${title}</title>
+    <script src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
+            background: #1a1a2e;
+            color: #eee;
+        }
+        #header {
+            background: #16213e;
+            padding: 15px 20px;
+            border-bottom: 1px solid #0f3460;
+        }
+        #header h1 {
+            font-size: 1.5rem;
+            font-weight: 500;
+        }
+        #container {
+            display: flex;
+            height: calc(100vh - 60px);
+        }
+        #network {
+            flex: 1;
+            background: #1a1a2e;
+        }
+        #sidebar {
+            width: 300px;
+            background: #16213e;
+            padding: 20px;
+            overflow-y: auto;
+            border-left: 1px solid #0f3460;
+        }
+        #sidebar h3 {
+            margin-bottom: 15px;
+            color: #e94560;
+        }
+        #info {
+            font-size: 0.9rem;
+            line-height: 1.6;
+        }
+        #info p {
+            margin: 8px 0;
+        }
+        #info .label {
+            color: #888;
+        }
+        #legend {
+            margin-top: 20px;
+            padding-top: 20px;
+            border-top: 1px solid #0f3460;
+        }
+        .legend-item {
+            display: flex;
+            align-items: center;
+            margin: 8px 0;
+        }
+        .legend-color {
+            width: 16px;
+            height: 16px;
+            border-radius: 50%;
+            margin-right: 10px;
+        }
+        #controls {
+            margin-top: 20px;
+            padding-top: 20px;
+            border-top: 1px solid #0f3460;
+        }
+        button {
+            background: #e94560;
+            color: white;
+            border: none;
+            padding: 8px 16px;
+            border-radius: 4px;
+            cursor: pointer;
+            margin: 5px 5px 5px 0;
+        }
+        button:hover {
+            background: #ff6b6b;
+        }
+    </style>
+</head>
+<body>
+    <div id="header">
+        <h1>${title}</h1>
+    </div>
+    <div id="container">
+        <div id="network"></div>
+        <div id="sidebar">
+            <h3>Package Info</h3>
+            <div id="info">
+                <p>Click a node to see details</p>
+            </div>
+            <div id="legend">
+                <h3>Legend</h3>
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #4CAF50"></div>
+                    <span>main</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #2196F3"></div>
+                    <span>community</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #FF9800"></div>
+                    <span>testing</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #9E9E9E"></div>
+                    <span>unmaintained</span>
+                </div>
+            </div>
+            <div id="controls">
+                <h3>Controls</h3>
+                <button onclick="network.fit()">Fit View</button>
+                <button onclick="togglePhysics()">Toggle Physics</button>
+            </div>
+        </div>
+    </div>
 
-    def _collect_single_type_edges(
-        self, nodes_to_show: set, dep_type: DependencyType
-    ) -> list[dict]:
-        """收集单一类型的边"""
-        edges_data = []
+    <script>
+        const nodes = new vis.DataSet(${nodes_json});
+        const edges = new vis.DataSet(${edges_json});
 
-        # 确定边的样式
-        if dep_type == DependencyType.RUNTIME:
-            style = self.EDGE_STYLES["runtime"]
-            edge_type = "runtime"
-        elif dep_type == DependencyType.BUILD:
-            style = self.EDGE_STYLES["build"]
-            edge_type = "build"
-        else:
-            style = {"color": "#444444", "dashes": False, "width": 1}
-            edge_type = "all"
+        const container = document.getElementById('network');
+        const data = { nodes: nodes, edges: edges };
 
-        for node in nodes_to_show:
-            pkg_info = self.graph.packages.get(node)
-            if not pkg_info:
-                continue
+        const options = {
+            nodes: {
+                shape: 'dot',
+                borderWidth: 2,
+                shadow: true,
+                font: {
+                    color: '#ffffff'
+                }
+            },
+            edges: {
+                width: 1,
+                smooth: {
+                    type: 'continuous'
+                }
+            },
+            physics: {
+                enabled: true,
+                barnesHut: {
+                    gravitationalConstant: -8000,
+                    centralGravity: 0.3,
+                    springLength: 95,
+                    springConstant: 0.04,
+                    damping: 0.09
+                },
+                // 稳定化在首次绘制前完成，不逐帧显示收敛过程
+                stabilization: { iterations: 300, fit: true }
+            },
+            interaction: {
+                hover: true,
+                tooltipDelay: 200
+            }
+        };
 
-            if dep_type == DependencyType.RUNTIME:
-                deps = pkg_info.depends
-            elif dep_type == DependencyType.BUILD:
-                deps = list(pkg_info.build_depends)
-            else:
-                deps = list(pkg_info.all_depends)
+        const network = new vis.Network(container, data, options);
+        let physicsEnabled = true;
 
-            for dep in deps:
-                if dep in nodes_to_show:
-                    edges_data.append(
-                        {
-                            "from": node,
-                            "to": dep,
-                            "arrows": "to",
-                            "color": {"color": style["color"], "opacity": 0.5},
-                            "dashes": style["dashes"],
-                            "width": style["width"],
-                            "depType": edge_type,
-                        }
-                    )
+        // 稳定化结束后关闭物理模拟，只保留最终布局（可用 togglePhysics 重新开启）
+        network.once('stabilizationIterationsDone', function() {
+            physicsEnabled = false;
+            network.setOptions({ physics: { enabled: false } });
+        });
 
-        return edges_data
+        function togglePhysics() {
+            physicsEnabled = !physicsEnabled;
+            network.setOptions({ physics: { enabled: physicsEnabled } });
+        }
 
-    def _collect_all_type_edges(self, nodes_to_show: set) -> list[dict]:
-        """收集所有类型的边"""
-        edges_data = []
-        edge_set = set()
+        network.on('click', function(params) {
+            if (params.nodes.length > 0) {
+                const nodeId = params.nodes[0];
+                const node = nodes.get(nodeId);
 
-        for node in nodes_to_show:
-            pkg_info = self.graph.packages.get(node)
-            if not pkg_info:
-                continue
+                let html = '<p><span class="label">Name:</span> ' + nodeId + '</p>';
+                if (node.title) {
+                    html += '<p>' + node.title + '</p>';
+                }
 
-            # 运行时依赖
-            for dep in pkg_info.depends:
-                if dep in nodes_to_show:
-                    edge_key = (node, dep, "runtime")
-                    if edge_key not in edge_set:
-                        edge_set.add(edge_key)
-                        style = self.EDGE_STYLES["runtime"]
-                        edges_data.append(
-                            {
-                                "from": node,
-                                "to": dep,
-                                "arrows": "to",
-                                "color": {"color": style["color"], "opacity": 0.6},
-                                "dashes": style["dashes"],
-                                "width": style["width"],
-                                "depType": "runtime",
-                            }
-                        )
-
-            # 构建依赖
-            for dep in pkg_info.build_depends:
-                if dep in nodes_to_show:
-                    edge_key = (node, dep, "build")
-                    if edge_key not in edge_set:
-                        edge_set.add(edge_key)
-                        style = self.EDGE_STYLES["build"]
-                        edges_data.append(
-                            {
-                                "from": node,
-                                "to": dep,
-                                "arrows": "to",
-                                "color": {"color": style["color"], "opacity": 0.4},
-                                "dashes": style["dashes"],
-                                "width": style["width"],
-                                "depType": "build",
-                            }
-                        )
-
-            # 检查依赖
-            for dep in pkg_info.checkdepends:
-                if dep in nodes_to_show:
-                    edge_key = (node, dep, "check")
-                    if edge_key not in edge_set:
-                        edge_set.add(edge_key)
-                        style = self.EDGE_STYLES["check"]
-                        edges_data.append(
-                            {
-                                "from": node,
-                                "to": dep,
-                                "arrows": "to",
-                                "color": {"color": style["color"], "opacity": 0.3},
-                                "dashes": style["dashes"],
-                                "width": style["width"],
-                                "depType": "check",
-                            }
-                        )
+                document.getElementById('info').innerHTML = html;
+            }
+        });
+    </script>
+</body>
+</html>""",
+    payloads=("nodes_json", "edges_json"),
+)
 
-        return edges_data
 
-    def _generate_filterable_overview_html(
-        self, nodes: list[dict], edges: list[dict], title: str
-    ) -> str:
-        """生成带高级过滤器的大规模图 HTML"""
-        # 预计算每个节点的依赖数和被依赖数，用于客户端过滤
-        node_stats = {}
-        for node in nodes:
-            pkg_id = node["id"]
-            pkg_info = self.graph.packages.get(pkg_id)
-            repo = pkg_info.repo if pkg_info else "unknown"
-            deps_count = len(self.graph.get_dependencies(pkg_id)) if pkg_info else 0
-            rdeps_count = len(self.graph.get_reverse_dependencies(pkg_id)) if pkg_info else 0
-            node_stats[pkg_id] = {"repo": repo, "deps": deps_count, "rdeps": rdeps_count}
+# 完整依赖图的外部数据脚本：数据与页面分开写出，页面先以 <script src> 加载它
+_GRAPH_DATA_SCRIPT_TEMPLATE = _StreamTemplate(
+    "window.depMapGraphData = ${graph_json};\n", payloads=("graph_json",)
+)
 
-        return f"""<!DOCTYPE html>
+# 完整依赖图（vis-network）的模板（string.Template 语法）
+_LARGE_GRAPH_TEMPLATE = _StreamTemplate(
+    r"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
-    <title>{title}</title>
+    <title>${title}</title>
     <script src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
             background: #1a1a2e;
             color: #eee;
-        }}
-        #header {{
+        }
+        #header {
             background: #16213e;
-            padding: 8px 15px;
+            padding: 10px 20px;
             border-bottom: 1px solid #0f3460;
             display: flex;
             justify-content: space-between;
             align-items: center;
-            flex-wrap: wrap;
-            gap: 8px;
-        }}
-        #header h1 {{ font-size: 1.1rem; font-weight: 500; }}
-        #filter-controls {{
-            display: flex;
-            gap: 12px;
-            align-items: center;
-            flex-wrap: wrap;
-        }}
-        .filter-group {{
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }}
-        .filter-group label {{
+        }
+        #header h1 {
+            font-size: 1.3rem;
+            font-weight: 500;
+        }
+        #stats {
+            font-size: 0.85rem;
+            color: #888;
+        }
+        #container {
             display: flex;
-            align-items: center;
-            gap: 4px;
-            cursor: pointer;
-            padding: 4px 8px;
-            border-radius: 4px;
-            font-size: 0.8rem;
-        }}
-        .filter-group label:hover {{ background: rgba(255,255,255,0.1); }}
-        .dep-indicator {{ display: inline-block; width: 18px; height: 3px; }}
-        .dep-runtime {{ background: #4CAF50; }}
-        .dep-build {{ background: repeating-linear-gradient(90deg, #2196F3 0px, #2196F3 4px, transparent 4px, transparent 8px); }}
-        .dep-check {{ background: repeating-linear-gradient(90deg, #FF9800 0px, #FF9800 2px, transparent 2px, transparent 4px); }}
-        #container {{ display: flex; height: calc(100vh - 48px); }}
-        #network {{ flex: 1; background: #1a1a2e; }}
-        #sidebar {{
-            width: 300px;
+            height: calc(100vh - 50px);
+        }
+        #network {
+            flex: 1;
+            background: #1a1a2e;
+        }
+        #sidebar {
+            width: 280px;
             background: #16213e;
-            padding: 12px;
+            padding: 15px;
             overflow-y: auto;
             border-left: 1px solid #0f3460;
-        }}
-        #sidebar h3 {{ margin: 10px 0 8px; color: #e94560; font-size: 0.9rem; }}
-        #sidebar h3:first-child {{ margin-top: 0; }}
-        .input-row {{
-            display: flex;
-            gap: 8px;
-            margin-bottom: 8px;
-        }}
-        .input-group {{
-            flex: 1;
-        }}
-        .input-group label {{
-            display: block;
-            font-size: 0.75rem;
-            color: #888;
-            margin-bottom: 3px;
-        }}
-        .input-group input, .input-group select {{
-            width: 100%;
-            padding: 6px 8px;
-            background: #1a1a2e;
-            border: 1px solid #0f3460;
-            color: #eee;
-            border-radius: 4px;
-            font-size: 0.8rem;
-        }}
-        .input-group input:focus, .input-group select:focus {{ outline: none; border-color: #e94560; }}
-        .input-group input[type="number"] {{ width: 100%; }}
-        #search-box {{
+        }
+        #sidebar h3 {
+            margin-bottom: 10px;
+            color: #e94560;
+            font-size: 1rem;
+        }
+        #search-box {
             width: 100%;
             padding: 8px;
-            margin-bottom: 8px;
+            margin-bottom: 15px;
             background: #1a1a2e;
             border: 1px solid #0f3460;
             color: #eee;
             border-radius: 4px;
-        }}
-        #search-box:focus {{ outline: none; border-color: #e94560; }}
-        #info {{ font-size: 0.78rem; line-height: 1.4; max-height: 200px; overflow-y: auto; }}
-        #stats {{ margin-top: 12px; padding-top: 12px; border-top: 1px solid #0f3460; font-size: 0.78rem; }}
-        #stats p {{ margin: 3px 0; color: #888; }}
-        #stats span {{ color: #eee; }}
-        .legend {{ margin-top: 10px; padding-top: 10px; border-top: 1px solid #0f3460; }}
-        .legend-item {{ display: flex; align-items: center; margin: 4px 0; font-size: 0.75rem; }}
-        .legend-color {{ width: 10px; height: 10px; border-radius: 50%; margin-right: 6px; }}
-        button {{
+        }
+        #search-box:focus {
+            outline: none;
+            border-color: #e94560;
+        }
+        #info {
+            font-size: 0.85rem;
+            line-height: 1.5;
+        }
+        #info p {
+            margin: 6px 0;
+        }
+        #info .label {
+            color: #888;
+        }
+        #legend {
+            margin-top: 15px;
+            padding-top: 15px;
+            border-top: 1px solid #0f3460;
+        }
+        .legend-item {
+            display: flex;
+            align-items: center;
+            margin: 6px 0;
+            font-size: 0.85rem;
+        }
+        .legend-color {
+            width: 14px;
+            height: 14px;
+            border-radius: 50%;
+            margin-right: 8px;
+        }
+        #controls {
+            margin-top: 15px;
+            padding-top: 15px;
+            border-top: 1px solid #0f3460;
+        }
+        button {
             background: #e94560;
             color: white;
             border: none;
-            padding: 5px 10px;
+            padding: 8px 14px;
             cursor: pointer;
             border-radius: 4px;
-            font-size: 0.75rem;
-            margin: 2px;
-        }}
-        button:hover {{ background: #ff6b6b; }}
-        button.secondary {{ background: #0f3460; }}
-        button.secondary:hover {{ background: #1a1a2e; }}
-        #loading {{
+            font-size: 0.85rem;
+            margin: 4px 4px 4px 0;
+        }
+        button:hover {
+            background: #ff6b6b;
+        }
+        #loading {
             position: fixed;
             top: 50%;
             left: 50%;
             transform: translate(-50%, -50%);
             background: rgba(22, 33, 62, 0.95);
-            padding: 25px 40px;
+            padding: 30px 50px;
             border-radius: 8px;
             text-align: center;
             z-index: 1000;
-        }}
-        #loading.hidden {{ display: none; }}
-        .spinner {{
+        }
+        #loading.hidden {
+            display: none;
+        }
+        .spinner {
             border: 3px solid #0f3460;
             border-top: 3px solid #e94560;
             border-radius: 50%;
-            width: 35px;
-            height: 35px;
+            width: 40px;
+            height: 40px;
             animation: spin 1s linear infinite;
-            margin: 0 auto 12px;
-        }}
-        @keyframes spin {{ 0% {{ transform: rotate(0deg); }} 100% {{ transform: rotate(360deg); }} }}
-        .checkbox-row {{
-            display: flex;
-            align-items: center;
-            gap: 15px;
-            margin: 8px 0;
-            font-size: 0.8rem;
-        }}
-        .checkbox-row label {{
-            display: flex;
-            align-items: center;
-            gap: 5px;
-            cursor: pointer;
-        }}
-        #filter-status {{
-            font-size: 0.75rem;
-            color: #4CAF50;
-            margin-top: 8px;
-            padding: 6px;
-            background: rgba(76, 175, 80, 0.1);
-            border-radius: 4px;
-            display: none;
-        }}
-        #filter-status.active {{ display: block; }}
+            margin: 0 auto 15px;
+        }
+        @keyframes spin {
+            0% { transform: rotate(0deg); }
+            100% { transform: rotate(360deg); }
+        }
     </style>
 </head>
 <body>
     <div id="header">
-        <h1>{title}</h1>
-        <div id="filter-controls">
-            <span style="color: #888; font-size: 0.8rem;">Edges:</span>
-            <div class="filter-group">
-                <label><input type="checkbox" id="filter-runtime" checked><span class="dep-indicator dep-runtime"></span>Runtime</label>
-                <label><input type="checkbox" id="filter-build"><span class="dep-indicator dep-build"></span>Build</label>
-                <label><input type="checkbox" id="filter-check"><span class="dep-indicator dep-check"></span>Check</label>
-            </div>
-        </div>
+        <h1>${title}</h1>
+        <div id="stats">Nodes: ${node_count} | Edges: ${edge_count}</div>
     </div>
     <div id="container">
         <div id="network"></div>
         <div id="sidebar">
-            <h3>🔍 Search & Focus</h3>
-            <input type="text" id="search-box" placeholder="Search package... (Enter to focus)">
+            <h3>🔍 Search</h3>
+            <input type="text" id="search-box" placeholder="Type package name...">
 
-            <h3>🎯 Node Filters</h3>
-            <div class="input-row">
-                <div class="input-group">
-                    <label>Root Package (subtree)</label>
-                    <input type="text" id="filter-root" placeholder="e.g. gcc">
-                </div>
+            <h3>📦 Package Info</h3>
+            <div id="info">
+                <p><em>Click on a node to see details</em></p>
             </div>
-            <div class="input-row">
-                <div class="input-group">
-                    <label>Min Reverse Deps</label>
-                    <input type="number" id="filter-min-rdeps" value="0" min="0">
+
+            <div id="legend">
+                <h3>📊 Legend</h3>
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #4CAF50;"></div>
+                    <span>main</span>
                 </div>
-                <div class="input-group">
-                    <label>Min Dependencies</label>
-                    <input type="number" id="filter-min-deps" value="0" min="0">
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #2196F3;"></div>
+                    <span>community</span>
                 </div>
-            </div>
-            <div class="input-row">
-                <div class="input-group">
-                    <label>Repository</label>
-                    <select id="filter-repo">
-                        <option value="">All</option>
-                        <option value="main" selected>main</option>
-                        <option value="community">community</option>
-                        <option value="testing">testing</option>
-                    </select>
+                <div class="legend-item">
+                    <div class="legend-color" style="background: #FF9800;"></div>
+                    <span>testing</span>
                 </div>
             </div>
-            <div class="checkbox-row">
-                <label><input type="checkbox" id="filter-no-orphans"> Hide orphans (no deps & no rdeps)</label>
-            </div>
-            <div style="margin-top: 10px;">
-                <button onclick="applyNodeFilters()">Apply Filters</button>
-                <button onclick="resetFilters()" class="secondary">Reset</button>
-            </div>
-            <div id="filter-status"></div>
-
-            <h3>📦 Package Info</h3>
-            <div id="info"><p><em>Click a node to see details</em></p></div>
-
-            <div id="stats">
-                <h3>📈 Statistics</h3>
-                <p>Total nodes: <span id="total-nodes">{len(nodes)}</span></p>
-                <p>Visible nodes: <span id="visible-nodes">{len(nodes)}</span></p>
-                <p>Visible edges: <span id="edge-count">0</span></p>
-                <p style="margin-top: 6px;">Runtime: <span id="runtime-count">0</span></p>
-                <p>Build: <span id="build-count">0</span></p>
-                <p>Check: <span id="check-count">0</span></p>
-            </div>
-
-            <div class="legend">
-                <p style="font-size: 0.7rem; color: #666; margin-bottom: 4px;">Nodes by repo:</p>
-                <div class="legend-item"><div class="legend-color" style="background: #4CAF50;"></div>main</div>
-                <div class="legend-item"><div class="legend-color" style="background: #2196F3;"></div>community</div>
-                <div class="legend-item"><div class="legend-color" style="background: #FF9800;"></div>testing</div>
-            </div>
 
-            <div style="margin-top: 12px;">
+            <div id="controls">
+                <h3>🎮 Controls</h3>
                 <button onclick="network.fit()">Fit View</button>
-                <button onclick="togglePhysics()" class="secondary">Toggle Physics</button>
+                <button onclick="togglePhysics()">Toggle Physics</button>
+                <button onclick="focusSearch()">Search (Ctrl+F)</button>
             </div>
         </div>
     </div>
+
     <div id="loading">
         <div class="spinner"></div>
-        <div>Loading {len(nodes)} packages...</div>
+        <div>Loading graph...</div>
+        <div style="font-size: 0.8rem; color: #888; margin-top: 10px;">This may take a moment for large graphs</div>
     </div>
-    <script>
-        const allNodes = {json.dumps(nodes, ensure_ascii=False)};
-        const allEdges = {json.dumps(edges, ensure_ascii=False)};
-        const nodeStats = {json.dumps(node_stats, ensure_ascii=False)};
-
-        // 构建依赖关系索引
-        const depsIndex = {{}};  // pkg -> [deps]
-        const rdepsIndex = {{}}; // pkg -> [rdeps]
-        allEdges.forEach(e => {{
-            if (!depsIndex[e.from]) depsIndex[e.from] = [];
-            if (!rdepsIndex[e.to]) rdepsIndex[e.to] = [];
-            depsIndex[e.from].push(e.to);
-            rdepsIndex[e.to].push(e.from);
-        }});
-
-        let visibleNodeIds = new Set(allNodes.map(n => n.id));
-        const nodes = new vis.DataSet(allNodes);
-        const edges = new vis.DataSet([]);
+
+    ${data_script}<script>
+        // 节点和边以紧凑数组传输，加载时一次性展开为 vis.js 数据；
+        // 提示信息只传版本、描述摘要和依赖数，加载时拼成 HTML
+        const graphData = ${graph_json};
+        function makeTooltip(id, version, repo, description, depCount) {
+            const lines = [`<b>$${id}</b>`, `Version: $${version}`, `Repo: $${repo}`];
+            if (description) lines.push(`<br>$${description}...`);
+            if (depCount) lines.push(`<br>Dependencies: $${depCount}`);
+            return lines.join('<br>');
+        }
+        // 大图的布局已在服务端预先计算（positions 与节点下标对齐），此时关闭物理模拟
+        const positions = graphData.positions || null;
+        const nodes = new vis.DataSet(graphData.nodes.map(([id, r, size, ...info], i) => {
+            const repo = graphData.repos[r];
+            const title = info.length ? makeTooltip(id, info[0], repo, info[1], info[2]) : undefined;
+            const node = { id, label: id, size, title, color: graphData.colors[r], repo };
+            if (positions) {
+                node.x = positions[i][0];
+                node.y = positions[i][1];
+            }
+            return node;
+        }));
+        const edges = new vis.DataSet(graphData.edges.map(([f, t]) => ({
+            from: graphData.nodes[f][0], to: graphData.nodes[t][0], ...graphData.edgeStyle
+        })));
 
         const container = document.getElementById('network');
-        const data = {{ nodes: nodes, edges: edges }};
+        const data = { nodes: nodes, edges: edges };
 
-        const options = {{
-            nodes: {{ shape: 'dot', font: {{ size: 8, color: '#fff' }} }},
-            edges: {{ smooth: false }},
-            physics: {{
-                barnesHut: {{
+        // 细节层次：标签的渲染字号（font.size × 缩放比例）小于 drawThreshold - 1 时不绘制，
+        // 即缩小到 0.75 倍以下时隐藏标签。由 vis-network 绘制时逐节点判断，缩放时无需更新节点；
+        // 高亮的节点将阈值设为 0，缩小时仍显示标签
+        const LABEL_DRAW_THRESHOLD = 7;
+        const SHOW_LABEL = { label: { drawThreshold: 0 } };
+        const LOD_LABEL = { label: { drawThreshold: LABEL_DRAW_THRESHOLD } };
+
+        // 针对大规模图优化的配置
+        const options = {
+            nodes: {
+                shape: 'dot',
+                scaling: {
+                    min: 5,
+                    max: 40,
+                    label: { drawThreshold: LABEL_DRAW_THRESHOLD }
+                },
+                font: {
+                    size: 8,
+                    color: '#ffffff'
+                }
+            },
+            edges: {
+                width: 0.5,
+                color: {
+                    inherit: false
+                },
+                smooth: {
+                    enabled: false  // 禁用平滑曲线提高性能
+                }
+            },
+            physics: {
+                enabled: !positions,
+                barnesHut: {
                     gravitationalConstant: -2000,
                     centralGravity: 0.1,
                     springLength: 150,
                     springConstant: 0.01,
-                    damping: 0.5
-                }},
-                stabilization: {{ iterations: 150, updateInterval: 25 }}
-            }},
-            interaction: {{
+                    damping: 0.5,
+                    avoidOverlap: 0.1
+                },
+                stabilization: {
+                    enabled: true,
+                    iterations: 200,  // 减少迭代次数提高性能
+                    updateInterval: 25
+                }
+            },
+            interaction: {
                 hover: true,
-                hideEdgesOnDrag: true,
-                hideEdgesOnZoom: true
-            }},
-            layout: {{ improvedLayout: false }}
-        }};
+                tooltipDelay: 200,
+                hideEdgesOnDrag: true,  // 拖动时隐藏边提高性能
+                hideEdgesOnZoom: true   // 缩放时隐藏边提高性能
+            },
+            layout: {
+                improvedLayout: false  // 禁用改进布局算法提高大图性能
+            }
+        };
 
         const network = new vis.Network(container, data, options);
-        let physicsEnabled = true;
+        let physicsEnabled = !positions;
 
-        network.on('stabilizationIterationsDone', () => {{
+        // 稳定化完成后隐藏加载提示（预计算布局时无需等待）
+        if (positions) {
             document.getElementById('loading').classList.add('hidden');
-            network.setOptions({{ physics: {{ stabilization: false }} }});
-        }});
-
-        let edgeFilters = {{ runtime: true, build: false, check: false }};
-
-        // 页面加载时自动应用默认过滤器（main 仓库）
-        setTimeout(() => applyNodeFilters(), 100);
-
-        function getSubtree(rootPkg) {{
-            // BFS 获取所有依赖子树
-            const visited = new Set([rootPkg]);
-            const queue = [rootPkg];
-            while (queue.length > 0) {{
-                const pkg = queue.shift();
-                const deps = depsIndex[pkg] || [];
-                deps.forEach(dep => {{
-                    if (!visited.has(dep)) {{
-                        visited.add(dep);
-                        queue.push(dep);
-                    }}
-                }});
-            }}
-            return visited;
-        }}
-
-        function applyNodeFilters() {{
-            const rootPkg = document.getElementById('filter-root').value.trim();
-            const minRdeps = parseInt(document.getElementById('filter-min-rdeps').value) || 0;
-            const minDeps = parseInt(document.getElementById('filter-min-deps').value) || 0;
-            const repoFilter = document.getElementById('filter-repo').value;
-            const noOrphans = document.getElementById('filter-no-orphans').checked;
-
-            let filteredNodes = new Set(allNodes.map(n => n.id));
-
-            // 应用 root 包过滤 (子树)
-            if (rootPkg && nodeStats[rootPkg]) {{
-                filteredNodes = getSubtree(rootPkg);
-            }} else if (rootPkg && !nodeStats[rootPkg]) {{
-                alert('Package "' + rootPkg + '" not found');
-                return;
-            }}
-
-            // 应用仓库过滤
-            if (repoFilter) {{
-                filteredNodes = new Set([...filteredNodes].filter(id => nodeStats[id]?.repo === repoFilter));
-            }}
-
-            // 应用最小被依赖数过滤
-            if (minRdeps > 0) {{
-                filteredNodes = new Set([...filteredNodes].filter(id => nodeStats[id]?.rdeps >= minRdeps));
-            }}
-
-            // 应用最小依赖数过滤
-            if (minDeps > 0) {{
-                filteredNodes = new Set([...filteredNodes].filter(id => nodeStats[id]?.deps >= minDeps));
-            }}
-
-            // 过滤孤立节点
-            if (noOrphans) {{
-                filteredNodes = new Set([...filteredNodes].filter(id =>
-                    nodeStats[id]?.deps > 0 || nodeStats[id]?.rdeps > 0
-                ));
-            }}
-
-            visibleNodeIds = filteredNodes;
-
-            // 更新节点显示
-            allNodes.forEach(n => {{
-                nodes.update({{ id: n.id, hidden: !filteredNodes.has(n.id) }});
-            }});
-
-            updateEdges();
-
-            // 显示过滤状态
-            const status = document.getElementById('filter-status');
-            const filterInfo = [];
-            if (rootPkg) filterInfo.push(`Root: ${{rootPkg}}`);
-            if (minRdeps > 0) filterInfo.push(`Min rdeps: ${{minRdeps}}`);
-            if (minDeps > 0) filterInfo.push(`Min deps: ${{minDeps}}`);
-            if (repoFilter) filterInfo.push(`Repo: ${{repoFilter}}`);
-            if (noOrphans) filterInfo.push('No orphans');
-
-            if (filterInfo.length > 0) {{
-                status.textContent = `✓ ${{filteredNodes.size}} nodes | ${{filterInfo.join(', ')}}`;
-                status.classList.add('active');
-            }} else {{
-                status.classList.remove('active');
-            }}
-
-            document.getElementById('visible-nodes').textContent = filteredNodes.size;
-
-            // 如果指定了 root，自动聚焦
-            if (rootPkg && nodeStats[rootPkg]) {{
-                setTimeout(() => {{
-                    network.focus(rootPkg, {{ scale: 1.2, animation: true }});
-                    network.selectNodes([rootPkg]);
-                }}, 100);
-            }} else {{
-                setTimeout(() => network.fit(), 100);
-            }}
-        }}
-
-        function resetFilters() {{
-            document.getElementById('filter-root').value = '';
-            document.getElementById('filter-min-rdeps').value = '0';
-            document.getElementById('filter-min-deps').value = '0';
-            document.getElementById('filter-repo').value = '';
-            document.getElementById('filter-no-orphans').checked = false;
-
-            visibleNodeIds = new Set(allNodes.map(n => n.id));
-            allNodes.forEach(n => {{
-                nodes.update({{ id: n.id, hidden: false }});
-            }});
-
-            document.getElementById('filter-status').classList.remove('active');
-            document.getElementById('visible-nodes').textContent = allNodes.length;
-
-            updateEdges();
-            network.fit();
-        }}
-
-        function updateEdges() {{
-            const filteredEdges = allEdges.filter(e =>
-                edgeFilters[e.depType] &&
-                visibleNodeIds.has(e.from) &&
-                visibleNodeIds.has(e.to)
-            );
-            edges.clear();
-            edges.add(filteredEdges);
-
-            document.getElementById('edge-count').textContent = filteredEdges.length;
-            document.getElementById('runtime-count').textContent = filteredEdges.filter(e => e.depType === 'runtime').length;
-            document.getElementById('build-count').textContent = filteredEdges.filter(e => e.depType === 'build').length;
-            document.getElementById('check-count').textContent = filteredEdges.filter(e => e.depType === 'check').length;
-        }}
-
-        document.getElementById('filter-runtime').addEventListener('change', function() {{ edgeFilters.runtime = this.checked; updateEdges(); }});
-        document.getElementById('filter-build').addEventListener('change', function() {{ edgeFilters.build = this.checked; updateEdges(); }});
-        document.getElementById('filter-check').addEventListener('change', function() {{ edgeFilters.check = this.checked; updateEdges(); }});
+        } else {
+            network.on('stabilizationIterationsDone', function() {
+                document.getElementById('loading').classList.add('hidden');
+                network.setOptions({ physics: { stabilization: false } });
+            });
+        }
+
+        // 按服务端划分的社区折叠节点：DataSet 仍保存全部数据，但渲染和交互只处理聚类节点，
+        // 只有用户双击展开的社区才恢复为单个节点
+        if (graphData.clusters) {
+            const members = new Map();
+            graphData.clusters.forEach((c, i) => {
+                if (!members.has(c)) members.set(c, []);
+                members.get(c).push(i);
+            });
+            const groups = [...members.entries()].filter(([, idx]) => idx.length > 1);
+            groups.forEach(([c, idx], k) => {
+                const memberIds = new Set(idx.map(i => graphData.nodes[i][0]));
+                // 只在最后一个聚类完成后刷新一次数据
+                network.cluster({
+                    joinCondition: node => memberIds.has(node.id),
+                    clusterNodeProperties: {
+                        id: 'cluster:' + c,
+                        label: idx.length + ' packages',
+                        color: graphData.colors[graphData.nodes[idx[0]][1]],
+                        size: Math.min(10 + Math.sqrt(idx.length) * 2, 60)
+                    }
+                }, k === groups.length - 1);
+            });
+        }
+
+        network.on('doubleClick', function(params) {
+            if (params.nodes.length > 0 && network.isCluster(params.nodes[0])) {
+                network.openCluster(params.nodes[0]);
+            }
+        });
 
-        updateEdges();
+        // 展开包含该节点的聚类（findNode 返回从最外层聚类到节点本身的路径）
+        function revealNode(nodeId) {
+            if (!graphData.clusters) return;
+            for (const id of network.findNode(nodeId)) {
+                if (network.isCluster(id)) network.openCluster(id);
+            }
+        }
 
-        network.on('click', params => {{
-            if (params.nodes.length > 0) {{
+        // 点击节点显示信息
+        network.on('click', function(params) {
+            if (params.nodes.length > 0) {
                 const nodeId = params.nodes[0];
+                if (network.isCluster(nodeId)) {
+                    const count = network.getNodesInCluster(nodeId).length;
+                    infoEl.replaceChildren(
+                        infoLine(count + ' packages', 'label'),
+                        infoLine('Double-click to expand')
+                    );
+                    return;
+                }
                 const node = nodes.get(nodeId);
-                const stats = nodeStats[nodeId];
-                let html = node?.title || `<p><strong>${{nodeId}}</strong></p>`;
-                if (stats) {{
-                    html += `<p style="margin-top:8px;color:#888;">Dependencies: ${{stats.deps}}<br>Reverse deps: ${{stats.rdeps}}</p>`;
-                }}
-                document.getElementById('info').innerHTML = html;
-            }}
-        }});
+                // 信息面板和高亮放到下一帧统一更新，避免在点击回调中同步触发重排
+                requestAnimationFrame(() => {
+                    showNodeInfo(node);
+                    highlightConnected(nodeId);
+                });
+            } else if (highlighted.size > 0) {
+                // 点击空白处取消高亮
+                requestAnimationFrame(clearHighlight);
+            }
+        });
+
+        function infoLine(text, className) {
+            const p = document.createElement('p');
+            if (className) p.className = className;
+            p.textContent = text;
+            return p;
+        }
+
+        // 信息面板的元素只创建一次，点击时只更新 textContent，不经过 HTML 解析
+        const infoEl = document.getElementById('info');
+        const infoName = document.createElement('strong');
+        const infoRepo = infoLine('');
+        const infoSize = infoLine('');
+        const infoParts = [
+            document.createElement('p'),
+            infoLine('Repository:', 'label'),
+            infoRepo,
+            infoLine('Size (relative):', 'label'),
+            infoSize
+        ];
+        infoParts[0].appendChild(infoName);
+
+        function showNodeInfo(node) {
+            infoName.textContent = node.id;
+            infoRepo.textContent = node.repo || 'unknown';
+            infoSize.textContent = node.size.toFixed(1);
+            // 面板当前显示的是占位提示或聚类信息时才替换子元素
+            if (infoEl.firstChild !== infoParts[0]) infoEl.replaceChildren(...infoParts);
+        }
+
+        // 相邻节点缓存（此视图中的边不会变化，缓存始终有效）
+        const connCache = new Map();
+        // 带有单独不透明度的节点（选中节点及其相邻节点）及其不透明度；其余节点通过全局选项整体变暗，
+        // 因此每次点击只需更新新旧高亮集合，为 O(k) 而不是遍历全部节点
+        let highlighted = new Map();
+
+        function highlightConnected(nodeId) {
+            let connectedNodes = connCache.get(nodeId);
+            if (!connectedNodes) {
+                connectedNodes = new Set(network.getConnectedNodes(nodeId));
+                connCache.set(nodeId, connectedNodes);
+            }
+
+            const next = new Map();
+            for (const id of connectedNodes) next.set(id, 0.8);
+            next.set(nodeId, 1.0);
+            // 收集后一次批量更新，只触发一次 DataSet 事件和重绘；不透明度未变的节点不写入。
+            // opacity 设为 null 时删除节点上的单独设置，恢复使用全局不透明度
+            const updates = [];
+            for (const id of highlighted.keys()) {
+                if (!next.has(id)) updates.push({ id, opacity: null, scaling: LOD_LABEL });
+            }
+            for (const [id, opacity] of next) {
+                if (highlighted.get(id) !== opacity) updates.push({ id, opacity, scaling: SHOW_LABEL });
+            }
+            if (highlighted.size === 0) network.setOptions({ nodes: { opacity: 0.2 } });
+            if (updates.length > 0) nodes.update(updates);
+            highlighted = next;
+        }
+
+        function clearHighlight() {
+            if (highlighted.size === 0) return;
+            nodes.update([...highlighted.keys()].map(id => ({ id, opacity: null, scaling: LOD_LABEL })));
+            network.setOptions({ nodes: { opacity: 1.0 } });
+            highlighted = new Map();
+        }
+
+        function togglePhysics() {
+            physicsEnabled = !physicsEnabled;
+            network.setOptions({ physics: { enabled: physicsEnabled } });
+        }
 
+        // 搜索功能：启动时建立小写 ID 索引，按键时不再复制 DataSet、逐个转换大小写
+        const idIndex = nodes.getIds().map(id => [id.toLowerCase(), id]);
+        const exactIndex = new Map(idIndex);
         const searchBox = document.getElementById('search-box');
-        searchBox.addEventListener('input', e => {{
-            const q = e.target.value.toLowerCase();
-            if (q.length >= 2) {{
-                const matches = allNodes.filter(n => n.id.toLowerCase().includes(q) && visibleNodeIds.has(n.id)).slice(0, 10);
-                if (matches.length > 0) {{
-                    network.selectNodes(matches.map(n => n.id));
-                }}
-            }}
-        }});
+        let searchTimer = null;
+
+        // 输入过程中的匹配以加粗边框标记（一次 DataSet 批量更新），不经过 vis-network 的
+        // 选择逻辑；borderWidth 设为 null 时恢复全局边框宽度
+        let searchMarked = [];
+        function markSearchMatches(ids) {
+            const updates = searchMarked.filter(id => !ids.includes(id)).map(id => ({ id, borderWidth: null }));
+            for (const id of ids) updates.push({ id, borderWidth: 4 });
+            if (updates.length > 0) nodes.update(updates);
+            searchMarked = ids;
+        }
+
+        searchBox.addEventListener('input', function(e) {
+            // 防抖：停止输入 120ms 后才搜索一次
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                const query = e.target.value.toLowerCase();
+                if (query.length < 2) {
+                    markSearchMatches([]);
+                    return;
+                }
+                // 超过 10 个匹配时不标记，找到第 11 个即可停止扫描
+                const matchingIds = [];
+                for (let i = 0; i < idIndex.length && matchingIds.length <= 10; i++) {
+                    if (idIndex[i][0].includes(query)) matchingIds.push(idIndex[i][1]);
+                }
+                if (matchingIds.length > 10) matchingIds.length = 0;
+                matchingIds.forEach(revealNode);
+                markSearchMatches(matchingIds);
+                if (matchingIds.length === 1) {
+                    network.focus(matchingIds[0], {
+                        scale: 1.5,
+                        animation: true
+                    });
+                }
+            }, 120);
+        });
 
-        searchBox.addEventListener('keydown', e => {{
-            if (e.key === 'Enter') {{
-                const q = e.target.value.toLowerCase();
-                const match = allNodes.find(n => n.id.toLowerCase() === q);
-                if (match) {{
-                    if (!visibleNodeIds.has(match.id)) {{
-                        // 自动显示该节点
-                        nodes.update({{ id: match.id, hidden: false }});
-                        visibleNodeIds.add(match.id);
-                    }}
-                    network.selectNodes([match.id]);
-                    network.focus(match.id, {{ scale: 2, animation: true }});
-                    const stats = nodeStats[match.id];
-                    let html = match.title || `<p><strong>${{match.id}}</strong></p>`;
-                    if (stats) {{
-                        html += `<p style="margin-top:8px;color:#888;">Dependencies: ${{stats.deps}}<br>Reverse deps: ${{stats.rdeps}}</p>`;
-                    }}
-                    document.getElementById('info').innerHTML = html;
-                }}
-            }}
-        }});
+        searchBox.addEventListener('keydown', function(e) {
+            if (e.key === 'Enter') {
+                const query = e.target.value.toLowerCase();
+                const exactId = exactIndex.get(query);
+                if (exactId !== undefined) {
+                    revealNode(exactId);
+                    network.selectNodes([exactId]);
+                    network.focus(exactId, {
+                        scale: 2,
+                        animation: true
+                    });
+                    showNodeInfo(nodes.get(exactId));
+                }
+            }
+        });
 
-        // 支持输入框回车应用过滤器
-        ['filter-root', 'filter-min-rdeps', 'filter-min-deps'].forEach(id => {{
-            document.getElementById(id).addEventListener('keydown', e => {{
-                if (e.key === 'Enter') applyNodeFilters();
-            }});
-        }});
-        document.getElementById('filter-repo').addEventListener('change', applyNodeFilters);
-        document.getElementById('filter-no-orphans').addEventListener('change', applyNodeFilters);
+        function focusSearch() {
+            searchBox.focus();
+            searchBox.select();
+        }
 
-        function togglePhysics() {{
-            physicsEnabled = !physicsEnabled;
-            network.setOptions({{ physics: {{ enabled: physicsEnabled }} }});
-        }}
+        // 快捷键
+        document.addEventListener('keydown', function(e) {
+            if ((e.ctrlKey || e.metaKey) && e.key === 'f') {
+                e.preventDefault();
+                focusSearch();
+            }
+        });
     </script>
 </body>
-</html>"""
+</html>""",
+    payloads=("graph_json",),
+)
+
 
-    def _generate_large_graph_html(self, nodes: list[dict], edges: list[dict], title: str) -> str:
-        """生成针对大规模图优化的 HTML 内容"""
-        return f"""<!DOCTYPE html>
+# 完整依赖图的 WebGL 模板（sigma.js + graphology，string.Template 语法）
+_WEBGL_TEMPLATE = _StreamTemplate(
+    r"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
-    <title>{title}</title>
-    <script src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
+    <title>${title}</title>
+    <script src="https://unpkg.com/graphology@0.25.4/dist/graphology.umd.min.js"></script>
+    <script src="https://unpkg.com/graphology-library@0.8.0/dist/graphology-library.min.js"></script>
+    <script src="https://unpkg.com/sigma@2.4.0/build/sigma.min.js"></script>
     <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
             background: #1a1a2e;
             color: #eee;
-        }}
-        #header {{
+        }
+        #header {
             background: #16213e;
             padding: 10px 20px;
             border-bottom: 1px solid #0f3460;
             display: flex;
             justify-content: space-between;
             align-items: center;
-        }}
-        #header h1 {{
-            font-size: 1.3rem;
-            font-weight: 500;
-        }}
-        #stats {{
-            font-size: 0.85rem;
-            color: #888;
-        }}
-        #container {{
-            display: flex;
-            height: calc(100vh - 50px);
-        }}
-        #network {{
-            flex: 1;
-            background: #1a1a2e;
-        }}
-        #sidebar {{
+        }
+        #header h1 { font-size: 1.3rem; font-weight: 500; }
+        #stats { font-size: 0.85rem; color: #888; }
+        #container { display: flex; height: calc(100vh - 50px); }
+        #network { flex: 1; background: #1a1a2e; }
+        #sidebar {
             width: 280px;
             background: #16213e;
             padding: 15px;
             overflow-y: auto;
             border-left: 1px solid #0f3460;
-        }}
-        #sidebar h3 {{
-            margin-bottom: 10px;
-            color: #e94560;
-            font-size: 1rem;
-        }}
-        #search-box {{
+        }
+        #sidebar h3 { margin-bottom: 10px; color: #e94560; font-size: 1rem; }
+        #search-box {
             width: 100%;
             padding: 8px;
             margin-bottom: 15px;
@@ -2536,57 +2658,26 @@ class Visualizer:
             border: 1px solid #0f3460;
             color: #eee;
             border-radius: 4px;
-        }}
-        #search-box:focus {{
-            outline: none;
-            border-color: #e94560;
-        }}
-        #info {{
-            font-size: 0.85rem;
-            line-height: 1.5;
-        }}
-        #info p {{
-            margin: 6px 0;
-        }}
-        #info .label {{
-            color: #888;
-        }}
-        #legend {{
-            margin-top: 15px;
-            padding-top: 15px;
-            border-top: 1px solid #0f3460;
-        }}
-        .legend-item {{
-            display: flex;
-            align-items: center;
-            margin: 6px 0;
-            font-size: 0.85rem;
-        }}
-        .legend-color {{
-            width: 14px;
-            height: 14px;
-            border-radius: 50%;
-            margin-right: 8px;
-        }}
-        #controls {{
-            margin-top: 15px;
-            padding-top: 15px;
-            border-top: 1px solid #0f3460;
-        }}
-        button {{
-            background: #e94560;
-            color: white;
-            border: none;
-            padding: 8px 14px;
-            cursor: pointer;
-            border-radius: 4px;
+        }
+        #search-box:focus { outline: none; border-color: #e94560; }
+        #info { font-size: 0.85rem; line-height: 1.5; }
+        #info p { margin: 6px 0; }
+        #info .label { color: #888; }
+        #legend, #controls { margin-top: 15px; padding-top: 15px; border-top: 1px solid #0f3460; }
+        .legend-item { display: flex; align-items: center; margin: 6px 0; font-size: 0.85rem; }
+        .legend-color { width: 14px; height: 14px; border-radius: 50%; margin-right: 8px; }
+        button {
+            background: #e94560;
+            color: white;
+            border: none;
+            padding: 8px 14px;
+            cursor: pointer;
+            border-radius: 4px;
             font-size: 0.85rem;
             margin: 4px 4px 4px 0;
-        }}
-        button:hover {{
-            background: #ff6b6b;
-        }}
-        #loading {{
+        }
+        button:hover { background: #ff6b6b; }
+        #loading {
             position: fixed;
             top: 50%;
             left: 50%;
@@ -2596,29 +2687,14 @@ class Visualizer:
             border-radius: 8px;
             text-align: center;
             z-index: 1000;
-        }}
-        #loading.hidden {{
-            display: none;
-        }}
-        .spinner {{
-            border: 3px solid #0f3460;
-            border-top: 3px solid #e94560;
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 15px;
-        }}
-        @keyframes spin {{
-            0% {{ transform: rotate(0deg); }}
-            100% {{ transform: rotate(360deg); }}
-        }}
+        }
+        #loading.hidden { display: none; }
     </style>
 </head>
 <body>
     <div id="header">
-        <h1>{title}</h1>
-        <div id="stats">Nodes: {len(nodes)} | Edges: {len(edges)}</div>
+        <h1>${title}</h1>
+        <div id="stats">Nodes: ${node_count} | Edges: ${edge_count} | WebGL</div>
     </div>
     <div id="container">
         <div id="network"></div>
@@ -2633,203 +2709,1222 @@ class Visualizer:
 
             <div id="legend">
                 <h3>📊 Legend</h3>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #4CAF50;"></div>
-                    <span>main</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #2196F3;"></div>
-                    <span>community</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #FF9800;"></div>
-                    <span>testing</span>
-                </div>
             </div>
 
             <div id="controls">
                 <h3>🎮 Controls</h3>
-                <button onclick="network.fit()">Fit View</button>
-                <button onclick="togglePhysics()">Toggle Physics</button>
+                <button onclick="fitView()">Fit View</button>
                 <button onclick="focusSearch()">Search (Ctrl+F)</button>
             </div>
         </div>
     </div>
 
     <div id="loading">
-        <div class="spinner"></div>
         <div>Loading graph...</div>
-        <div style="font-size: 0.8rem; color: #888; margin-top: 10px;">This may take a moment for large graphs</div>
     </div>
 
-    <script>
-        const nodes = new vis.DataSet({json.dumps(nodes, ensure_ascii=False)});
-        const edges = new vis.DataSet({json.dumps(edges, ensure_ascii=False)});
-
-        const container = document.getElementById('network');
-        const data = {{ nodes: nodes, edges: edges }};
-
-        // 针对大规模图优化的配置
-        const options = {{
-            nodes: {{
-                shape: 'dot',
-                scaling: {{
-                    min: 5,
-                    max: 40
-                }},
-                font: {{
-                    size: 8,
-                    color: '#ffffff'
-                }}
-            }},
-            edges: {{
-                width: 0.5,
-                color: {{
-                    inherit: false
-                }},
-                smooth: {{
-                    enabled: false  // 禁用平滑曲线提高性能
-                }}
-            }},
-            physics: {{
-                enabled: true,
-                barnesHut: {{
-                    gravitationalConstant: -2000,
-                    centralGravity: 0.1,
-                    springLength: 150,
-                    springConstant: 0.01,
-                    damping: 0.5,
-                    avoidOverlap: 0.1
-                }},
-                stabilization: {{
-                    enabled: true,
-                    iterations: 200,  // 减少迭代次数提高性能
-                    updateInterval: 25
-                }}
-            }},
-            interaction: {{
-                hover: true,
-                tooltipDelay: 200,
-                hideEdgesOnDrag: true,  // 拖动时隐藏边提高性能
-                hideEdgesOnZoom: true   // 缩放时隐藏边提高性能
-            }},
-            layout: {{
-                improvedLayout: false  // 禁用改进布局算法提高大图性能
-            }}
-        }};
-
-        const network = new vis.Network(container, data, options);
-        let physicsEnabled = true;
-
-        // 稳定化完成后隐藏加载提示
-        network.on('stabilizationIterationsDone', function() {{
-            document.getElementById('loading').classList.add('hidden');
-            network.setOptions({{ physics: {{ stabilization: false }} }});
-        }});
-
-        // 点击节点显示信息
-        network.on('click', function(params) {{
-            if (params.nodes.length > 0) {{
-                const nodeId = params.nodes[0];
-                const node = nodes.get(nodeId);
-                showNodeInfo(node);
-                highlightConnected(nodeId);
-            }}
-        }});
-
-        function showNodeInfo(node) {{
-            const info = document.getElementById('info');
-            info.innerHTML = `
-                <p><strong>${{node.id}}</strong></p>
-                <p class="label">Repository:</p>
-                <p>${{getRepoFromColor(node.color)}}</p>
-                <p class="label">Size (relative):</p>
-                <p>${{node.size.toFixed(1)}}</p>
-            `;
-        }}
-
-        function getRepoFromColor(color) {{
-            const colorMap = {{
-                '#4CAF50': 'main',
-                '#2196F3': 'community',
-                '#FF9800': 'testing',
-                '#9E9E9E': 'unmaintained',
-                '#E0E0E0': 'unknown'
-            }};
-            return colorMap[color] || 'unknown';
-        }}
-
-        function highlightConnected(nodeId) {{
-            const connectedNodes = network.getConnectedNodes(nodeId);
-            const connectedEdges = network.getConnectedEdges(nodeId);
-
-            // 高亮连接的节点和边
-            nodes.forEach(node => {{
-                if (node.id === nodeId) {{
-                    nodes.update({{ id: node.id, opacity: 1.0 }});
-                }} else if (connectedNodes.includes(node.id)) {{
-                    nodes.update({{ id: node.id, opacity: 0.8 }});
-                }} else {{
-                    nodes.update({{ id: node.id, opacity: 0.2 }});
-                }}
-            }});
-        }}
-
-        function togglePhysics() {{
-            physicsEnabled = !physicsEnabled;
-            network.setOptions({{ physics: {{ enabled: physicsEnabled }} }});
-        }}
-
-        // 搜索功能
+    ${data_script}<script>
+        // 节点 [id, repoCode, size, 版本, 描述摘要, 依赖数]、边 [fromIdx, toIdx] 以紧凑数组传输；
+        // positions 为服务端预先计算的坐标，没有时在浏览器中运行 ForceAtlas2
+        const graphData = ${graph_json};
+        const rawNodes = graphData.nodes;
+
+        const graph = new graphology.Graph();
+        for (let i = 0; i < rawNodes.length; i++) {
+            const [id, r, size] = rawNodes[i];
+            const pos = graphData.positions ? graphData.positions[i] : [Math.random() * 1000, Math.random() * 1000];
+            graph.addNode(id, {
+                label: id,
+                x: pos[0],
+                y: pos[1],
+                size: Math.max(2, size / 4),
+                color: graphData.colors[r],
+                repo: graphData.repos[r],
+                rdepSize: size
+            });
+        }
+        // 同一依赖可能在依赖列表中重复出现，mergeEdge 只保留一条
+        const edgeAttrs = { color: graphData.edgeStyle.color.color, size: 0.5 };
+        for (const [f, t] of graphData.edges) {
+            graph.mergeEdge(rawNodes[f][0], rawNodes[t][0], edgeAttrs);
+        }
+
+        if (!graphData.positions) {
+            const fa2 = graphologyLibrary.layoutForceAtlas2;
+            fa2.assign(graph, { iterations: 100, settings: fa2.inferSettings(graph) });
+        }
+
+        // 节点和边由 GPU 绘制；高亮通过 reducer 在渲染时计算，不修改图数据
+        const renderer = new Sigma(graph, document.getElementById('network'), {
+            defaultEdgeType: 'arrow',
+            labelRenderedSizeThreshold: 8
+        });
+        document.getElementById('loading').classList.add('hidden');
+
+        let selected = null;
+        let neighbors = new Set();
+
+        renderer.setSetting('nodeReducer', (node, data) => {
+            if (selected !== null && node !== selected && !neighbors.has(node)) {
+                return { ...data, color: '#333344', label: '' };
+            }
+            return data;
+        });
+        renderer.setSetting('edgeReducer', (edge, data) => {
+            if (selected !== null && !graph.hasExtremity(edge, selected)) {
+                return { ...data, hidden: true };
+            }
+            return data;
+        });
+
+        function selectNode(node) {
+            selected = node;
+            neighbors = new Set(graph.neighbors(node));
+            showNodeInfo(node);
+            renderer.refresh();
+        }
+
+        function clearSelection() {
+            selected = null;
+            neighbors = new Set();
+            renderer.refresh();
+        }
+
+        renderer.on('clickNode', ({ node }) => selectNode(node));
+        renderer.on('clickStage', clearSelection);
+
+        function infoLine(text, className) {
+            const p = document.createElement('p');
+            if (className) p.className = className;
+            p.textContent = text;
+            return p;
+        }
+
+        function showNodeInfo(node) {
+            const attrs = graph.getNodeAttributes(node);
+            const name = document.createElement('p');
+            const strong = document.createElement('strong');
+            strong.textContent = node;
+            name.appendChild(strong);
+            document.getElementById('info').replaceChildren(
+                name,
+                infoLine('Repository:', 'label'),
+                infoLine(attrs.repo),
+                infoLine('Connections:', 'label'),
+                infoLine(String(graph.degree(node))),
+                infoLine('Size (relative):', 'label'),
+                infoLine(attrs.rdepSize.toFixed(1))
+            );
+        }
+
+        function focusNode(node) {
+            const pos = renderer.getNodeDisplayData(node);
+            renderer.getCamera().animate({ x: pos.x, y: pos.y, ratio: 0.2 }, { duration: 500 });
+        }
+
+        function fitView() {
+            renderer.getCamera().animatedReset({ duration: 300 });
+        }
+
+        // 图例按实际出现的仓库生成
+        const legend = document.getElementById('legend');
+        graphData.repos.forEach((repo, r) => {
+            const item = document.createElement('div');
+            item.className = 'legend-item';
+            const swatch = document.createElement('div');
+            swatch.className = 'legend-color';
+            swatch.style.background = graphData.colors[r];
+            const label = document.createElement('span');
+            label.textContent = repo;
+            item.append(swatch, label);
+            legend.appendChild(item);
+        });
+
+        // 搜索功能：小写 ID 索引只建立一次
+        const idIndex = graph.nodes().map(id => [id.toLowerCase(), id]);
+        const exactIndex = new Map(idIndex);
         const searchBox = document.getElementById('search-box');
-        searchBox.addEventListener('input', function(e) {{
-            const query = e.target.value.toLowerCase();
-            if (query.length >= 2) {{
-                const matchingNodes = nodes.get().filter(n =>
-                    n.id.toLowerCase().includes(query)
-                );
-                if (matchingNodes.length > 0 && matchingNodes.length <= 10) {{
-                    network.selectNodes(matchingNodes.map(n => n.id));
-                    if (matchingNodes.length === 1) {{
-                        network.focus(matchingNodes[0].id, {{
-                            scale: 1.5,
-                            animation: true
-                        }});
-                    }}
-                }}
-            }}
-        }});
-
-        searchBox.addEventListener('keydown', function(e) {{
-            if (e.key === 'Enter') {{
+        let searchTimer = null;
+        searchBox.addEventListener('input', e => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
                 const query = e.target.value.toLowerCase();
-                const exactMatch = nodes.get().find(n => n.id.toLowerCase() === query);
-                if (exactMatch) {{
-                    network.selectNodes([exactMatch.id]);
-                    network.focus(exactMatch.id, {{
-                        scale: 2,
-                        animation: true
-                    }});
-                    showNodeInfo(exactMatch);
-                }}
-            }}
-        }});
+                if (query.length < 2) return;
+                // 只有唯一匹配时才选中并定位
+                let match = null;
+                for (let i = 0; i < idIndex.length; i++) {
+                    if (idIndex[i][0].includes(query)) {
+                        if (match !== null) return;
+                        match = idIndex[i][1];
+                    }
+                }
+                if (match !== null) {
+                    selectNode(match);
+                    focusNode(match);
+                }
+            }, 120);
+        });
+
+        searchBox.addEventListener('keydown', e => {
+            if (e.key === 'Enter') {
+                const exactId = exactIndex.get(e.target.value.toLowerCase());
+                if (exactId !== undefined) {
+                    selectNode(exactId);
+                    focusNode(exactId);
+                }
+            }
+        });
 
-        function focusSearch() {{
+        function focusSearch() {
             searchBox.focus();
             searchBox.select();
-        }}
+        }
 
-        // 快捷键
-        document.addEventListener('keydown', function(e) {{
-            if ((e.ctrlKey || e.metaKey) && e.key === 'f') {{
+        document.addEventListener('keydown', e => {
+            if ((e.ctrlKey || e.metaKey) && e.key === 'f') {
                 e.preventDefault();
                 focusSearch();
-            }}
-        }});
+            }
+        });
     </script>
 </body>
-</html>"""
+</html>""",
+    payloads=("graph_json",),
+)
+
+
+class Visualizer:
+    """依赖关系可视化器"""
+
+    # 节点颜色配置（按仓库）
+    REPO_COLORS = {
+        "main": "#4CAF50",  # 绿色
+        "community": "#2196F3",  # 蓝色
+        "testing": "#FF9800",  # 橙色
+        "unmaintained": "#9E9E9E",  # 灰色
+        "unknown": "#E0E0E0",  # 浅灰
+    }
+
+    # 边颜色配置（按依赖类型）
+    EDGE_STYLES = {
+        "runtime": {
+            "color": "#4CAF50",  # 绿色 - 运行时依赖
+            "dashes": False,  # 实线
+            "width": 2,
+        },
+        "build": {
+            "color": "#2196F3",  # 蓝色 - 构建依赖
+            "dashes": [5, 5],  # 虚线
+            "width": 1.5,
+        },
+        "check": {
+            "color": "#FF9800",  # 橙色 - 检查依赖
+            "dashes": [2, 2],  # 点线
+            "width": 1,
+        },
+    }
+
+    # 紧凑边 [from, to, type_code] 中 type_code 对应的依赖类型
+    EDGE_TYPES = ("runtime", "build", "check")
+
+    # 各依赖类型对应的 PackageInfo 依赖列表，按 EDGE_TYPES 的顺序排列
+    EDGE_TYPE_DEPS = (
+        attrgetter("depends"),
+        attrgetter("build_depends"),
+        attrgetter("checkdepends"),
+    )
+
+    # 全类型视图中各类型边的透明度
+    ALL_TYPES_EDGE_OPACITY = {"runtime": 0.6, "build": 0.4, "check": 0.3}
+
+    # 单包依赖图显示所有类型时各类型边的透明度
+    FILTERABLE_EDGE_OPACITY = {"runtime": 0.8, "build": 0.6, "check": 0.5}
+
+    # 节点数超过该值时在服务端预先计算布局，浏览器端不再运行物理模拟
+    PRECOMPUTED_LAYOUT_THRESHOLD = 5000
+
+    # 节点数超过该值时在服务端划分社区，完整依赖图页面以折叠的聚类打开
+    CLUSTER_THRESHOLD = 10000
+
+    def __init__(self, graph: DependencyGraph):
+        """
+        初始化可视化器
+
+        Args:
+            graph: 依赖图
+        """
+        self.graph = graph
+        self._tooltip_cache: dict[str, str] = {}  # 包名 -> 提示信息 HTML
+
+    def render_html(
+        self,
+        package: str,
+        output_path: str,
+        dep_type: DependencyType = DependencyType.RUNTIME,  # 默认只显示运行时依赖
+        max_depth: int = 3,
+        include_reverse: bool = False,
+        show_all_types: bool = False,  # 是否显示所有类型（用不同样式区分）
+        title: str | None = None,
+        compress: bool = False,
+    ):
+        """
+        渲染为交互式 HTML 文件
+
+        Args:
+            package: 中心软件包
+            output_path: 输出文件路径（以 .gz 结尾时写出 gzip 压缩的 HTML）
+            dep_type: 依赖类型（默认只显示运行时依赖）
+            max_depth: 最大深度
+            include_reverse: 是否包含反向依赖
+            show_all_types: 是否显示所有依赖类型（用不同样式区分）
+            title: 页面标题
+            compress: 是否改为写出 gzip 压缩的 output_path + ".gz"
+                （供 Web 服务器以 Content-Encoding: gzip 直接发送）
+        """
+        if show_all_types:
+            # 收集所有类型的依赖，用不同样式显示
+            nodes_to_show, edges_data = self._collect_all_dep_types(
+                package, max_depth, include_reverse
+            )
+        else:
+            # 只收集指定类型的依赖
+            nodes_to_show, edges_data = self._collect_single_dep_type(
+                package, dep_type, max_depth, include_reverse
+            )
+
+        # 构建节点数据（颜色去重为调色板，节点只携带下标；提示信息只传字段，
+        # 由页面脚本拼成 HTML）。
+        # 包表、颜色表和提示信息方法提前取到局部变量，仓库 -> 调色板下标只解析一次
+        packages = self.graph.packages
+        repo_colors = self.REPO_COLORS
+        unknown_color = repo_colors["unknown"]
+        tooltip_fields = self._tooltip_fields
+        color_codes: dict[str, int] = {}
+        repo_codes: dict[str, int] = {}
+        nodes_data = []
+        for node in nodes_to_show:
+            pkg_info = packages.get(node)
+            repo = pkg_info.repo if pkg_info else "unknown"
+            code = repo_codes.get(repo)
+            if code is None:
+                color = repo_colors.get(repo, unknown_color)
+                code = repo_codes[repo] = color_codes.setdefault(color, len(color_codes))
+
+            is_center = node == package
+            node_data = {
+                "id": node,
+                "label": node,
+                "c": code,
+                "size": 30 if is_center else 20,
+                "font": {"size": 14 if is_center else 12},
+            }
+
+            if pkg_info:
+                node_data["t"] = tooltip_fields(pkg_info)
+
+            nodes_data.append(node_data)
+
+        # 生成 HTML（带过滤器控制），节点和边直接序列化写入文件
+        with _open_output(output_path, compress) as f:
+            self._write_filterable_html(
+                f,
+                list(color_codes),
+                nodes_data,
+                edges_data,
+                package=package,
+                title=title or f"Dependency Graph: {package}",
+            )
+
+    def _collect_single_dep_type(
+        self, package: str, dep_type: DependencyType, max_depth: int, include_reverse: bool
+    ) -> tuple:
+        """收集单一类型的依赖（节点按收集顺序返回）"""
+        # dict 作有序集合：迭代顺序即收集顺序，且与哈希种子无关
+        nodes_to_show = dict.fromkeys([package])
+        edges_data = []
+
+        # 添加依赖
+        deps = self.graph.get_dependencies(
+            package, dep_type=dep_type, recursive=True, max_depth=max_depth
+        )
+        nodes_to_show.update(dict.fromkeys(deps))
+
+        # 添加反向依赖
+        if include_reverse:
+            rdeps = self.graph.get_reverse_dependencies(
+                package, dep_type=dep_type, recursive=True, max_depth=max_depth
+            )
+            nodes_to_show.update(dict.fromkeys(rdeps))
+
+        # 确定边的样式（只构建一次，所有边共享）
+        edge_type = "build" if dep_type == DependencyType.BUILD else "runtime"
+        edge_style = self._edge_style(edge_type, 0.8)
+
+        # 添加边
+        for node in nodes_to_show:
+            for dep in self.graph.get_dependencies(node, dep_type=dep_type):
+                if dep in nodes_to_show:
+                    edges_data.append({"from": node, "to": dep, **edge_style})
+
+        return list(nodes_to_show), edges_data
+
+    def _collect_all_dep_types(self, package: str, max_depth: int, include_reverse: bool) -> tuple:
+        """收集所有类型的依赖，用不同样式区分（节点按广度优先的到达顺序返回）"""
+        nodes_to_show = dict.fromkeys([package])
+        edges_data: list[dict] = []
+
+        pkg_info = self.graph.packages.get(package)
+        if not pkg_info:
+            return list(nodes_to_show), edges_data
+
+        # 广度优先收集依赖：每个包只在首次到达（即最短深度）时展开一次。
+        # 加入 nodes_to_show 的包即已入队，因此它同时充当 visited 集合。
+        # 由于每个包只展开一次，重复边只可能来自同一列表中的重复条目，
+        # 用 dict.fromkeys 按首次出现的顺序去重即可，无需全局的边集合
+        packages = self.graph.packages
+        # 每种依赖类型的边样式只构建一次，同类型的边共享
+        edge_styles = {
+            edge_type: self._edge_style(edge_type, opacity)
+            for edge_type, opacity in self.FILTERABLE_EDGE_OPACITY.items()
+        }
+        dep_kinds = [
+            (get_deps, edge_styles[edge_type])
+            for edge_type, get_deps in zip(self.EDGE_TYPES, self.EDGE_TYPE_DEPS, strict=True)
+        ]
+        queue = deque([(package, 0)])
+        # 热循环中调用的方法提前绑定为局部变量
+        add_edge = edges_data.append
+        enqueue = queue.append
+        dequeue = queue.popleft
+        while queue:
+            pkg_name, current_depth = dequeue()
+            if current_depth > max_depth:
+                continue
+            pkg = packages[pkg_name]
+            next_depth = current_depth + 1
+
+            # 依次处理运行时、构建和检查依赖
+            for get_deps, edge_style in dep_kinds:
+                for dep in dict.fromkeys(get_deps(pkg)):
+                    if dep in packages:
+                        add_edge({"from": pkg_name, "to": dep, **edge_style})
+                        if dep not in nodes_to_show:
+                            nodes_to_show[dep] = None
+                            enqueue((dep, next_depth))
+
+        return list(nodes_to_show), edges_data
+
+    def _write_filterable_html(
+        self,
+        f: BinaryIO,
+        palette: list[str],
+        nodes: list[dict],
+        edges: list[dict],
+        package: str,
+        title: str,
+    ):
+        """
+        写出带依赖类型过滤器的 HTML（f 为二进制文件，节点的 c 为 palette 下标）
+
+        同一依赖类型的边样式相同，因此样式按 depType 去重后只写一份，
+        边压缩为 [fromIdx, toIdx, styleCode]。
+        """
+        node_index = {node["id"]: i for i, node in enumerate(nodes)}
+        style_codes: dict[str, int] = {}
+        edge_styles = []
+        compact_edges = []
+        for edge in edges:
+            code = style_codes.get(edge["depType"])
+            if code is None:
+                code = style_codes[edge["depType"]] = len(edge_styles)
+                edge_styles.append({k: v for k, v in edge.items() if k not in ("from", "to")})
+            compact_edges.append([node_index[edge["from"]], node_index[edge["to"]], code])
+
+        _FILTERABLE_TEMPLATE.write(
+            f,
+            payloads={
+                "palette_json": palette,
+                "nodes_json": nodes,
+                "edge_styles_json": edge_styles,
+                "edges_json": compact_edges,
+            },
+            title=title,
+            package=package,
+        )
+
+    def render_filtered_graph_html(
+        self,
+        output_path: str,
+        title: str = "Filtered Dependency Graph",
+        dep_type: DependencyType = DependencyType.RUNTIME,
+        show_all_types: bool = False,
+        filters: dict[str, Any] | None = None,
+    ):
+        """
+        渲染带过滤器的依赖图
+
+        Args:
+            output_path: 输出文件路径（以 .gz 结尾时写出 gzip 压缩的 HTML）
+            title: 页面标题
+            dep_type: 依赖类型
+            show_all_types: 是否显示所有类型
+            filters: 过滤器配置
+                - root_pkg: 只显示该包的依赖子树
+                - min_rdeps: 最小被依赖数
+                - min_deps: 最小依赖数
+                - no_orphans: 排除孤立包
+                - repo: 只显示指定仓库
+        """
+        filters = filters or {}
+
+        # 应用过滤器，获取要显示的节点
+        nodes_to_show = self._apply_filters(filters, dep_type)
+
+        if not nodes_to_show:
+            # 如果没有节点，返回空图
+            nodes_to_show = set()
+
+        # 构建节点数据
+        nodes_data = []
+
+        # 预计算被依赖数（只统计可见包之间的边）：沿依赖方向遍历一次，
+        # 不再为每个包单独查询并过滤反向依赖
+        rdep_counts: Counter = Counter()
+        for pkg in nodes_to_show:
+            for dep in self.graph.get_dependencies(pkg):
+                if dep in nodes_to_show:
+                    rdep_counts[dep] += 1
+
+        # 找出 root_pkg 用于高亮
+        root_pkg = filters.get("root_pkg")
+
+        # 包表、颜色表和提示信息方法提前绑定为局部变量，循环内不再逐次解析属性
+        get_package = self.graph.packages.get
+        repo_color = self.REPO_COLORS.get
+        unknown_color = self.REPO_COLORS["unknown"]
+        get_tooltip = self._get_tooltip
+
+        for node in nodes_to_show:
+            pkg_info = get_package(node)
+            repo = pkg_info.repo if pkg_info else "unknown"
+            rdep_count = rdep_counts.get(node, 0)
+
+            # 根据节点重要性调整大小
+            if node == root_pkg:
+                size = 35
+                font_size = 14
+            elif rdep_count > 100:
+                size = 30
+                font_size = 12
+            elif rdep_count > 20:
+                size = 25
+                font_size = 11
+            else:
+                size = int(max(8, min(5 + rdep_count / 5, 20)))
+                font_size = 9
+
+            node_data = {
+                "id": node,
+                "label": node,
+                "color": repo_color(repo, unknown_color),
+                "size": size,
+                "font": {"size": font_size},
+            }
+
+            if pkg_info:
+                node_data["title"] = get_tooltip(pkg_info)
+
+            nodes_data.append(node_data)
+
+        # 构建边数据
+        if show_all_types:
+            edges_data = self._expand_edges(self._collect_all_type_edges(nodes_to_show))
+        else:
+            edges_data = self._collect_single_type_edges(nodes_to_show, dep_type)
+
+        # 生成 HTML
+        with _open_output(output_path) as f:
+            self._write_filtered_graph_html(
+                f,
+                nodes_data,
+                edges_data,
+                title,
+                root_pkg=root_pkg,
+                show_all_types=show_all_types,
+                filters=filters,
+            )
+
+    def _apply_filters(self, filters: dict[str, Any], dep_type: DependencyType) -> set:
+        """应用过滤器，返回要显示的节点集合"""
+        root_pkg = filters.get("root_pkg")
+        min_rdeps = filters.get("min_rdeps", 0)
+        min_deps = filters.get("min_deps", 0)
+        no_orphans = filters.get("no_orphans", False)
+        repo_filter = filters.get("repo")
+
+        # 如果指定了 root_pkg，只获取其依赖子树
+        if root_pkg:
+            nodes = self._get_subtree(root_pkg, dep_type)
+        else:
+            nodes = set(self.graph.packages.keys())
+
+        # 应用仓库过滤
+        if repo_filter:
+            packages = self.graph.packages
+            nodes = {
+                pkg
+                for pkg in nodes
+                if (pkg_info := packages.get(pkg)) and pkg_info.repo == repo_filter
+            }
+
+        # 应用被依赖数过滤
+        if min_rdeps > 0:
+            nodes = {
+                pkg for pkg in nodes if len(self.graph.get_reverse_dependencies(pkg)) >= min_rdeps
+            }
+
+        # 应用依赖数过滤
+        if min_deps > 0:
+            nodes = {
+                pkg
+                for pkg in nodes
+                if len(self.graph.get_dependencies(pkg, dep_type=dep_type)) >= min_deps
+            }
+
+        # 过滤孤立包
+        if no_orphans:
+            nodes = {
+                pkg
+                for pkg in nodes
+                if (
+                    len(self.graph.get_dependencies(pkg, dep_type=dep_type)) > 0
+                    or len(self.graph.get_reverse_dependencies(pkg, dep_type=dep_type)) > 0
+                )
+            }
+
+        return nodes
+
+    def _get_subtree(self, root_pkg: str, dep_type: DependencyType, max_depth: int = 100) -> set:
+        """获取指定包的依赖子树（包含所有向下的依赖）"""
+        nodes = {root_pkg}
+
+        def collect_deps(pkg: str, depth: int, visited: set):
+            if depth > max_depth or pkg in visited:
+                return
+            visited.add(pkg)
+
+            pkg_info = self.graph.packages.get(pkg)
+            if not pkg_info:
+                return
+
+            # 根据类型获取依赖
+            if dep_type == DependencyType.RUNTIME:
+                deps = pkg_info.depends
+            elif dep_type == DependencyType.BUILD:
+                deps = list(pkg_info.build_depends)
+            else:
+                deps = list(pkg_info.all_depends)
+
+            for dep in deps:
+                if dep in self.graph.packages:
+                    nodes.add(dep)
+                    collect_deps(dep, depth + 1, visited.copy())
+
+        collect_deps(root_pkg, 0, set())
+        return nodes
+
+    def _write_filtered_graph_html(
+        self,
+        f: BinaryIO,
+        nodes: list[dict],
+        edges: list[dict],
+        title: str,
+        root_pkg: str | None = None,
+        show_all_types: bool = False,
+        filters: dict[str, Any] | None = None,
+    ):
+        """写出带高级过滤器的 HTML（f 为二进制文件）"""
+        filters = filters or {}
+        filter_info = []
+        if filters.get("root_pkg"):
+            filter_info.append(f"Root: {filters['root_pkg']}")
+        if filters.get("min_rdeps"):
+            filter_info.append(f"Min rdeps: {filters['min_rdeps']}")
+        if filters.get("min_deps"):
+            filter_info.append(f"Min deps: {filters['min_deps']}")
+        if filters.get("no_orphans"):
+            filter_info.append("No orphans")
+        if filters.get("repo"):
+            filter_info.append(f"Repo: {filters['repo']}")
+
+        filter_text = " | ".join(filter_info) if filter_info else "None"
+
+        _FILTERED_GRAPH_TEMPLATE.write(
+            f,
+            payloads={"nodes_json": nodes, "edges_json": edges},
+            title=title,
+            node_count=len(nodes),
+            filter_text=filter_text,
+            root_button="<button onclick='focusRoot()'>Go to Root</button>" if root_pkg else "",
+            root_pkg_js="'" + root_pkg + "'" if root_pkg else "null",
+        )
+
+    def render_d3_html(
+        self,
+        package: str,
+        output_path: str,
+        dep_type: DependencyType = DependencyType.ALL,
+        max_depth: int = 3,
+        title: str | None = None,
+        compress: bool = False,
+    ):
+        """
+        使用 D3.js 渲染为交互式 HTML 文件（力导向图）
+
+        compress 为 True 时改为写出 gzip 压缩的 output_path + ".gz"。
+        """
+        # 收集节点和边（与单包 vis.js 视图共用同一收集逻辑）
+        nodes_to_show, edges_data = self._collect_single_dep_type(
+            package, dep_type, max_depth, include_reverse=False
+        )
+
+        # 构建数据
+        nodes = []
+        get_package = self.graph.packages.get
+        for node in nodes_to_show:
+            pkg_info = get_package(node)
+            repo = pkg_info.repo if pkg_info else "unknown"
+
+            nodes.append(
+                {
+                    "id": node,
+                    "group": repo,
+                    "isCenter": node == package,
+                }
+            )
+
+        links = [{"source": edge["from"], "target": edge["to"]} for edge in edges_data]
+
+        # 生成 HTML
+        with _open_output(output_path, compress) as f:
+            self._write_d3_html(f, nodes, links, title=title or f"Dependency Graph: {package}")
+
+    def render_tree_html(
+        self,
+        package: str,
+        output_path: str,
+        dep_type: DependencyType = DependencyType.ALL,
+        max_depth: int = 4,
+        title: str | None = None,
+        compress: bool = False,
+    ):
+        """
+        渲染为树形结构 HTML
+
+        compress 为 True 时改为写出 gzip 压缩的 output_path + ".gz"。
+        """
+        tree_data = self.graph.get_dependency_tree(package, dep_type, max_depth)
+
+        with _open_output(output_path, compress) as f:
+            self._write_tree_html(f, tree_data, title=title or f"Dependency Tree: {package}")
+
+    def _get_tooltip(self, pkg: Any) -> str:
+        """获取节点提示信息（按包名缓存，多次渲染同一图谱时复用）"""
+        tooltip = self._tooltip_cache.get(pkg.name)
+        if tooltip is None:
+            tooltip = self._make_tooltip(pkg)
+            self._tooltip_cache[pkg.name] = tooltip
+        return tooltip
+
+    def _make_tooltip(self, pkg: Any) -> str:
+        """生成节点提示信息"""
+        lines = [
+            f"<b>{pkg.name}</b>",
+            f"Version: {pkg.version}-r{pkg.release}",
+            f"Repo: {pkg.repo}",
+        ]
+
+        if pkg.description:
+            lines.append(f"<br>{pkg.description[:100]}...")
+
+        if pkg.depends:
+            lines.append(f"<br>Dependencies: {len(pkg.depends)}")
+
+        return "<br>".join(lines)
+
+    def _tooltip_fields(self, pkg: Any) -> list:
+        """
+        提示信息的紧凑字段 [版本, 仓库, 描述摘要, 依赖数]
+
+        页面脚本据此拼出与 _make_tooltip 相同的 HTML，省去每个节点重复的标签文本。
+        """
+        return [
+            f"{pkg.version}-r{pkg.release}",
+            pkg.repo,
+            pkg.description[:100],
+            len(pkg.depends),
+        ]
+
+    def _write_visjs_html(self, f: BinaryIO, nodes: list[dict], edges: list[dict], title: str):
+        """写出 vis.js HTML（f 为二进制文件）"""
+        _VISJS_TEMPLATE.write(f, payloads={"nodes_json": nodes, "edges_json": edges}, title=title)
+
+    def _write_d3_html(self, f: BinaryIO, nodes: list[dict], links: list[dict], title: str):
+        """写出 D3.js HTML（f 为二进制文件）"""
+        _D3_TEMPLATE.write(f, payloads={"nodes_json": nodes, "links_json": links}, title=title)
+
+    def _write_tree_html(self, f: BinaryIO, tree_data: dict, title: str):
+        """写出树形结构 HTML（f 为二进制文件）"""
+        _TREE_TEMPLATE.write(f, payloads={"tree_json": tree_data}, title=title)
+
+    def render_full_graph_html(
+        self,
+        output_path: str,
+        max_nodes: int = 500,
+        title: str = "Full Dependency Graph",
+        dep_type: DependencyType = DependencyType.RUNTIME,
+        show_all_types: bool = False,
+        compress: bool = False,
+    ):
+        """
+        渲染完整的依赖图（带性能优化）
+
+        compress 为 True 时改为写出 gzip 压缩的 output_path + ".gz"。
+        """
+        # 选择最重要的节点（被依赖最多的）
+        most_depended = self.graph.get_most_depended(max_nodes)
+        nodes_to_show = {pkg for pkg, _ in most_depended}
+
+        packages = self.graph.packages
+        repo_color = self.REPO_COLORS.get
+        unknown_color = self.REPO_COLORS["unknown"]
+        get_tooltip = self._get_tooltip
+
+        # get_most_depended 已给出被依赖数，直接作为节点大小，不再逐个查询反向依赖；
+        # 其中的包均取自 graph.packages，包信息一定存在
+        nodes_data = [
+            {
+                "id": node,
+                "label": node,
+                "color": repo_color(pkg_info.repo, unknown_color),
+                "size": min(10 + rdep_count / 5, 50),
+                "font": {"size": 10},
+                "title": get_tooltip(pkg_info),
+            }
+            for node, rdep_count in most_depended
+            for pkg_info in (packages[node],)
+        ]
+
+        # 添加边（根据依赖类型）
+        if show_all_types:
+            edges_data = self._collect_all_type_edges(nodes_to_show)
+        else:
+            edges_data = self._collect_single_type_edges(nodes_to_show, dep_type)
+
+        if show_all_types:
+            with _open_output(output_path, compress) as f:
+                self._write_filterable_overview_html(f, nodes_data, edges_data, title)
+        else:
+            with _open_output(output_path, compress) as f:
+                self._write_visjs_html(f, nodes_data, edges_data, title)
+
+    def render_complete_graph_html(
+        self,
+        output_path: str,
+        title: str = "Complete Dependency Graph",
+        dep_type: DependencyType = DependencyType.RUNTIME,
+        show_all_types: bool = False,
+        webgl: bool = False,
+        external_data: bool = False,
+        compress: bool = False,
+    ):
+        """
+        渲染包含所有节点的完整依赖图
+
+        使用优化的渲染方式以支持大规模图谱显示。
+        webgl 为 True 时改用 sigma.js 在 GPU 上绘制节点和边（忽略 show_all_types）。
+        external_data 为 True 时图数据另行写入同目录的 <name>.data.js，页面以
+        <script src> 引用（直接打开本地文件也能加载，数据可单独缓存和压缩）；
+        show_all_types 的概览页不支持，始终内联数据。
+        compress 为 True 时改为写出 gzip 压缩的 output_path + ".gz"（外部数据脚本不压缩）。
+        """
+        packages = self.graph.packages
+        nodes_to_show = set(packages)
+
+        # 为了性能，一次遍历所有边统计每个包的反向依赖数量（Counter 中缺少的包计为 0）
+        _, rdep_counts = self.graph.get_degree_counts()
+
+        repo_color = self.REPO_COLORS.get
+        unknown_color = self.REPO_COLORS["unknown"]
+        tooltip_fields = self._tooltip_fields
+
+        # 添加所有节点；提示信息只传字段，由页面脚本拼成 HTML
+        nodes_data = [
+            {
+                "id": node,
+                "label": node,
+                "color": repo_color(pkg_info.repo, unknown_color),
+                "size": min(5 + rdep_counts[node] / 10, 40),
+                "font": {"size": 8},
+                "repo": pkg_info.repo,
+                "t": tooltip_fields(pkg_info),
+            }
+            for node, pkg_info in packages.items()
+        ]
+
+        # 添加边（根据依赖类型）并使用优化的 HTML 模板
+        data_path = _data_script_path(output_path) if external_data else None
+        if webgl:
+            with _open_output(output_path, compress) as f:
+                self._write_webgl_graph_html(f, nodes_data, dep_type, title, data_path)
+        elif show_all_types:
+            edges_data = self._collect_all_type_edges(nodes_to_show)
+            with _open_output(output_path, compress) as f:
+                self._write_filterable_overview_html(f, nodes_data, edges_data, title)
+        else:
+            with _open_output(output_path, compress) as f:
+                self._write_large_graph_html(f, nodes_data, dep_type, title, data_path)
+
+    def _single_type_edge_template(
+        self, dep_type: DependencyType
+    ) -> tuple[dict, Callable[[PackageInfo], Any]]:
+        """
+        确定单一类型边的共享样式和依赖获取方式
+
+        Returns:
+            (所有边共享的静态字段, 从 PackageInfo 取依赖列表的函数)
+        """
+        if dep_type == DependencyType.RUNTIME:
+            style = self.EDGE_STYLES["runtime"]
+            edge_type = "runtime"
+            get_deps = attrgetter("depends")
+        elif dep_type == DependencyType.BUILD:
+            style = self.EDGE_STYLES["build"]
+            edge_type = "build"
+            get_deps = attrgetter("build_depends")
+        else:
+            style = {"color": "#444444", "dashes": False, "width": 1}
+            edge_type = "all"
+            get_deps = attrgetter("all_depends")
+
+        edge_template = {
+            "arrows": "to",
+            "color": {"color": style["color"], "opacity": 0.5},
+            "dashes": style["dashes"],
+            "width": style["width"],
+            "depType": edge_type,
+        }
+        return edge_template, get_deps
+
+    def _collect_single_type_edges(
+        self, nodes_to_show: set, dep_type: DependencyType
+    ) -> list[dict]:
+        """收集单一类型的边"""
+        edges_data = []
+
+        # 边的样式和依赖获取方式在循环外只确定一次
+        edge_template, get_deps = self._single_type_edge_template(dep_type)
+
+        packages = self.graph.packages
+        append = edges_data.append
+        for node in nodes_to_show:
+            pkg_info = packages.get(node)
+            if not pkg_info:
+                continue
+
+            for dep in get_deps(pkg_info):
+                if dep in nodes_to_show:
+                    append({"from": node, "to": dep, **edge_template})
+
+        return edges_data
+
+    def _collect_all_type_edges(self, nodes_to_show: set) -> list[list]:
+        """
+        收集所有类型的边
+
+        Returns:
+            紧凑边列表，每条边为 [from, to, type_code]，type_code 是 EDGE_TYPES 中的下标
+        """
+        edges_data = []
+
+        # 每条边只来自其起点包自身的依赖列表，且 nodes_to_show 中每个包只遍历一次，
+        # 因此只需对单个列表去重，无需全局边集合
+        dep_kinds = list(enumerate(self.EDGE_TYPE_DEPS))
+        get_package = self.graph.packages.get
+        for node in nodes_to_show:
+            pkg_info = get_package(node)
+            if not pkg_info:
+                continue
+
+            for type_code, get_deps in dep_kinds:
+                for dep in dict.fromkeys(get_deps(pkg_info)):
+                    if dep in nodes_to_show:
+                        edges_data.append([node, dep, type_code])
+
+        return edges_data
+
+    def _edge_style(self, edge_type: str, opacity: float) -> dict:
+        """构建某一依赖类型的 vis.js 边样式（不含 from/to），同类型的边共享同一份"""
+        style = self.EDGE_STYLES[edge_type]
+        return {
+            "arrows": "to",
+            "color": {"color": style["color"], "opacity": opacity},
+            "dashes": style["dashes"],
+            "width": style["width"],
+            "depType": edge_type,
+        }
+
+    def _all_type_edge_styles(self) -> list[dict]:
+        """全类型视图中各类型边的样式表，按 EDGE_TYPES 的顺序排列"""
+        return [
+            self._edge_style(edge_type, self.ALL_TYPES_EDGE_OPACITY[edge_type])
+            for edge_type in self.EDGE_TYPES
+        ]
+
+    def _expand_edges(self, edges: list[list]) -> list[dict]:
+        """将紧凑边 [from, to, type_code] 展开为 vis.js 边字典"""
+        styles = self._all_type_edge_styles()
+        return [{"from": src, "to": dst, **styles[code]} for src, dst, code in edges]
+
+    def _write_filterable_overview_html(
+        self, f: BinaryIO, nodes: list[dict], edges: list[list], title: str
+    ):
+        """写出带高级过滤器的大规模图 HTML（edges 为紧凑边，f 为二进制文件）"""
+        # 节点 ID -> 下标，边和依赖索引都以下标传输，客户端可用掩码数组判断可见性
+        node_index = {node["id"]: i for i, node in enumerate(nodes)}
+        # 预计算每个节点的依赖数和被依赖数，用于客户端过滤（计数器一次遍历全部边得到）。
+        # 仓库以编码传输，颜色由客户端按编码查表，因此节点本身不再携带颜色和仓库名
+        packages = self.graph.packages
+        deps_counts, rdeps_counts = self.graph.get_degree_counts()
+        repo_codes: dict[str, int] = {}
+        node_stats = [
+            [
+                repo_codes.setdefault(
+                    pkg.repo if (pkg := packages.get(pkg_id)) else "unknown", len(repo_codes)
+                ),
+                deps_counts[pkg_id],
+                rdeps_counts[pkg_id],
+            ]
+            for pkg_id in map(itemgetter("id"), nodes)
+        ]
+        unknown_color = self.REPO_COLORS["unknown"]
+        repo_colors = [self.REPO_COLORS.get(repo, unknown_color) for repo in repo_codes]
+
+        # 依赖关系索引，供客户端子树过滤使用
+        indexed_edges = []
+        deps_index: list[list[int]] = [[] for _ in nodes]
+        for src, dst, type_code in edges:
+            src_idx = node_index[src]
+            dst_idx = node_index[dst]
+            indexed_edges.append([src_idx, dst_idx, type_code])
+            deps_index[src_idx].append(dst_idx)
+
+        precomputed_layout = self._apply_precomputed_layout(nodes, indexed_edges)
+
+        # 节点按列传输，每个字段名只出现一次；label 与 id 相同，颜色和仓库由 node_stats
+        # 的 repoCode 给出，都不再传输。可选字段只在有节点携带时才作为一列写出
+        node_columns: dict[str, list] = {
+            "id": [node["id"] for node in nodes],
+            "size": [node["size"] for node in nodes],
+            "fontSize": [node["font"]["size"] for node in nodes],
+        }
+        for key in ("title", "t", "x", "y"):
+            if any(key in node for node in nodes):
+                node_columns[key] = [node.get(key) for node in nodes]
+
+        _OVERVIEW_TEMPLATE.write(
+            f,
+            payloads={
+                "nodes_json": node_columns,
+                "edge_styles_json": self._all_type_edge_styles(),
+                "edges_json": indexed_edges,
+                "repo_names_json": list(repo_codes),
+                "repo_colors_json": repo_colors,
+                "stats_json": node_stats,
+                "deps_index_json": deps_index,
+            },
+            title=title,
+            total=len(nodes),
+            precomputed_layout="true" if precomputed_layout else "false",
+        )
+
+    def _apply_precomputed_layout(self, nodes: list[dict], edges: list[list]) -> bool:
+        """
+        为大规模图预先计算布局，把坐标写入节点的 x/y
+
+        布局使用 igraph 的 Fruchterman-Reingold 实现（C 实现，大图自动使用网格加速），
+        只在节点数超过 PRECOMPUTED_LAYOUT_THRESHOLD 时计算；未安装 igraph 时
+        保持浏览器端物理布局。
+
+        Args:
+            nodes: 节点列表
+            edges: 以节点下标表示的紧凑边 [fromIdx, toIdx, typeCode]
+
+        Returns:
+            是否已写入预计算的坐标
+        """
+        if len(nodes) <= self.PRECOMPUTED_LAYOUT_THRESHOLD or _load_igraph() is None:
+            return False
+
+        coords = self._compute_layout(len(nodes), [(src, dst) for src, dst, _ in edges])
+        for node, (x, y) in zip(nodes, coords, strict=True):
+            node["x"] = x
+            node["y"] = y
+        return True
+
+    def _compute_layout(self, node_count: int, edges: list) -> list[list[float]]:
+        """
+        用 igraph 计算 Fruchterman-Reingold 布局（调用方需确认已安装 igraph）
+
+        Args:
+            node_count: 节点数
+            edges: 以节点下标表示的边 (fromIdx, toIdx)
+
+        Returns:
+            与节点下标对齐的 [x, y] 坐标（保留一位小数）
+        """
+        layout_graph = _load_igraph().Graph(n=node_count, edges=edges)
+        layout = layout_graph.layout_fruchterman_reingold()
+        # 按节点数缩放到 vis.js 坐标空间，使平均节点间距与物理布局相近
+        side = 40 * node_count**0.5
+        layout.fit_into((side, side))
+        return [[round(x, 1), round(y, 1)] for x, y in layout.coords]
+
+    def _compute_clusters(self, node_count: int, edges: list) -> list[int]:
+        """
+        用 igraph 的 Louvain（multilevel）算法划分社区（调用方需确认已安装 igraph）
+
+        Args:
+            node_count: 节点数
+            edges: 以节点下标表示的边 (fromIdx, toIdx)
+
+        Returns:
+            与节点下标对齐的社区编号
+        """
+        cluster_graph = _load_igraph().Graph(n=node_count, edges=edges)
+        return cluster_graph.community_multilevel().membership
+
+    def _large_graph_data(self, nodes: list[dict], dep_type: DependencyType) -> dict:
+        """
+        构造大规模图页面的紧凑数据
+
+        Returns:
+            包含 repos、colors、nodes（[id, repoCode, size, 版本, 描述摘要, 依赖数]，
+            没有提示信息字段 t 的节点只有前三项）、edges（[fromIdx, toIdx]）和 edgeStyle 的字典
+        """
+        node_index = {node["id"]: i for i, node in enumerate(nodes)}
+        repo_codes: dict[str, int] = {}
+        compact_nodes = []
+        for node in nodes:
+            compact = [
+                node["id"],
+                repo_codes.setdefault(node["repo"], len(repo_codes)),
+                node["size"],
+            ]
+            # 仓库已由 repoCode 表示，提示信息字段中省去仓库名
+            if fields := node.get("t"):
+                version, _, description, dep_count = fields
+                compact += (version, description, dep_count)
+            compact_nodes.append(compact)
+        unknown_color = self.REPO_COLORS["unknown"]
+
+        edge_template, get_deps = self._single_type_edge_template(dep_type)
+        compact_edges = []
+        packages = self.graph.packages
+        for node, src_idx in node_index.items():
+            pkg_info = packages.get(node)
+            if not pkg_info:
+                continue
+            for dep in get_deps(pkg_info):
+                dst_idx = node_index.get(dep)
+                if dst_idx is not None:
+                    compact_edges.append([src_idx, dst_idx])
+
+        return {
+            "repos": list(repo_codes),
+            "colors": [self.REPO_COLORS.get(repo, unknown_color) for repo in repo_codes],
+            "nodes": compact_nodes,
+            "edges": compact_edges,
+            "edgeStyle": edge_template,
+        }
+
+    def _write_graph_data_page(
+        self,
+        template: _StreamTemplate,
+        f: BinaryIO,
+        graph_data: dict,
+        title: str,
+        data_path: str | None,
+    ):
+        """
+        写出以 graphData 为数据的完整依赖图页面（f 为二进制文件）
+
+        data_path 为空时数据内联在页面中；否则数据写入 data_path 处的脚本，
+        页面中的 graphData 改为引用该脚本定义的 window.depMapGraphData。
+        """
+        if data_path is None:
+            payload = graph_data
+            data_script = ""
+        else:
+            with _open_output(data_path) as data_file:
+                _GRAPH_DATA_SCRIPT_TEMPLATE.write(data_file, payloads={"graph_json": graph_data})
+            payload = b"window.depMapGraphData"
+            data_script = f'<script src="{quote(os.path.basename(data_path))}"></script>\n    '
+
+        template.write(
+            f,
+            payloads={"graph_json": payload},
+            title=title,
+            data_script=data_script,
+            node_count=len(graph_data["nodes"]),
+            edge_count=len(graph_data["edges"]),
+        )
+
+    def _write_webgl_graph_html(
+        self,
+        f: BinaryIO,
+        nodes: list[dict],
+        dep_type: DependencyType,
+        title: str,
+        data_path: str | None = None,
+    ):
+        """
+        写出使用 sigma.js（WebGL）渲染的完整依赖图 HTML（f 为二进制文件）
+
+        数据格式与 _write_large_graph_html 相同；已安装 igraph 时附带预先计算的
+        坐标 positions，否则由浏览器端运行 ForceAtlas2 布局。
+        """
+        graph_data = self._large_graph_data(nodes, dep_type)
+        if _load_igraph() is not None:
+            graph_data["positions"] = self._compute_layout(len(nodes), graph_data["edges"])
+
+        self._write_graph_data_page(_WEBGL_TEMPLATE, f, graph_data, title, data_path)
+
+    def _write_large_graph_html(
+        self,
+        f: BinaryIO,
+        nodes: list[dict],
+        dep_type: DependencyType,
+        title: str,
+        data_path: str | None = None,
+    ):
+        """
+        写出针对大规模图优化的 HTML（f 为二进制文件）
+
+        节点以 [id, repoCode, size, title] 传输，仓库名和颜色各只传一份；
+        边以节点下标对 [from, to] 传输，共享的样式只传一份，由浏览器加载时展开。
+        节点数超过 PRECOMPUTED_LAYOUT_THRESHOLD 且已安装 igraph 时附带预先计算的
+        坐标 positions，浏览器端不再运行物理模拟；超过 CLUSTER_THRESHOLD 时再附带
+        社区编号 clusters，页面打开时每个社区折叠为一个聚类节点，双击展开。
+        data_path 不为空时数据写入该处的外部脚本（见 _write_graph_data_page）。
+        """
+        graph_data = self._large_graph_data(nodes, dep_type)
+        if len(nodes) > self.PRECOMPUTED_LAYOUT_THRESHOLD and _load_igraph() is not None:
+            graph_data["positions"] = self._compute_layout(len(nodes), graph_data["edges"])
+        if len(nodes) > self.CLUSTER_THRESHOLD and _load_igraph() is not None:
+            graph_data["clusters"] = self._compute_clusters(len(nodes), graph_data["edges"])
+
+        self._write_graph_data_page(_LARGE_GRAPH_TEMPLATE, f, graph_data, title, data_path)
 
 
 def test_visualizer():
@@ -3,5 +3,6 @@ Web 界面模块
 """
 
 from .app import create_app
+from .server import run_server
 
-__all__ = ["create_app"]
+__all__ = ["create_app", "run_server"]
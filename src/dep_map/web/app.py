@@ -4,19 +4,36 @@ Flask Web 应用
 提供交互式 Web 界面浏览依赖关系。
 """
 
-from flask import Flask, jsonify, render_template_string, request
-
+import hashlib
+import heapq
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from itertools import chain
+from typing import Any
+
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+from .. import __version__
 from ..analyzer import DependencyAnalyzer
 from ..graph import DependencyGraph, DependencyType
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def create_app(graph: DependencyGraph) -> Flask:
-    """创建 Flask 应用"""
-    app = Flask(__name__)
-    DependencyAnalyzer(graph)
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
 
-    # HTML 模板
-    INDEX_HTML = """
+# 首页 HTML 模板（模块级常量，导入时只创建一次）
+INDEX_HTML = """
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -554,13 +571,29 @@ def create_app(graph: DependencyGraph) -> Flask:
             }, 200);
         });
 
-        // 加载软件包
+        // 每个中心包按最大深度、全部类型取回一次依赖图并缓存，
+        // 切换深度或依赖类型时在浏览器端筛选，不再请求后端
+        const MAX_GRAPH_DEPTH = Math.max(
+            ...Array.from(document.getElementById('depthSelect').options, o => Number(o.value))
+        );
+        const GRAPH_CACHE_SIZE = 50;
+        const graphCache = new Map();
+
+        function cacheGraph(name, data) {
+            graphCache.delete(name);
+            graphCache.set(name, data);
+            if (graphCache.size > GRAPH_CACHE_SIZE) {
+                graphCache.delete(graphCache.keys().next().value);
+            }
+        }
+
+        // 加载软件包：包信息和依赖图由同一个请求返回
         function loadPackage(name) {
             currentPackage = name;
             searchInput.value = name;
             searchResults.innerHTML = '';
 
-            fetch(`/api/package/${encodeURIComponent(name)}`)
+            fetch(`/api/package-with-graph/${encodeURIComponent(name)}?depth=${MAX_GRAPH_DEPTH}&type=all`)
                 .then(res => res.json())
                 .then(data => {
                     if (data.error) {
@@ -568,78 +601,143 @@ def create_app(graph: DependencyGraph) -> Flask:
                         return;
                     }
 
-                    // 显示信息面板
-                    document.getElementById('welcomeMessage').style.display = 'none';
-                    document.getElementById('statsPanel').style.display = 'none';
-                    document.getElementById('packageInfo').classList.add('active');
-
-                    // 填充信息
-                    document.getElementById('pkgName').textContent = data.name;
-                    document.getElementById('pkgVersion').textContent = `${data.version}`;
-                    document.getElementById('pkgDesc').textContent = data.description || '无描述';
-
-                    document.getElementById('statDeps').textContent = data.deps_count;
-                    document.getElementById('statRdeps').textContent = data.rdeps_count;
-                    document.getElementById('statTotalDeps').textContent = data.total_deps_count;
-                    document.getElementById('statRepo').textContent = data.repo || 'N/A';
-
-                    // 依赖列表
-                    document.getElementById('depsList').innerHTML = data.deps.map(d => `
-                        <div class="dep-item" onclick="loadPackage('${d.name}')">
-                            ${d.name}
-                            <span class="repo-tag">${d.repo || 'N/A'}</span>
-                        </div>
-                    `).join('') || '<div style="color: #666; padding: 10px;">无依赖</div>';
+                    cacheGraph(name, data.graph);
+                    showPackageInfo(data.package);
+                    updateGraph(name);
+                });
+        }
 
-                    // 被依赖列表
-                    document.getElementById('rdepsList').innerHTML = data.rdeps.slice(0, 20).map(d => `
-                        <div class="dep-item" onclick="loadPackage('${d.name}')">
-                            ${d.name}
-                            <span class="repo-tag">${d.repo || 'N/A'}</span>
-                        </div>
-                    `).join('') || '<div style="color: #666; padding: 10px;">无</div>';
+        // 显示软件包信息
+        function showPackageInfo(data) {
+            // 显示信息面板
+            document.getElementById('welcomeMessage').style.display = 'none';
+            document.getElementById('statsPanel').style.display = 'none';
+            document.getElementById('packageInfo').classList.add('active');
+
+            // 填充信息
+            document.getElementById('pkgName').textContent = data.name;
+            document.getElementById('pkgVersion').textContent = `${data.version}`;
+            document.getElementById('pkgDesc').textContent = data.description || '无描述';
+
+            document.getElementById('statDeps').textContent = data.deps_count;
+            document.getElementById('statRdeps').textContent = data.rdeps_count;
+            document.getElementById('statTotalDeps').textContent = data.total_deps_count;
+            document.getElementById('statRepo').textContent = data.repo || 'N/A';
+
+            // 依赖列表
+            document.getElementById('depsList').innerHTML = data.deps.map(d => `
+                <div class="dep-item" onclick="loadPackage('${d.name}')">
+                    ${d.name}
+                    <span class="repo-tag">${d.repo || 'N/A'}</span>
+                </div>
+            `).join('') || '<div style="color: #666; padding: 10px;">无依赖</div>';
 
-                    if (data.rdeps.length > 20) {
-                        document.getElementById('rdepsList').innerHTML += `
-                            <div style="color: #888; padding: 10px; text-align: center;">
-                                还有 ${data.rdeps.length - 20} 个...
-                            </div>
-                        `;
-                    }
+            // 被依赖列表
+            document.getElementById('rdepsList').innerHTML = data.rdeps.map(d => `
+                <div class="dep-item" onclick="loadPackage('${d.name}')">
+                    ${d.name}
+                    <span class="repo-tag">${d.repo || 'N/A'}</span>
+                </div>
+            `).join('') || '<div style="color: #666; padding: 10px;">无</div>';
 
-                    // 更新图
-                    updateGraph(name);
-                });
+            if (data.rdeps_count > data.rdeps.length) {
+                document.getElementById('rdepsList').innerHTML += `
+                    <div style="color: #888; padding: 10px; text-align: center;">
+                        还有 ${data.rdeps_count - data.rdeps.length} 个...
+                    </div>
+                `;
+            }
         }
 
-        // 更新图
+        // 更新图：从缓存的完整依赖图中筛选当前深度和依赖类型的子图
         function updateGraph(centerPkg) {
-            const depth = document.getElementById('depthSelect').value;
+            const depth = Number(document.getElementById('depthSelect').value);
             const depType = document.getElementById('typeSelect').value;
+            const cached = graphCache.get(centerPkg);
 
-            fetch(`/api/graph/${encodeURIComponent(centerPkg)}?depth=${depth}&type=${depType}`)
+            if (cached) {
+                renderGraph(filterGraph(cached, centerPkg, depth, depType), centerPkg);
+                return;
+            }
+
+            fetch(`/api/graph/${encodeURIComponent(centerPkg)}?depth=${MAX_GRAPH_DEPTH}&type=all`)
                 .then(res => res.json())
                 .then(data => {
-                    nodes.clear();
-                    edges.clear();
-
-                    nodes.add(data.nodes.map(n => ({
-                        id: n.id,
-                        label: n.id,
-                        color: REPO_COLORS[n.repo] || REPO_COLORS.unknown,
-                        size: n.id === centerPkg ? 25 : 15,
-                        font: { size: n.id === centerPkg ? 14 : 10 }
-                    })));
-
-                    edges.add(data.edges.map(e => ({
-                        from: e.from,
-                        to: e.to
-                    })));
-
-                    network.fit();
+                    cacheGraph(centerPkg, data);
+                    renderGraph(filterGraph(data, centerPkg, depth, depType), centerPkg);
                 });
         }
 
+        // 与后端相同的广度优先遍历：只沿指定类型的边扩展到 maxDepth 层，
+        // 保留已发现节点之间的全部边
+        function filterGraph(data, centerPkg, maxDepth, depType) {
+            const adj = new Map();
+            for (const e of data.edges) {
+                if (depType !== 'all' && e.type !== depType) continue;
+                if (!adj.has(e.from)) adj.set(e.from, []);
+                adj.get(e.from).push(e.to);
+            }
+
+            const depths = new Map([[centerPkg, 0]]);
+            const queue = [centerPkg];
+            const edges = [];
+            for (let i = 0; i < queue.length; i++) {
+                const current = queue[i];
+                const depth = depths.get(current);
+                for (const dep of adj.get(current) || []) {
+                    if (!depths.has(dep)) {
+                        if (depth >= maxDepth) continue;
+                        depths.set(dep, depth + 1);
+                        queue.push(dep);
+                    }
+                    edges.push({ from: current, to: dep });
+                }
+            }
+
+            return { nodes: data.nodes.filter(n => depths.has(n.id)), edges };
+        }
+
+        // 增量更新 DataSet：移除不再出现的项，只新增或更新有变化的项。
+        // 保留下来的节点不会被重新创建，位置不变，也不会触发整图重新布局
+        function syncDataSet(dataSet, items) {
+            const ids = new Set(items.map(item => item.id));
+            dataSet.remove(dataSet.getIds({ filter: item => !ids.has(item.id) }));
+            dataSet.update(items.filter(item => {
+                const old = dataSet.get(item.id);
+                return !old || JSON.stringify(old) !== JSON.stringify(item);
+            }));
+        }
+
+        // 节点样式只取决于仓库和是否为中心包，依赖图和被依赖图共用，
+        // 保证同一视图内的节点样式一致，相同的节点在 syncDataSet 中比较为相等
+        function toVisNodes(data, centerPkg) {
+            return data.nodes.map(n => ({
+                id: n.id,
+                label: n.id,
+                color: REPO_COLORS[n.repo] || REPO_COLORS.unknown,
+                size: n.id === centerPkg ? 25 : 15,
+                font: { size: n.id === centerPkg ? 14 : 10 }
+            }));
+        }
+
+        // 边以两端包名作为 id，便于在图之间比较
+        function toVisEdges(data) {
+            return data.edges.map(e => ({
+                id: `${e.from}->${e.to}`,
+                from: e.from,
+                to: e.to
+            }));
+        }
+
+        // 绘制依赖图
+        function renderGraph(data, centerPkg) {
+            syncDataSet(nodes, toVisNodes(data, centerPkg));
+
+            syncDataSet(edges, toVisEdges(data));
+
+            network.fit();
+        }
+
         // 展开依赖
         function expandDeps() {
             if (currentPackage) {
@@ -654,20 +752,9 @@ def create_app(graph: DependencyGraph) -> Flask:
                 fetch(`/api/rdeps-graph/${encodeURIComponent(currentPackage)}?depth=2`)
                     .then(res => res.json())
                     .then(data => {
-                        nodes.clear();
-                        edges.clear();
-
-                        nodes.add(data.nodes.map(n => ({
-                            id: n.id,
-                            label: n.id,
-                            color: REPO_COLORS[n.repo] || REPO_COLORS.unknown,
-                            size: n.id === currentPackage ? 25 : 15
-                        })));
+                        syncDataSet(nodes, toVisNodes(data, currentPackage));
 
-                        edges.add(data.edges.map(e => ({
-                            from: e.from,
-                            to: e.to
-                        })));
+                        syncDataSet(edges, toVisEdges(data));
 
                         network.fit();
                     });
@@ -750,9 +837,180 @@ def create_app(graph: DependencyGraph) -> Flask:
 </html>
 """
 
+
+# API 响应的浏览器缓存有效期（秒）
+API_CACHE_MAX_AGE = 3600
+
+# 包详情中列出的反向依赖数上限（页面只显示这么多，总数见 rdeps_count）
+PACKAGE_RDEPS_LIMIT = 20
+
+# 子图边数达到此值时不再缓存整个响应，改为逐批序列化并流式发送，
+# 避免很深的子图在内存中拼出完整的 JSON，也避免 LRU 缓存中堆积巨大的响应
+GRAPH_STREAM_MIN_EDGES = 5000
+
+
+def _json_item_bytes(obj: Any) -> bytes:
+    """把单个值序列化为紧凑的 JSON 字节串（按插入顺序输出键；已安装 orjson 时使用 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _join_batches(fragments: Iterable[bytes], batch_size: int = 1000) -> Iterator[bytes]:
+    """
+    把 JSON 数组元素片段以逗号连接，逐批产出（不含外层方括号），用于流式响应
+
+    每批元素拼成一个字节串，避免逐个元素发送过多的小片段。
+    """
+    separator = b""
+    batch = []
+    for fragment in fragments:
+        batch.append(fragment)
+        if len(batch) >= batch_size:
+            yield separator + b",".join(batch)
+            separator = b","
+            batch = []
+    if batch:
+        yield separator + b",".join(batch)
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """
+    用 orjson 序列化 jsonify 的响应
+
+    与默认实现一样遵循 sort_keys 设置、末尾换行，调试模式下缩进；
+    非 ASCII 字符直接以 UTF-8 输出。
+    """
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_APPEND_NEWLINE
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype
+        )
+
+
+class _SubstringIndex:
+    """
+    包名子串索引（广义后缀数组）
+
+    所有包名以 \\0 分隔拼接为一个字符串，各包名内的后缀起点按后缀排序。查询时二分出
+    以查询串开头的后缀区间，区间内后缀所属的包名即为包含查询串的全部包名，
+    无需逐个包名做子串判断。
+    """
+
+    SEPARATOR = "\0"
+
+    def __init__(self, names: list[str]):
+        self._text = text = self.SEPARATOR.join(names) + self.SEPARATOR
+        # 文本中每个位置所属的包名下标（分隔符归属其前面的包名）
+        self._owners = owners = array("I")
+        for idx, name in enumerate(names):
+            owners.extend([idx] * (len(name) + 1))
+        # 后缀只截取到所在包名末尾参与排序
+        self._suffixes = array(
+            "I",
+            sorted(
+                (i for i, ch in enumerate(text) if ch != self.SEPARATOR),
+                key=lambda i: text[i : text.index(self.SEPARATOR, i)],
+            ),
+        )
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """
+        查找包含 query 的包名
+
+        Returns:
+            包名下标，按原顺序取前 limit 个
+        """
+        if not query or self.SEPARATOR in query:
+            return []
+
+        text, size = self._text, len(query)
+
+        def prefix(i: int) -> str:
+            return text[i : i + size]
+
+        lo = bisect_left(self._suffixes, query, key=prefix)
+        hi = bisect_right(self._suffixes, query, lo=lo, key=prefix)
+        owners = self._owners
+        return heapq.nsmallest(limit, {owners[i] for i in self._suffixes[lo:hi]})
+
+
+def create_app(graph: DependencyGraph) -> Flask:
+    """创建 Flask 应用"""
+    app = Flask(__name__)
+    if orjson is not None:
+        app.json = _OrjsonProvider(app)
+    # 前端不依赖键的顺序，响应按字典插入顺序输出，省去每次序列化时的键排序
+    app.json.sort_keys = False
+    if Compress is not None:
+        # 子图 JSON 中大量重复的键名和首页 HTML 压缩率很高：优先 brotli，其次 gzip，
+        # 过小的响应不压缩
+        app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+        app.config["COMPRESS_BR_LEVEL"] = 4
+        app.config["COMPRESS_MIN_SIZE"] = 1024
+        Compress(app)
+    DependencyAnalyzer(graph)
+
+    # 首页只依赖包总数，图在应用生命周期内不变，创建应用时渲染一次，请求时直接返回
+    index_html = app.jinja_env.from_string(INDEX_HTML).render(total_packages=len(graph.packages))
+
     @app.route("/")
     def index():
-        return render_template_string(INDEX_HTML, total_packages=len(graph.packages))
+        return index_html
+
+    # API 响应只取决于请求参数、图的内容和 dep-map 本身的代码：以 dep-map 版本和
+    # 每个包所有会出现在响应中或影响依赖解析的字段的摘要作为 ETag，
+    # 浏览器在缓存有效期内不再请求，过期后以 If-None-Match 校验，图未变时返回 304。
+    # 不标记 immutable，以便用新的 APKINDEX 重启服务后能在过期后取到新数据
+    digest = hashlib.sha1(__version__.encode(), usedforsecurity=False)
+    for name, pkg in graph.packages.items():
+        fields = [
+            name,
+            pkg.version,
+            str(pkg.release),
+            pkg.repo,
+            pkg.description,
+            pkg.url,
+            pkg.license,
+            *(
+                " ".join(deps)
+                for deps in (
+                    pkg.depends,
+                    pkg.makedepends,
+                    pkg.makedepends_build,
+                    pkg.makedepends_host,
+                    pkg.checkdepends,
+                    pkg.provides,
+                    pkg.subpackages,
+                )
+            ),
+        ]
+        digest.update("\0".join(fields).encode() + b"\n")
+    graph_etag = digest.hexdigest()
+
+    @app.after_request
+    def add_cache_headers(response: Response) -> Response:
+        if request.path.startswith("/api/") and response.status_code == 200:
+            response.set_etag(graph_etag)
+            response.cache_control.public = True
+            response.cache_control.max_age = API_CACHE_MAX_AGE
+            if response.is_streamed:
+                # 流式响应不计算 Content-Length，否则 make_conditional 会把整个生成器读入内存
+                response.automatically_set_content_length = False
+            return response.make_conditional(request)
+        return response
+
+    # 搜索索引：小写包名的后缀数组在创建应用时建立一次，
+    # 请求时二分查找，不再逐个包名做子串判断
+    search_entries = [(name, pkg.repo) for name, pkg in graph.packages.items()]
+    search_index = _SubstringIndex([name.lower() for name, _ in search_entries])
 
     @app.route("/api/search")
     def api_search():
@@ -761,56 +1019,118 @@ def create_app(graph: DependencyGraph) -> Flask:
             return jsonify({"results": []})
 
         results = []
-        for name, pkg in graph.packages.items():
-            if query in name.lower():
-                results.append(
-                    {
-                        "name": name,
-                        "repo": pkg.repo,
-                    }
-                )
-                if len(results) >= 20:
-                    break
+        for idx in search_index.search(query, 20):
+            name, repo = search_entries[idx]
+            results.append(
+                {
+                    "name": name,
+                    "repo": repo,
+                }
+            )
 
         return jsonify({"results": results})
 
-    @app.route("/api/package/<name>")
-    def api_package(name: str):
-        if name not in graph.packages:
-            return jsonify({"error": "Package not found"}), 404
+    # 包详情在图的生命周期内不变：首次请求时序列化为 JSON 字节串并缓存，
+    # 之后直接返回，不再重复计算依赖列表和递归依赖数。
+    # 不在启动时为全部包预先计算，以免为从未被查看的包做递归遍历
+    package_json: dict[str, bytes] = {}
 
+    def build_package_json(name: str) -> bytes:
         pkg = graph.packages[name]
         deps = graph.get_dependencies(name)
         rdeps = graph.get_reverse_dependencies(name)
         total_deps = graph.get_dependencies(name, recursive=True)
 
-        return jsonify(
-            {
-                "name": pkg.name,
-                "version": f"{pkg.version}-r{pkg.release}",
-                "description": pkg.description,
-                "repo": pkg.repo,
-                "url": pkg.url,
-                "license": pkg.license,
-                "deps_count": len(deps),
-                "rdeps_count": len(rdeps),
-                "total_deps_count": len(total_deps),
-                "deps": [
-                    {"name": d, "repo": graph.packages[d].repo if d in graph.packages else None}
-                    for d in deps
-                ],
-                "rdeps": [
-                    {"name": d, "repo": graph.packages[d].repo if d in graph.packages else None}
-                    for d in rdeps
-                ],
-            }
-        )
+        payload = {
+            "name": pkg.name,
+            "version": f"{pkg.version}-r{pkg.release}",
+            "description": pkg.description,
+            "repo": pkg.repo,
+            "url": pkg.url,
+            "license": pkg.license,
+            "deps_count": len(deps),
+            "rdeps_count": len(rdeps),
+            "total_deps_count": len(total_deps),
+            "deps": [
+                {"name": d, "repo": graph.packages[d].repo if d in graph.packages else None}
+                for d in deps
+            ],
+            "rdeps": [
+                {"name": d, "repo": graph.packages[d].repo if d in graph.packages else None}
+                for d in rdeps[:PACKAGE_RDEPS_LIMIT]
+            ],
+        }
+        # 与 jsonify 的输出一致：末尾换行
+        return _json_item_bytes(payload) + b"\n"
 
-    @app.route("/api/graph/<name>")
-    def api_graph(name: str):
+    def get_package_json(name: str) -> bytes:
+        body = package_json.get(name)
+        if body is None:
+            body = package_json[name] = build_package_json(name)
+        return body
+
+    @app.route("/api/package/<name>")
+    def api_package(name: str):
         if name not in graph.packages:
             return jsonify({"error": "Package not found"}), 404
 
+        return Response(get_package_json(name), mimetype="application/json")
+
+    # 每个包作为子图节点的 JSON 片段在创建应用时序列化一次，
+    # 组装子图时直接拼接字节串，不再为每个节点创建字典再序列化
+    node_json = {
+        name: _json_item_bytes({"id": name, "repo": pkg.repo})
+        for name, pkg in graph.packages.items()
+    }
+
+    def node_fragment(node: str) -> bytes:
+        fragment = node_json.get(node)
+        if fragment is None:
+            fragment = _json_item_bytes({"id": node, "repo": "unknown"})
+        return fragment
+
+    def iter_subgraph_json(
+        node_names: Iterable[str], edges: Iterable[tuple[str, str]]
+    ) -> Iterator[bytes]:
+        """把子图的节点和边逐批序列化为 JSON 片段（不含末尾换行）"""
+        yield b'{"edges":['
+        yield from _join_batches(
+            _json_item_bytes({"from": src, "to": dst, "type": graph.get_dependency_type(src, dst)})
+            for src, dst in edges
+        )
+        yield b'],"nodes":['
+        yield from _join_batches(map(node_fragment, node_names))
+        yield b"]}"
+
+    def subgraph_json(node_names: Iterable[str], edges: Iterable[tuple[str, str]]) -> bytes:
+        """把子图的节点和边序列化为 JSON 字节串，末尾换行与 jsonify 的输出一致"""
+        return b"".join(iter_subgraph_json(node_names, edges)) + b"\n"
+
+    def stream_json(chunks: Iterable[bytes]) -> Response:
+        """逐块流式发送 JSON 响应，末尾换行与 jsonify 的输出一致"""
+        return Response(chain(chunks, (b"\n",)), mimetype="application/json")
+
+    # 图不变，同一 (包名, 深度, 依赖类型) 的子图响应相同：整体缓存序列化后的字节串。
+    # 切换深度/类型时常会重复请求，命中缓存即可跳过遍历和序列化。
+    # 边数达到 GRAPH_STREAM_MIN_EDGES 的大子图返回 None（只缓存这一结论），由调用方流式发送
+    @lru_cache(maxsize=256)
+    def build_graph_json(name: str, depth: int, dep_type: DependencyType) -> bytes | None:
+        # 一次遍历同时收集节点和子图内的边
+        node_names, dep_edges = graph.get_dependency_subgraph(
+            name, dep_type=dep_type, max_depth=depth
+        )
+        if len(dep_edges) >= GRAPH_STREAM_MIN_EDGES:
+            return None
+        return subgraph_json(node_names, dep_edges)
+
+    def iter_graph_json(name: str, depth: int, dep_type: DependencyType) -> Iterator[bytes]:
+        """重新遍历大子图并逐批产出 JSON 片段（不含末尾换行）"""
+        return iter_subgraph_json(
+            *graph.get_dependency_subgraph(name, dep_type=dep_type, max_depth=depth)
+        )
+
+    def graph_query() -> tuple[int, DependencyType]:
+        """从请求参数解析子图的深度和依赖类型"""
         depth = int(request.args.get("depth", 2))
         dep_type_str = request.args.get("type", "all")
 
@@ -820,29 +1140,41 @@ def create_app(graph: DependencyGraph) -> Flask:
             "build": DependencyType.BUILD,
         }.get(dep_type_str, DependencyType.ALL)
 
-        # 收集节点
-        nodes_set = {name}
-        deps = graph.get_dependencies(name, dep_type=dep_type, recursive=True, max_depth=depth)
-        nodes_set.update(deps)
+        return depth, dep_type
 
-        nodes = []
-        edges = []
+    @app.route("/api/graph/<name>")
+    def api_graph(name: str):
+        if name not in graph.packages:
+            return jsonify({"error": "Package not found"}), 404
 
-        for node in nodes_set:
-            pkg = graph.packages.get(node)
-            nodes.append(
-                {
-                    "id": node,
-                    "repo": pkg.repo if pkg else "unknown",
-                }
-            )
+        depth, dep_type = graph_query()
+        body = build_graph_json(name, depth, dep_type)
+        if body is None:
+            return stream_json(iter_graph_json(name, depth, dep_type))
+        return Response(body, mimetype="application/json")
+
+    # 页面加载软件包时一次取回包信息和依赖图，省去一次往返；
+    # 直接拼接两者缓存的 JSON 字节串（去掉各自末尾的换行），大子图则流式拼接
+    @app.route("/api/package-with-graph/<name>")
+    def api_package_with_graph(name: str):
+        if name not in graph.packages:
+            return jsonify({"error": "Package not found"}), 404
+
+        depth, dep_type = graph_query()
+        graph_body = build_graph_json(name, depth, dep_type)
+        package_body = get_package_json(name)[:-1]
 
-        for node in nodes_set:
-            for dep in graph.get_dependencies(node, dep_type=dep_type):
-                if dep in nodes_set:
-                    edges.append({"from": node, "to": dep})
+        if graph_body is None:
+            return stream_json(
+                chain(
+                    (b'{"graph":',),
+                    iter_graph_json(name, depth, dep_type),
+                    (b',"package":', package_body, b"}"),
+                )
+            )
 
-        return jsonify({"nodes": nodes, "edges": edges})
+        body = b"".join([b'{"graph":', graph_body[:-1], b',"package":', package_body, b"}\n"])
+        return Response(body, mimetype="application/json")
 
     @app.route("/api/rdeps-graph/<name>")
     def api_rdeps_graph(name: str):
@@ -851,54 +1183,36 @@ def create_app(graph: DependencyGraph) -> Flask:
 
         depth = int(request.args.get("depth", 2))
 
-        # 收集反向依赖节点
-        nodes_set = {name}
-        rdeps = graph.get_reverse_dependencies(name, recursive=True, max_depth=depth)
-        nodes_set.update(rdeps)
-
-        nodes = []
-        edges = []
-
-        for node in nodes_set:
-            pkg = graph.packages.get(node)
-            nodes.append(
-                {
-                    "id": node,
-                    "repo": pkg.repo if pkg else "unknown",
-                }
-            )
-
-        for node in nodes_set:
-            if node != name:
-                for dep in graph.get_dependencies(node):
-                    if dep in nodes_set:
-                        edges.append({"from": node, "to": dep})
-
-        return jsonify({"nodes": nodes, "edges": edges})
+        # 一次遍历同时收集反向依赖节点和子图内的边
+        node_names, edges = graph.get_reverse_dependency_subgraph(name, max_depth=depth)
+
+        if len(edges) >= GRAPH_STREAM_MIN_EDGES:
+            return stream_json(iter_subgraph_json(node_names, edges))
+        return Response(subgraph_json(node_names, edges), mimetype="application/json")
+
+    # 统计信息在创建应用时计算一次；只需节点数和边数，不调用 get_statistics
+    # （其中的 DAG 判断和连通分量计算在此用不到）
+    deps_counts, _ = graph.get_degree_counts()
+    repo_counts = Counter(pkg.repo or "unknown" for pkg in graph.packages.values())
+    stats_payload = {
+        "total_packages": len(graph.packages),
+        "total_edges": deps_counts.total(),
+        "main_count": repo_counts["main"],
+        "community_count": repo_counts["community"],
+        "testing_count": repo_counts["testing"],
+    }
 
     @app.route("/api/stats")
     def api_stats():
-        stats = graph.get_statistics()
-
-        repo_counts = {}
-        for pkg in graph.packages.values():
-            repo = pkg.repo or "unknown"
-            repo_counts[repo] = repo_counts.get(repo, 0) + 1
+        return jsonify(stats_payload)
 
-        return jsonify(
-            {
-                "total_packages": stats["nodes"],
-                "total_edges": stats["edges"],
-                "main_count": repo_counts.get("main", 0),
-                "community_count": repo_counts.get("community", 0),
-                "testing_count": repo_counts.get("testing", 0),
-            }
-        )
+    # 图不变，按 n 缓存结果；n 来自请求参数，用 LRU 限制缓存条目数
+    get_most_depended = lru_cache(maxsize=32)(graph.get_most_depended)
 
     @app.route("/api/most-depended")
     def api_most_depended():
         n = int(request.args.get("n", 20))
-        most_depended = graph.get_most_depended(n)
+        most_depended = get_most_depended(n)
 
         return jsonify(
             {"packages": [{"name": name, "count": count} for name, count in most_depended]}
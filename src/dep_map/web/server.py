@@ -0,0 +1,60 @@
+"""
+Web 服务运行器
+
+单进程时使用 Flask 内置服务器；多进程时使用 gunicorn 的线程工作进程，
+处理请求的 CPU 计算可分布到多个核心上。
+"""
+
+from typing import Any
+
+from flask import Flask
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+
+
+def run_server(app: Flask, host: str, port: int, workers: int = 1, threads: int = 8):
+    """
+    运行 Web 服务
+
+    Args:
+        app: Flask 应用
+        host: 绑定地址
+        port: 服务端口
+        workers: 工作进程数，大于 1 时使用 gunicorn
+        threads: gunicorn 每个工作进程的线程数
+    """
+    if workers <= 1:
+        app.run(host=host, port=port, debug=False, threaded=True)
+        return
+
+    if BaseApplication is None:
+        raise ImportError(
+            "gunicorn is required for multiple workers. Install with: pip install gunicorn"
+        )
+
+    class GunicornApplication(BaseApplication):
+        """直接运行已创建的应用：依赖图在 fork 前加载一次，各工作进程写时复制共享"""
+
+        def __init__(self, options: dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    GunicornApplication(
+        {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "worker_class": "gthread",
+            "threads": threads,
+            "preload_app": True,
+        }
+    ).run()
@@ -12,134 +12,244 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 from dep_map.graph import DependencyGraph, DependencyType
 from dep_map.parser import PackageInfo
 
+# 测试数据：包名 -> 软件包信息
+PACKAGES = {
+    "app": PackageInfo(
+        name="app",
+        repo="community",
+        depends=["libfoo", "libbar"],
+        makedepends=["cmake", "gcc"],
+    ),
+    "libfoo": PackageInfo(
+        name="libfoo",
+        repo="main",
+        depends=["libc"],
+        makedepends=["gcc"],
+    ),
+    "libbar": PackageInfo(
+        name="libbar",
+        repo="main",
+        depends=["libc", "libfoo"],
+    ),
+    "libc": PackageInfo(name="libc", repo="main"),
+    "cmake": PackageInfo(
+        name="cmake",
+        repo="main",
+        depends=["libc"],
+    ),
+    "gcc": PackageInfo(
+        name="gcc",
+        repo="main",
+        depends=["libc"],
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def graph():
+    """只读测试共享的依赖图，整个模块只构建一次"""
+    return DependencyGraph(dict(PACKAGES))
+
+
+@pytest.fixture
+def mutable_graph():
+    """会添加软件包的测试各自使用独立的依赖图"""
+    return DependencyGraph(dict(PACKAGES))
+
 
 class TestDependencyGraph:
     """测试依赖图"""
 
-    def setup_method(self):
-        """创建测试数据"""
-        self.packages = {
-            "app": PackageInfo(
-                name="app",
-                repo="community",
-                depends=["libfoo", "libbar"],
-                makedepends=["cmake", "gcc"],
-            ),
-            "libfoo": PackageInfo(
-                name="libfoo",
-                repo="main",
-                depends=["libc"],
-                makedepends=["gcc"],
-            ),
-            "libbar": PackageInfo(
-                name="libbar",
-                repo="main",
-                depends=["libc", "libfoo"],
-            ),
-            "libc": PackageInfo(name="libc", repo="main"),
-            "cmake": PackageInfo(
-                name="cmake",
-                repo="main",
-                depends=["libc"],
-            ),
-            "gcc": PackageInfo(
-                name="gcc",
-                repo="main",
-                depends=["libc"],
-            ),
-        }
-
-        self.graph = DependencyGraph(self.packages)
-
-    def test_direct_dependencies(self):
+    def test_direct_dependencies(self, graph):
         """测试直接依赖"""
-        deps = self.graph.get_dependencies("app")
+        deps = graph.get_dependencies("app")
 
-        assert "libfoo" in deps
-        assert "libbar" in deps
-        assert "cmake" in deps
-        assert "gcc" in deps
+        assert {"libfoo", "libbar", "cmake", "gcc"} <= set(deps)
 
-    def test_runtime_dependencies(self):
+    def test_runtime_dependencies(self, graph):
         """测试运行时依赖"""
-        deps = self.graph.get_dependencies("app", dep_type=DependencyType.RUNTIME)
+        deps = graph.get_dependencies("app", dep_type=DependencyType.RUNTIME)
 
-        assert "libfoo" in deps
-        assert "libbar" in deps
-        assert "cmake" not in deps
-        assert "gcc" not in deps
+        assert {"libfoo", "libbar"} <= set(deps)
+        assert {"cmake", "gcc"}.isdisjoint(deps)
 
-    def test_build_dependencies(self):
+    def test_build_dependencies(self, graph):
         """测试构建依赖"""
-        deps = self.graph.get_dependencies("app", dep_type=DependencyType.BUILD)
+        deps = graph.get_dependencies("app", dep_type=DependencyType.BUILD)
 
-        assert "cmake" in deps
-        assert "gcc" in deps
+        assert {"cmake", "gcc"} <= set(deps)
         assert "libfoo" not in deps
 
-    def test_recursive_dependencies(self):
+    def test_recursive_dependencies(self, graph):
         """测试递归依赖"""
-        deps = self.graph.get_dependencies("app", recursive=True)
-
-        assert "libfoo" in deps
-        assert "libbar" in deps
-        assert "libc" in deps
-
-    def test_reverse_dependencies(self):
+        deps = graph.get_dependencies("app", recursive=True)
+
+        assert {"libfoo", "libbar", "libc"} <= set(deps)
+
+    def test_dependency_subgraph(self, graph):
+        """测试一次遍历获取依赖子图"""
+        nodes, edges = graph.get_dependency_subgraph(
+            "libbar", dep_type=DependencyType.RUNTIME, max_depth=1
+        )
+
+        assert nodes == ["libbar", "libc", "libfoo"]
+        # libfoo 位于最大深度，仍保留其指向子图内节点的边
+        assert edges == [("libbar", "libc"), ("libbar", "libfoo"), ("libfoo", "libc")]
+        assert graph.get_dependency_subgraph("libbar", max_depth=0) == (["libbar"], [])
+
+    def test_dependency_type(self, graph):
+        """测试获取依赖边的类型"""
+        assert graph.get_dependency_type("app", "libfoo") == "runtime"
+        assert graph.get_dependency_type("app", "gcc") == "build"
+        assert graph.get_dependency_type("libc", "app") is None
+
+    def test_reverse_dependency_subgraph(self, graph):
+        """测试一次遍历获取反向依赖子图"""
+        nodes, edges = graph.get_reverse_dependency_subgraph(
+            "libfoo", dep_type=DependencyType.RUNTIME, max_depth=1
+        )
+
+        assert nodes == ["libfoo", "app", "libbar"]
+        # libbar 位于最大深度，仍保留子图内指向它的边
+        assert edges == [("app", "libfoo"), ("libbar", "libfoo"), ("app", "libbar")]
+        assert graph.get_reverse_dependency_subgraph("app") == (["app"], [])
+
+    def test_reverse_dependencies(self, graph):
         """测试反向依赖"""
-        rdeps = self.graph.get_reverse_dependencies("libc")
+        rdeps = graph.get_reverse_dependencies("libc")
 
-        assert "libfoo" in rdeps
-        assert "libbar" in rdeps
-        assert "cmake" in rdeps
-        assert "gcc" in rdeps
+        assert {"libfoo", "libbar", "cmake", "gcc"} <= set(rdeps)
 
-    def test_recursive_reverse_dependencies(self):
+    def test_recursive_reverse_dependencies(self, graph):
         """测试递归反向依赖"""
-        rdeps = self.graph.get_reverse_dependencies("libc", recursive=True)
+        rdeps = graph.get_reverse_dependencies("libc", recursive=True)
 
-        assert "libfoo" in rdeps
-        assert "libbar" in rdeps
-        assert "app" in rdeps
+        assert {"libfoo", "libbar", "app"} <= set(rdeps)
 
-    def test_dependency_path(self):
+    def test_dependency_path(self, graph):
         """测试依赖路径"""
-        path = self.graph.get_dependency_path("app", "libc")
+        path = graph.get_dependency_path("app", "libc")
 
         assert path is not None
         assert path[0] == "app"
         assert path[-1] == "libc"
 
-    def test_no_dependency_path(self):
+    def test_no_dependency_path(self, graph):
         """测试无依赖路径"""
-        path = self.graph.get_dependency_path("libc", "app")
+        path = graph.get_dependency_path("libc", "app")
 
         assert path is None
 
-    def test_dependency_tree(self):
+    def test_dependency_tree(self, graph):
         """测试依赖树"""
-        tree = self.graph.get_dependency_tree("app", max_depth=2)
+        tree = graph.get_dependency_tree("app", max_depth=2)
 
         assert tree["name"] == "app"
         assert len(tree["children"]) > 0
 
-    def test_leaf_packages(self):
+    def test_dependency_tree_deep_chain(self):
+        """测试依赖树构建不受递归深度限制，循环依赖被截断"""
+        count = sys.getrecursionlimit() + 100
+        packages = {
+            f"p{i}": PackageInfo(name=f"p{i}", depends=[f"p{(i + 1) % count}"])
+            for i in range(count)
+        }
+        tree = DependencyGraph(packages).get_dependency_tree("p0", max_depth=count)
+
+        for _ in range(count - 1):
+            assert not tree["truncated"]
+            (tree,) = tree["children"]
+        assert tree["children"] == [{"name": "p0", "children": [], "truncated": True}]
+
+    def test_leaf_packages(self, graph):
         """测试叶子包"""
-        leaves = self.graph.get_leaf_packages()
+        leaves = graph.get_leaf_packages()
 
         # app 是叶子，因为没有其他包依赖它
         assert "app" in leaves
 
-    def test_root_packages(self):
+    def test_root_packages(self, graph):
         """测试根包"""
-        roots = self.graph.get_root_packages()
+        roots = graph.get_root_packages()
 
         # libc 是根包，因为它没有依赖
         assert "libc" in roots
 
-    def test_statistics(self):
+    def test_summary_cache(self, mutable_graph):
+        """测试叶子包、根包和统计信息在添加软件包后重新计算"""
+        assert mutable_graph.get_leaf_packages() == ["app"]
+        assert mutable_graph.get_statistics()["nodes"] == 6
+
+        mutable_graph.add_package(PackageInfo(name="tool", repo="main", depends=["app"]))
+
+        assert mutable_graph.get_leaf_packages() == ["tool"]
+        assert "tool" not in mutable_graph.get_root_packages()
+        assert mutable_graph.get_statistics()["nodes"] == 7
+
+    def test_add_package_updates_dependencies(self, mutable_graph):
+        """测试添加软件包后直接依赖缓存失效"""
+        assert mutable_graph.get_dependencies("libc") == []
+
+        mutable_graph.add_package(PackageInfo(name="musl", repo="main"))
+        mutable_graph.add_package(PackageInfo(name="libc2", repo="main", depends=["musl"]))
+
+        assert mutable_graph.get_dependencies("libc2") == ["musl"]
+
+    def test_recursive_cache(self, mutable_graph):
+        """测试递归查询结果缓存：返回副本，添加软件包后失效"""
+        deps = mutable_graph.get_dependencies("libbar", recursive=True)
+        deps.append("changed")
+
+        assert mutable_graph.get_dependencies("libbar", recursive=True) == ["gcc", "libc", "libfoo"]
+
+        mutable_graph.add_package(PackageInfo(name="libbaz", repo="main", depends=["libbar"]))
+
+        assert "libbar" in mutable_graph.get_dependencies("libbaz", recursive=True)
+        assert "libbaz" in mutable_graph.get_reverse_dependencies("libc", recursive=True)
+
+    def test_degree_counts(self, graph):
+        """测试依赖数和被依赖数统计"""
+        deps_counts, rdeps_counts = graph.get_degree_counts()
+
+        for pkg in PACKAGES:
+            assert deps_counts[pkg] == len(graph.get_dependencies(pkg))
+            assert rdeps_counts[pkg] == len(graph.get_reverse_dependencies(pkg))
+
+    def test_most_depended(self, graph):
+        """测试被依赖最多的包"""
+        counts = [(pkg, len(graph.get_reverse_dependencies(pkg))) for pkg in PACKAGES]
+        expected = sorted(counts, key=lambda x: x[1], reverse=True)
+
+        assert graph.get_most_depended(3) == expected[:3]
+        assert graph.get_most_depended(100) == expected
+
+    def test_topological_order(self, graph):
+        """测试拓扑序中每个包都排在其依赖之后"""
+        order = graph.get_topological_order()
+
+        assert sorted(order) == sorted(PACKAGES)
+        for pkg in order:
+            for dep in graph.get_dependencies(pkg):
+                assert order.index(dep) < order.index(pkg)
+        assert graph.get_statistics()["is_dag"]
+
+    def test_topological_order_cycle(self, mutable_graph):
+        """测试循环上的包不参与拓扑排序"""
+        mutable_graph.add_package(PackageInfo(name="tool", repo="main", depends=["app"]))
+        mutable_graph.add_package(PackageInfo(name="app", repo="main", depends=["tool"]))
+
+        assert sorted(mutable_graph.get_topological_order()) == [
+            "cmake",
+            "gcc",
+            "libbar",
+            "libc",
+            "libfoo",
+        ]
+        assert not mutable_graph.get_statistics()["is_dag"]
+
+    def test_statistics(self, graph):
         """测试统计信息"""
-        stats = self.graph.get_statistics()
+        stats = graph.get_statistics()
 
         assert stats["nodes"] == 6
         assert stats["edges"] > 0
@@ -115,6 +115,52 @@ pkgrel=0
         assert pkg2 is not None
         assert pkg2.repo == "community"
 
+    def test_parse_file(self, tmp_path):
+        """测试解析文件，CRLF 换行按 LF 处理"""
+        apkbuild = tmp_path / "main" / "test-package" / "APKBUILD"
+        apkbuild.parent.mkdir(parents=True)
+        apkbuild.write_bytes(
+            b'pkgname=test-package\r\npkgver=1.0.0\r\ndepends="dep1\r\n\tdep2"\r\n'
+        )
+
+        pkg = self.parser.parse_file(str(apkbuild))
+
+        assert pkg is not None
+        assert pkg.version == "1.0.0"
+        assert pkg.depends == ["dep1", "dep2"]
+        assert pkg.repo == "main"
+
+    def test_parse_many(self, tmp_path):
+        """测试同一解析器在多个线程中并行解析多个文件"""
+        paths = []
+        for i in range(40):
+            apkbuild = tmp_path / f"pkg{i}" / "APKBUILD"
+            apkbuild.parent.mkdir()
+            apkbuild.write_text(f'pkgname=pkg{i}\npkgver={i}.0\ndepends="dep{i} libc"\n')
+            paths.append(str(apkbuild))
+
+        packages = self.parser.parse_many(paths, max_workers=8)
+
+        assert list(packages) == [f"pkg{i}" for i in range(40)]
+        for i, pkg in enumerate(packages.values()):
+            assert pkg.version == f"{i}.0"
+            assert pkg.depends == [f"dep{i}", "libc"]
+
+    def test_parse_with_subclass_init_args(self):
+        """测试构造函数带参数的子类可以正常解析，解析器实例本身不保存解析状态"""
+
+        class TaggedParser(APKBUILDParser):
+            def __init__(self, tag: str):
+                super().__init__()
+                self.tag = tag
+
+        parser = TaggedParser("x")
+        pkg = parser.parse_content('pkgname=test-package\ndepends="dep1"\n')
+
+        assert pkg is not None
+        assert pkg.depends == ["dep1"]
+        assert vars(parser) == {"tag": "x"}
+
     def test_subpackages(self):
         """测试子包解析"""
         content = """
@@ -142,10 +188,7 @@ class TestPackageInfo:
             checkdepends=["checkdep1"],
         )
 
-        all_deps = pkg.all_depends
-        assert "dep1" in all_deps
-        assert "makedep1" in all_deps
-        assert "checkdep1" in all_deps
+        assert {"dep1", "makedep1", "checkdep1"} <= pkg.all_depends
 
     def test_runtime_depends(self):
         """测试运行时依赖"""
@@ -156,8 +199,7 @@ class TestPackageInfo:
         )
 
         runtime = pkg.runtime_depends
-        assert "dep1" in runtime
-        assert "dep2" in runtime
+        assert {"dep1", "dep2"} <= runtime
         assert "makedep1" not in runtime
 
     def test_build_depends(self):
@@ -171,11 +213,25 @@ class TestPackageInfo:
         )
 
         build = pkg.build_depends
-        assert "makedep1" in build
-        assert "builddep1" in build
-        assert "hostdep1" in build
+        assert {"makedep1", "builddep1", "hostdep1"} <= build
         assert "dep1" not in build
 
+    def test_depends_follow_field_changes(self):
+        """测试依赖集合反映依赖字段的重新赋值和原地修改"""
+        pkg = PackageInfo(name="test", depends=["dep1"], makedepends=["makedep1"])
+        assert pkg.runtime_depends == {"dep1"}
+
+        pkg.depends = ["dep2"]
+        assert pkg.runtime_depends == {"dep2"}
+
+        pkg.depends.append("dep3")
+        pkg.makedepends_host.append("hostdep1")
+        pkg.checkdepends.append("checkdep1")
+        assert pkg.runtime_depends == {"dep2", "dep3"}
+        assert pkg.build_depends == {"makedep1", "hostdep1"}
+        assert pkg.all_depends == {"dep2", "dep3", "makedep1", "hostdep1", "checkdep1"}
+        assert not hasattr(pkg, "__dict__")
+
     def test_to_dict(self):
         """测试转换为字典"""
         pkg = PackageInfo(
@@ -0,0 +1,202 @@
+"""
+测试可视化器
+"""
+
+import gzip
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from dep_map.graph import DependencyGraph
+from dep_map.parser import PackageInfo
+from dep_map.visualizer import Visualizer
+
+
+class TestVisualizer:
+    """测试可视化器"""
+
+    def setup_method(self):
+        """创建测试数据"""
+        self.packages = {
+            "app": PackageInfo(
+                name="app",
+                repo="community",
+                depends=["libfoo", "libfoo"],
+                makedepends=["gcc"],
+                checkdepends=["pytest"],
+            ),
+            "libfoo": PackageInfo(name="libfoo", repo="main", depends=["libc"]),
+            "libc": PackageInfo(name="libc", repo="main"),
+            "gcc": PackageInfo(name="gcc", repo="main", depends=["libc"]),
+            "pytest": PackageInfo(name="pytest", repo="community"),
+        }
+
+        self.graph = DependencyGraph(self.packages)
+        self.viz = Visualizer(self.graph)
+
+    def test_all_type_edges_compact(self):
+        """测试全类型边为紧凑格式且无重复"""
+        edges = self.viz._collect_all_type_edges(set(self.packages))
+
+        assert sorted(map(tuple, edges)) == [
+            ("app", "gcc", 1),
+            ("app", "libfoo", 0),
+            ("app", "pytest", 2),
+            ("gcc", "libc", 0),
+            ("libfoo", "libc", 0),
+        ]
+
+    def test_all_dep_types_depth(self):
+        """测试按深度收集所有类型的依赖"""
+        nodes, edges = self.viz._collect_all_dep_types("app", max_depth=0, include_reverse=False)
+
+        assert nodes == ["app", "libfoo", "gcc", "pytest"]
+        assert {edge["from"] for edge in edges} == {"app"}
+
+        nodes, _ = self.viz._collect_all_dep_types("app", max_depth=1, include_reverse=False)
+        assert "libc" in nodes
+
+    def test_expand_edges(self):
+        """测试紧凑边展开为 vis.js 边"""
+        edges = self.viz._expand_edges([["app", "gcc", 1]])
+
+        assert edges[0]["from"] == "app"
+        assert edges[0]["to"] == "gcc"
+        assert edges[0]["depType"] == "build"
+        assert edges[0]["dashes"] == Visualizer.EDGE_STYLES["build"]["dashes"]
+
+    def test_render_html(self, tmp_path):
+        """测试生成单包依赖图"""
+        output = tmp_path / "app.html"
+        self.viz.render_html("app", str(output))
+
+        content = output.read_text(encoding="utf-8")
+        assert "<title>Dependency Graph: app</title>" in content
+        assert 'const centerPackage = "app";' in content
+        # 边样式按依赖类型去重，只写一份
+        assert content.count('"depType":"runtime"') == 1
+        # 提示信息只传字段，由页面脚本拼成 HTML
+        assert '"t":["-r0","community","",2]' in content
+        assert "<b>app</b>" not in content
+
+    def test_render_html_compressed(self, tmp_path):
+        """测试生成 gzip 压缩的单包依赖图"""
+        output = tmp_path / "app.html"
+        self.viz.render_html("app", str(output), compress=True)
+
+        assert not output.exists()
+        with gzip.open(tmp_path / "app.html.gz", "rt", encoding="utf-8") as f:
+            assert "<title>Dependency Graph: app</title>" in f.read()
+
+    def test_render_gz_suffix(self, tmp_path):
+        """测试输出路径以 .gz 结尾时写出 gzip 压缩的 HTML"""
+        output = tmp_path / "app.html.gz"
+        self.viz.render_d3_html("app", str(output))
+
+        with gzip.open(output, "rt", encoding="utf-8") as f:
+            assert "<title>Dependency Graph: app</title>" in f.read()
+
+    def test_render_compressed_gz_suffix(self, tmp_path):
+        """测试 compress 与以 .gz 结尾的路径同时使用时不重复追加 .gz"""
+        output = tmp_path / "app.html.gz"
+        self.viz.render_html("app", str(output), compress=True)
+
+        assert not (tmp_path / "app.html.gz.gz").exists()
+        with gzip.open(output, "rt", encoding="utf-8") as f:
+            assert "<title>Dependency Graph: app</title>" in f.read()
+
+    def test_render_tree_d3_compressed(self, tmp_path):
+        """测试树形图和 D3 图也支持 compress"""
+        self.viz.render_tree_html("app", str(tmp_path / "tree.html"), compress=True)
+        self.viz.render_d3_html("app", str(tmp_path / "d3.html"), compress=True)
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["d3.html.gz", "tree.html.gz"]
+        with gzip.open(tmp_path / "tree.html.gz", "rt", encoding="utf-8") as f:
+            assert "<title>Dependency Tree: app</title>" in f.read()
+
+    def test_render_overview(self, tmp_path):
+        """测试生成全局概览页"""
+        output = tmp_path / "overview.html"
+        self.viz.render_complete_graph_html(str(output), show_all_types=True)
+
+        content = output.read_text(encoding="utf-8")
+        assert "<title>Complete Dependency Graph</title>" in content
+        # 边端点为节点下标：app 为 0，pytest 为 4
+        assert "[0,4,2]" in content
+        # 节点按列传输
+        assert 'const nodeColumns = {"id":["app",' in content
+
+    def test_render_complete_compact(self, tmp_path):
+        """测试完整依赖图以紧凑数组传输节点和边"""
+        output = tmp_path / "complete.html"
+        self.viz.render_complete_graph_html(str(output))
+
+        content = output.read_text(encoding="utf-8")
+        assert '"repos":["community","main"]' in content
+        # 节点下标：app 为 0，libfoo 为 1（depends 中重复的 libfoo 保留为两条边）
+        assert content.count("[0,1]") == 2
+        # 提示信息只传版本、描述摘要和依赖数，由页面脚本拼成 HTML
+        assert '["app",0,5.0,"-r0","",2]' in content
+
+    def test_render_complete_compressed(self, tmp_path):
+        """测试生成 gzip 压缩的完整依赖图"""
+        output = tmp_path / "complete.html"
+        self.viz.render_complete_graph_html(str(output), compress=True)
+
+        assert not output.exists()
+        with gzip.open(tmp_path / "complete.html.gz", "rt", encoding="utf-8") as f:
+            assert "<title>Complete Dependency Graph</title>" in f.read()
+
+    def test_render_complete_webgl(self, tmp_path):
+        """测试生成 WebGL 渲染的完整依赖图"""
+        output = tmp_path / "complete.html"
+        self.viz.render_complete_graph_html(str(output), webgl=True)
+
+        content = output.read_text(encoding="utf-8")
+        assert "sigma.min.js" in content
+        assert '"repos":["community","main"]' in content
+
+    def test_render_complete_external_data(self, tmp_path):
+        """测试完整依赖图的数据写入外部脚本，页面以 <script src> 引用"""
+        output = tmp_path / "complete.html"
+        self.viz.render_complete_graph_html(str(output), external_data=True)
+
+        content = output.read_text(encoding="utf-8")
+        assert '<script src="complete.data.js"></script>' in content
+        assert "const graphData = window.depMapGraphData;" in content
+        data = (tmp_path / "complete.data.js").read_text(encoding="utf-8")
+        assert data.startswith('window.depMapGraphData = {"repos":["community","main"]')
+
+    def test_precomputed_layout(self):
+        """测试超过阈值的大图预先计算布局"""
+        pytest.importorskip("igraph")
+        nodes = [{"id": name} for name in self.packages]
+        self.viz.PRECOMPUTED_LAYOUT_THRESHOLD = 2
+
+        assert self.viz._apply_precomputed_layout(nodes, [[0, 1, 0], [1, 2, 0]])
+        assert all("x" in node and "y" in node for node in nodes)
+
+    def test_render_complete_precomputed_layout(self, tmp_path):
+        """测试完整依赖图超过阈值时附带预先计算的坐标"""
+        pytest.importorskip("igraph")
+        output = tmp_path / "complete.html"
+        self.viz.PRECOMPUTED_LAYOUT_THRESHOLD = 2
+        self.viz.render_complete_graph_html(str(output))
+
+        assert '"positions":[[' in output.read_text(encoding="utf-8")
+
+    def test_render_complete_clusters(self, tmp_path):
+        """测试完整依赖图超过阈值时附带社区编号"""
+        pytest.importorskip("igraph")
+        output = tmp_path / "complete.html"
+        self.viz.CLUSTER_THRESHOLD = 2
+        self.viz.render_complete_graph_html(str(output))
+
+        assert '"clusters":[' in output.read_text(encoding="utf-8")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
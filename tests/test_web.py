@@ -0,0 +1,164 @@
+"""
+测试 Web 应用
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from dep_map.graph import DependencyGraph
+from dep_map.parser import PackageInfo
+from dep_map.web import create_app
+from dep_map.web.app import _SubstringIndex
+
+
+class TestWebApp:
+    """测试 Web 应用"""
+
+    def setup_method(self):
+        """创建测试数据"""
+        self.packages = {
+            "app": PackageInfo(name="app", repo="community", depends=["libfoo"]),
+            "libfoo": PackageInfo(name="libfoo", repo="main", depends=["libc"]),
+            "libc": PackageInfo(name="libc", repo="main"),
+            "py3-foo": PackageInfo(name="py3-foo", repo="community", depends=["libfoo"]),
+        }
+
+        self.graph = DependencyGraph(self.packages)
+        self.client = create_app(self.graph).test_client()
+
+    def test_substring_index(self):
+        """测试子串索引与逐个包名判断的结果一致"""
+        names = ["libfoo", "foo", "libc", "oo", "bar-foo"]
+        index = _SubstringIndex(names)
+
+        for query in ["foo", "o", "lib", "c", "r-f", "x", "foo\0"]:
+            expected = [i for i, name in enumerate(names) if query in name]
+            assert index.search(query, 20) == expected
+        assert index.search("o", 2) == [0, 1]
+
+    def test_search(self):
+        """测试搜索按包的原顺序返回子串匹配"""
+        results = self.client.get("/api/search?q=FOO").get_json()["results"]
+
+        assert results == [
+            {"name": "libfoo", "repo": "main"},
+            {"name": "py3-foo", "repo": "community"},
+        ]
+        assert self.client.get("/api/search?q=f").get_json()["results"] == []
+
+    def test_package(self):
+        """测试包详情在重复请求时返回相同的缓存结果"""
+        first = self.client.get("/api/package/libfoo")
+        second = self.client.get("/api/package/libfoo")
+
+        assert first.get_json()["rdeps"] == [
+            {"name": "app", "repo": "community"},
+            {"name": "py3-foo", "repo": "community"},
+        ]
+        assert first.data == second.data
+        assert first.get_json()["rdeps_count"] == 2
+        assert self.client.get("/api/package/missing").status_code == 404
+
+    def test_package_rdeps_limit(self, monkeypatch):
+        """测试包详情只列出前若干个反向依赖，rdeps_count 仍为总数"""
+        monkeypatch.setattr("dep_map.web.app.PACKAGE_RDEPS_LIMIT", 1)
+        data = self.client.get("/api/package/libfoo").get_json()
+
+        assert data["rdeps"] == [{"name": "app", "repo": "community"}]
+        assert data["rdeps_count"] == 2
+
+    def test_graph(self):
+        """测试依赖子图以缓存的 JSON 字节串返回，重复请求结果相同"""
+        response = self.client.get("/api/graph/py3-foo?depth=1")
+
+        assert response.mimetype == "application/json"
+        assert response.get_json() == {
+            "edges": [{"from": "py3-foo", "to": "libfoo", "type": "runtime"}],
+            "nodes": [
+                {"id": "py3-foo", "repo": "community"},
+                {"id": "libfoo", "repo": "main"},
+            ],
+        }
+        assert self.client.get("/api/graph/py3-foo?depth=1").data == response.data
+
+    def test_graph_streamed(self, monkeypatch):
+        """测试边数达到阈值的子图不缓存、流式发送，结果与缓存的响应一致"""
+        urls = [
+            "/api/graph/app?depth=3",
+            "/api/package-with-graph/app?depth=3",
+            "/api/rdeps-graph/libc?depth=2",
+        ]
+        cached = [self.client.get(url) for url in urls]
+
+        monkeypatch.setattr("dep_map.web.app.GRAPH_STREAM_MIN_EDGES", 1)
+        client = create_app(self.graph).test_client()
+
+        for url, expected in zip(urls, cached, strict=True):
+            response = client.get(url)
+            assert response.is_streamed
+            # 未计算 Content-Length：生成器没有被提前读入内存
+            assert "Content-Length" not in response.headers
+            assert response.data == expected.data
+
+        etag = cached[0].headers["ETag"]
+        assert client.get(urls[0], headers={"If-None-Match": etag}).status_code == 304
+
+    def test_package_with_graph(self):
+        """测试包信息和依赖图合并返回，与分别请求的结果一致"""
+        data = self.client.get("/api/package-with-graph/py3-foo?depth=1").get_json()
+
+        assert data["package"] == self.client.get("/api/package/py3-foo").get_json()
+        assert data["graph"] == self.client.get("/api/graph/py3-foo?depth=1").get_json()
+        assert self.client.get("/api/package-with-graph/missing").status_code == 404
+
+    def test_rdeps_graph(self):
+        """测试反向依赖子图的节点和边"""
+        data = self.client.get("/api/rdeps-graph/libc?depth=2").get_json()
+
+        assert sorted(node["id"] for node in data["nodes"]) == ["app", "libc", "libfoo", "py3-foo"]
+        assert {"id": "libc", "repo": "main"} in data["nodes"]
+        assert sorted((edge["from"], edge["to"]) for edge in data["edges"]) == [
+            ("app", "libfoo"),
+            ("libfoo", "libc"),
+            ("py3-foo", "libfoo"),
+        ]
+
+    def test_cache_headers(self):
+        """测试 API 响应带 ETag，条件请求在图未变时返回 304"""
+        response = self.client.get("/api/stats")
+        etag = response.headers["ETag"]
+
+        assert "max-age=3600" in response.headers["Cache-Control"]
+        assert self.client.get("/api/package/app").headers["ETag"] == etag
+
+        cached = self.client.get("/api/stats", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.data == b""
+        assert "ETag" not in self.client.get("/api/package/missing").headers
+
+    def test_etag_covers_served_fields(self, monkeypatch):
+        """测试依赖、描述或 dep-map 版本变化时 ETag 随之变化"""
+        etag = self.client.get("/api/stats").headers["ETag"]
+
+        self.packages["libc"].description = "C library"
+        described = create_app(DependencyGraph(self.packages)).test_client()
+        described_etag = described.get("/api/stats").headers["ETag"]
+        assert described_etag != etag
+
+        self.packages["app"].depends.append("libc")
+        depended = create_app(DependencyGraph(self.packages)).test_client()
+        depended_etag = depended.get("/api/stats").headers["ETag"]
+        assert depended_etag != described_etag
+
+        # 同样的包数据，dep-map 版本不同时响应格式可能不同
+        monkeypatch.setattr("dep_map.web.app.__version__", "0.0.0-test")
+        upgraded = create_app(DependencyGraph(self.packages)).test_client()
+        assert upgraded.get("/api/stats").headers["ETag"] != depended_etag
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])